@@ -9,8 +9,11 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from app.config import settings
 from app.db.session import Base
+from app.models import ApiKey  # noqa: F401
+from app.models import ApiKeyUsageWindow  # noqa: F401
 from app.models import Delivery  # noqa: F401
 from app.models import DeliveryAttempt  # noqa: F401
+from app.models import EventIdempotencyKey  # noqa: F401
 from app.models import User  # noqa: F401
 from app.models import Webhook  # noqa: F401
 
@@ -0,0 +1,42 @@
+"""create event idempotency keys table
+
+Revision ID: 20261019_05
+Revises: 20260301_04
+Create Date: 2026-10-19 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_05"
+down_revision: Union[str, None] = "20260301_04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_idempotency_keys",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("delivery_ids", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_event_idempotency_keys_key"), "event_idempotency_keys", ["key"], unique=True)
+    op.create_index(
+        op.f("ix_event_idempotency_keys_expires_at"),
+        "event_idempotency_keys",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_event_idempotency_keys_expires_at"), table_name="event_idempotency_keys")
+    op.drop_index(op.f("ix_event_idempotency_keys_key"), table_name="event_idempotency_keys")
+    op.drop_table("event_idempotency_keys")
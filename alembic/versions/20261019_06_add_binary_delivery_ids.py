@@ -0,0 +1,86 @@
+"""add binary shadow ids to deliveries and delivery attempts
+
+Revision ID: 20261019_06
+Revises: 20261019_05
+Create Date: 2026-10-19 10:00:00.000000
+
+Expand step of the BINARY(16) primary key migration. It is safe to run
+while the previous application version is serving traffic:
+
+1. Nullable BINARY(16) shadow columns are added (instant in MySQL 8).
+2. BEFORE INSERT triggers fill the shadow columns for rows written by
+   the running application.
+3. Existing rows are backfilled in small autocommitted batches so no
+   long-running transaction holds locks on the hot tables.
+
+Revision 20261019_07 swaps the shadow columns in. It is not online: stop
+the previous version's API and workers before running it, and start the
+version that writes BINARY(16) ids afterwards.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_06"
+down_revision: Union[str, None] = "20261019_05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    op.add_column("deliveries", sa.Column("id_bin", sa.BINARY(length=16), nullable=True))
+    op.add_column("delivery_attempts", sa.Column("id_bin", sa.BINARY(length=16), nullable=True))
+    op.add_column("delivery_attempts", sa.Column("delivery_id_bin", sa.BINARY(length=16), nullable=True))
+
+    op.execute(
+        """
+        CREATE TRIGGER deliveries_fill_id_bin
+        BEFORE INSERT ON deliveries
+        FOR EACH ROW
+        SET NEW.id_bin = UUID_TO_BIN(NEW.id)
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER delivery_attempts_fill_id_bin
+        BEFORE INSERT ON delivery_attempts
+        FOR EACH ROW
+        SET NEW.id_bin = UUID_TO_BIN(NEW.id),
+            NEW.delivery_id_bin = UUID_TO_BIN(NEW.delivery_id)
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        _backfill(
+            "UPDATE deliveries SET id_bin = UUID_TO_BIN(id) "
+            f"WHERE id_bin IS NULL LIMIT {BACKFILL_BATCH_SIZE}"
+        )
+        _backfill(
+            "UPDATE delivery_attempts "
+            "SET id_bin = UUID_TO_BIN(id), delivery_id_bin = UUID_TO_BIN(delivery_id) "
+            f"WHERE id_bin IS NULL LIMIT {BACKFILL_BATCH_SIZE}"
+        )
+
+    op.create_index("ix_delivery_attempts_delivery_id_bin", "delivery_attempts", ["delivery_id_bin"], unique=False)
+
+
+def _backfill(statement: str) -> None:
+    bind = op.get_bind()
+    while True:
+        result = bind.execute(sa.text(statement))
+        if result.rowcount < BACKFILL_BATCH_SIZE:
+            return
+
+
+def downgrade() -> None:
+    op.drop_index("ix_delivery_attempts_delivery_id_bin", table_name="delivery_attempts")
+    op.execute("DROP TRIGGER IF EXISTS delivery_attempts_fill_id_bin")
+    op.execute("DROP TRIGGER IF EXISTS deliveries_fill_id_bin")
+    op.drop_column("delivery_attempts", "delivery_id_bin")
+    op.drop_column("delivery_attempts", "id_bin")
+    op.drop_column("deliveries", "id_bin")
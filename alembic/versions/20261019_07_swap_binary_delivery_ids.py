@@ -0,0 +1,179 @@
+"""swap deliveries and delivery attempts to binary primary keys
+
+Revision ID: 20261019_07
+Revises: 20261019_06
+Create Date: 2026-10-19 10:30:00.000000
+
+Contract step of the BINARY(16) primary key migration. This step is NOT
+safe while the previous application version is running: once the columns
+are renamed, old code would write 36-character string ids into BINARY(16)
+columns, and a row it inserts after the fill triggers are gone would keep
+a NULL id and fail the NOT NULL change below.
+
+Stop every API and worker process of the previous version, run this
+revision, then start the version that writes time-ordered BINARY(16) ids.
+Column swaps are metadata-only renames and the primary key change rebuilds
+each table in place (ALGORITHM=INPLACE, LOCK=NONE), so reads keep working
+and the write outage lasts about as long as the rebuild.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_07"
+down_revision: Union[str, None] = "20261019_06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ATTEMPTS_FK_NAME = "fk_delivery_attempts_delivery_id_deliveries"
+
+
+def upgrade() -> None:
+    _drop_attempts_foreign_key()
+    # The triggers stay until the catch-up has run, and the catch-up repeats after they are
+    # dropped, so nothing written before the writers stopped is left without a binary id.
+    _fill_missing_binary_ids()
+    op.execute("DROP TRIGGER IF EXISTS delivery_attempts_fill_id_bin")
+    op.execute("DROP TRIGGER IF EXISTS deliveries_fill_id_bin")
+    _fill_missing_binary_ids()
+
+    op.execute("ALTER TABLE deliveries RENAME COLUMN id TO legacy_id, RENAME COLUMN id_bin TO id")
+    op.execute(
+        "ALTER TABLE deliveries "
+        "DROP PRIMARY KEY, "
+        "MODIFY id BINARY(16) NOT NULL, "
+        "ADD PRIMARY KEY (id), "
+        "DROP COLUMN legacy_id, "
+        "ALGORITHM=INPLACE, LOCK=NONE"
+    )
+
+    op.execute(
+        "ALTER TABLE delivery_attempts "
+        "RENAME COLUMN id TO legacy_id, "
+        "RENAME COLUMN id_bin TO id, "
+        "RENAME COLUMN delivery_id TO legacy_delivery_id, "
+        "RENAME COLUMN delivery_id_bin TO delivery_id"
+    )
+    op.execute(
+        "ALTER TABLE delivery_attempts "
+        "DROP PRIMARY KEY, "
+        "MODIFY id BINARY(16) NOT NULL, "
+        "MODIFY delivery_id BINARY(16) NOT NULL, "
+        "ADD PRIMARY KEY (id), "
+        "DROP COLUMN legacy_delivery_id, "
+        "DROP COLUMN legacy_id, "
+        "ALGORITHM=INPLACE, LOCK=NONE"
+    )
+    op.execute(
+        "ALTER TABLE delivery_attempts "
+        "RENAME INDEX ix_delivery_attempts_delivery_id_bin TO ix_delivery_attempts_delivery_id"
+    )
+    _create_attempts_foreign_key()
+
+
+def downgrade() -> None:
+    _drop_attempts_foreign_key()
+
+    op.add_column("deliveries", sa.Column("id_str", sa.String(length=36), nullable=True))
+    op.add_column("delivery_attempts", sa.Column("id_str", sa.String(length=36), nullable=True))
+    op.add_column("delivery_attempts", sa.Column("delivery_id_str", sa.String(length=36), nullable=True))
+    op.execute("UPDATE deliveries SET id_str = BIN_TO_UUID(id)")
+    op.execute("UPDATE delivery_attempts SET id_str = BIN_TO_UUID(id), delivery_id_str = BIN_TO_UUID(delivery_id)")
+
+    op.execute("ALTER TABLE deliveries RENAME COLUMN id TO id_bin, RENAME COLUMN id_str TO id")
+    op.execute(
+        "ALTER TABLE deliveries "
+        "DROP PRIMARY KEY, "
+        "MODIFY id VARCHAR(36) NOT NULL, "
+        "MODIFY id_bin BINARY(16) NULL, "
+        "ADD PRIMARY KEY (id), "
+        "ALGORITHM=INPLACE, LOCK=NONE"
+    )
+
+    op.execute(
+        "ALTER TABLE delivery_attempts "
+        "RENAME INDEX ix_delivery_attempts_delivery_id TO ix_delivery_attempts_delivery_id_bin"
+    )
+    op.execute(
+        "ALTER TABLE delivery_attempts "
+        "RENAME COLUMN id TO id_bin, "
+        "RENAME COLUMN id_str TO id, "
+        "RENAME COLUMN delivery_id TO delivery_id_bin, "
+        "RENAME COLUMN delivery_id_str TO delivery_id"
+    )
+    op.execute(
+        "ALTER TABLE delivery_attempts "
+        "DROP PRIMARY KEY, "
+        "MODIFY id VARCHAR(36) NOT NULL, "
+        "MODIFY delivery_id VARCHAR(36) NOT NULL, "
+        "MODIFY id_bin BINARY(16) NULL, "
+        "MODIFY delivery_id_bin BINARY(16) NULL, "
+        "ADD PRIMARY KEY (id), "
+        "ALGORITHM=INPLACE, LOCK=NONE"
+    )
+    op.create_index(
+        op.f("ix_delivery_attempts_delivery_id"),
+        "delivery_attempts",
+        ["delivery_id"],
+        unique=False,
+    )
+    _create_attempts_foreign_key()
+
+    op.execute(
+        """
+        CREATE TRIGGER deliveries_fill_id_bin
+        BEFORE INSERT ON deliveries
+        FOR EACH ROW
+        SET NEW.id_bin = UUID_TO_BIN(NEW.id)
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER delivery_attempts_fill_id_bin
+        BEFORE INSERT ON delivery_attempts
+        FOR EACH ROW
+        SET NEW.id_bin = UUID_TO_BIN(NEW.id),
+            NEW.delivery_id_bin = UUID_TO_BIN(NEW.delivery_id)
+        """
+    )
+
+
+def _fill_missing_binary_ids() -> None:
+    op.execute("UPDATE deliveries SET id_bin = UUID_TO_BIN(id) WHERE id_bin IS NULL")
+    op.execute(
+        "UPDATE delivery_attempts "
+        "SET id_bin = UUID_TO_BIN(id), delivery_id_bin = UUID_TO_BIN(delivery_id) "
+        "WHERE id_bin IS NULL"
+    )
+
+
+def _drop_attempts_foreign_key() -> None:
+    # The original constraint was created unnamed, so look up whatever name MySQL assigned.
+    bind = op.get_bind()
+    result = bind.execute(
+        sa.text(
+            "SELECT CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS "
+            "WHERE CONSTRAINT_SCHEMA = DATABASE() "
+            "AND TABLE_NAME = 'delivery_attempts' AND REFERENCED_TABLE_NAME = 'deliveries'"
+        )
+    )
+    for name in list(result.scalars()):
+        op.drop_constraint(name, "delivery_attempts", type_="foreignkey")
+
+
+def _create_attempts_foreign_key() -> None:
+    # Both columns are populated from the same source values, so skip the full validation scan
+    # and let MySQL add the constraint in place.
+    op.execute("SET foreign_key_checks = 0")
+    op.create_foreign_key(
+        ATTEMPTS_FK_NAME,
+        "delivery_attempts",
+        "deliveries",
+        ["delivery_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.execute("SET foreign_key_checks = 1")
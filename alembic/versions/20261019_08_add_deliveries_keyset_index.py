@@ -0,0 +1,32 @@
+"""add (webhook_id, created_at, id) index for delivery history keyset pagination
+
+Revision ID: 20261019_08
+Revises: 20261019_07
+Create Date: 2026-10-19 11:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_08"
+down_revision: Union[str, None] = "20261019_07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_deliveries_webhook_id_created_at_id",
+        "deliveries",
+        ["webhook_id", "created_at", "id"],
+        unique=False,
+    )
+    # The composite index has webhook_id as its leftmost column, so it also backs the foreign key.
+    op.drop_index(op.f("ix_deliveries_webhook_id"), table_name="deliveries")
+
+
+def downgrade() -> None:
+    op.create_index(op.f("ix_deliveries_webhook_id"), "deliveries", ["webhook_id"], unique=False)
+    op.drop_index("ix_deliveries_webhook_id_created_at_id", table_name="deliveries")
@@ -0,0 +1,64 @@
+"""add user_id and search indexes to deliveries
+
+Revision ID: 20261019_09
+Revises: 20261019_08
+Create Date: 2026-10-19 12:00:00.000000
+
+user_id is copied from the owning webhook so GET /deliveries can filter
+and order a user's deliveries from a single index range. The column is
+added instantly as nullable, backfilled one webhook at a time in small
+autocommitted batches, and the indexes are built online afterwards.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_09"
+down_revision: Union[str, None] = "20261019_08"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+SEARCH_INDEXES = {
+    "ix_deliveries_user_id_created_at_id": ["user_id", "created_at", "id"],
+    "ix_deliveries_user_id_status_created_at_id": ["user_id", "status", "created_at", "id"],
+    "ix_deliveries_user_id_event_type_created_at_id": ["user_id", "event_type", "created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    op.add_column("deliveries", sa.Column("user_id", sa.String(length=36), nullable=True))
+
+    with op.get_context().autocommit_block():
+        _backfill_user_ids()
+
+    for name, columns in SEARCH_INDEXES.items():
+        op.create_index(name, "deliveries", columns, unique=False)
+
+    # Catch rows written by the previous application version while the indexes were built.
+    with op.get_context().autocommit_block():
+        _backfill_user_ids()
+
+
+def _backfill_user_ids() -> None:
+    bind = op.get_bind()
+    webhooks = bind.execute(sa.text("SELECT id, user_id FROM webhooks")).all()
+    update = sa.text(
+        "UPDATE deliveries SET user_id = :user_id "
+        f"WHERE webhook_id = :webhook_id AND user_id IS NULL LIMIT {BACKFILL_BATCH_SIZE}"
+    )
+    for webhook_id, user_id in webhooks:
+        while True:
+            result = bind.execute(update, {"webhook_id": webhook_id, "user_id": user_id})
+            if result.rowcount < BACKFILL_BATCH_SIZE:
+                break
+
+
+def downgrade() -> None:
+    for name in reversed(list(SEARCH_INDEXES)):
+        op.drop_index(name, table_name="deliveries")
+    op.drop_column("deliveries", "user_id")
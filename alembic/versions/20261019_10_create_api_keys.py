@@ -0,0 +1,61 @@
+"""create api keys and usage windows tables
+
+Revision ID: 20261019_10
+Revises: 20261019_09
+Create Date: 2026-10-19 13:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_10"
+down_revision: Union[str, None] = "20261019_09"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "api_keys",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("key_prefix", sa.String(length=16), nullable=False),
+        sa.Column("key_hash", sa.String(length=64), nullable=False),
+        sa.Column("rate_limit_per_second", sa.Float(), nullable=False),
+        sa.Column("burst", sa.Integer(), nullable=False),
+        sa.Column("request_count", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+        sa.Column("is_active", sa.Boolean(), server_default=sa.text("1"), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_api_keys_user_id"), "api_keys", ["user_id"], unique=False)
+    op.create_index(op.f("ix_api_keys_key_hash"), "api_keys", ["key_hash"], unique=True)
+
+    op.create_table(
+        "api_key_usage_windows",
+        sa.Column("api_key_id", sa.String(length=36), nullable=False),
+        sa.Column("window_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("request_count", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["api_key_id"], ["api_keys.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("api_key_id", "window_start"),
+    )
+    op.create_index(
+        op.f("ix_api_key_usage_windows_window_start"),
+        "api_key_usage_windows",
+        ["window_start"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_api_key_usage_windows_window_start"), table_name="api_key_usage_windows")
+    op.drop_table("api_key_usage_windows")
+    op.drop_index(op.f("ix_api_keys_key_hash"), table_name="api_keys")
+    op.drop_index(op.f("ix_api_keys_user_id"), table_name="api_keys")
+    op.drop_table("api_keys")
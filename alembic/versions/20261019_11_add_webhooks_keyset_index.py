@@ -0,0 +1,32 @@
+"""add (user_id, created_at, id) index for webhook list keyset pagination
+
+Revision ID: 20261019_11
+Revises: 20261019_10
+Create Date: 2026-10-19 14:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_11"
+down_revision: Union[str, None] = "20261019_10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_webhooks_user_id_created_at_id",
+        "webhooks",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+    # The composite index has user_id as its leftmost column, so it also backs the foreign key.
+    op.drop_index(op.f("ix_webhooks_user_id"), table_name="webhooks")
+
+
+def downgrade() -> None:
+    op.create_index(op.f("ix_webhooks_user_id"), "webhooks", ["user_id"], unique=False)
+    op.drop_index("ix_webhooks_user_id_created_at_id", table_name="webhooks")
@@ -0,0 +1,28 @@
+"""add version column to webhooks
+
+Revision ID: 20261019_12
+Revises: 20261019_11
+Create Date: 2026-10-19 15:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_12"
+down_revision: Union[str, None] = "20261019_11"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "webhooks",
+        sa.Column("version", sa.BigInteger(), server_default=sa.text("1"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("webhooks", "version")
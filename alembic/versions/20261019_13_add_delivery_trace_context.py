@@ -0,0 +1,25 @@
+"""add trace_context column to deliveries
+
+Revision ID: 20261019_13
+Revises: 20261019_12
+Create Date: 2026-10-19 16:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_13"
+down_revision: Union[str, None] = "20261019_12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("deliveries", sa.Column("trace_context", sa.String(length=55), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("deliveries", "trace_context")
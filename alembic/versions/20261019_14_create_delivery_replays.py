@@ -0,0 +1,66 @@
+"""create delivery replays table and add attempts_before_replay to deliveries
+
+Revision ID: 20261019_14
+Revises: 20261019_13
+Create Date: 2026-10-19 17:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_14"
+down_revision: Union[str, None] = "20261019_13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "deliveries",
+        sa.Column("attempts_before_replay", sa.Integer(), server_default=sa.text("0"), nullable=False),
+    )
+
+    op.create_table(
+        "delivery_replays",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("webhook_id", sa.String(length=36), nullable=False),
+        sa.Column("created_from", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_to", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("running", "completed", "cancelled", name="delivery_replay_status"),
+            server_default=sa.text("'running'"),
+            nullable=False,
+        ),
+        sa.Column("rate_per_second", sa.Float(), nullable=False),
+        sa.Column("chunk_size", sa.Integer(), nullable=False),
+        sa.Column("total_count", sa.Integer(), nullable=False),
+        sa.Column("replayed_count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("cursor_created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("cursor_id", sa.String(length=36), nullable=True),
+        sa.Column("next_run_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["webhook_id"], ["webhooks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_delivery_replays_user_id"), "delivery_replays", ["user_id"], unique=False)
+    op.create_index(
+        "ix_delivery_replays_status_next_run_at",
+        "delivery_replays",
+        ["status", "next_run_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_delivery_replays_status_next_run_at", table_name="delivery_replays")
+    op.drop_index(op.f("ix_delivery_replays_user_id"), table_name="delivery_replays")
+    op.drop_table("delivery_replays")
+    op.drop_column("deliveries", "attempts_before_replay")
@@ -0,0 +1,36 @@
+"""create delivery attempt responses table and add response_sample_rate to webhooks
+
+Revision ID: 20261019_15
+Revises: 20261019_14
+Create Date: 2026-10-19 18:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_15"
+down_revision: Union[str, None] = "20261019_14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "delivery_attempt_responses",
+        sa.Column("attempt_id", sa.BINARY(length=16), nullable=False),
+        sa.Column("encoding", sa.String(length=16), nullable=False),
+        sa.Column("body", sa.LargeBinary(length=16777215), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("truncated", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["attempt_id"], ["delivery_attempts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("attempt_id"),
+    )
+    op.add_column("webhooks", sa.Column("response_sample_rate", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("webhooks", "response_sample_rate")
+    op.drop_table("delivery_attempt_responses")
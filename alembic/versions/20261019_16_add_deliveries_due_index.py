@@ -0,0 +1,35 @@
+"""index pending deliveries by due time
+
+Revision ID: 20261019_16
+Revises: 20261019_15
+Create Date: 2026-10-19 19:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_16"
+down_revision: Union[str, None] = "20261019_15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "UPDATE deliveries SET next_attempt_at = created_at "
+        "WHERE status = 'pending' AND next_attempt_at IS NULL"
+    )
+    op.create_index(
+        "ix_deliveries_status_next_attempt_at",
+        "deliveries",
+        ["status", "next_attempt_at"],
+        unique=False,
+    )
+    op.drop_index("ix_deliveries_next_attempt_at", table_name="deliveries")
+
+
+def downgrade() -> None:
+    op.create_index("ix_deliveries_next_attempt_at", "deliveries", ["next_attempt_at"], unique=False)
+    op.drop_index("ix_deliveries_status_next_attempt_at", table_name="deliveries")
@@ -0,0 +1,32 @@
+"""add ordering_key column to deliveries
+
+Revision ID: 20261019_17
+Revises: 20261019_16
+Create Date: 2026-10-19 20:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_17"
+down_revision: Union[str, None] = "20261019_16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("deliveries", sa.Column("ordering_key", sa.String(length=255), nullable=True))
+    op.create_index(
+        "ix_deliveries_webhook_id_ordering_key_status_id",
+        "deliveries",
+        ["webhook_id", "ordering_key", "status", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_deliveries_webhook_id_ordering_key_status_id", table_name="deliveries")
+    op.drop_column("deliveries", "ordering_key")
@@ -0,0 +1,25 @@
+"""add payload_filter column to webhooks
+
+Revision ID: 20261019_18
+Revises: 20261019_17
+Create Date: 2026-10-19 21:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_18"
+down_revision: Union[str, None] = "20261019_17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("webhooks", sa.Column("payload_filter", sa.String(length=1024), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("webhooks", "payload_filter")
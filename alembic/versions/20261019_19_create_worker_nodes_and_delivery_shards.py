@@ -0,0 +1,49 @@
+"""create worker_nodes table and shard deliveries by webhook
+
+Revision ID: 20261019_19
+Revises: 20261019_18
+Create Date: 2026-10-19 22:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_19"
+down_revision: Union[str, None] = "20261019_18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "worker_nodes",
+        sa.Column("id", sa.String(length=128), nullable=False),
+        sa.Column("hostname", sa.String(length=255), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_worker_nodes_heartbeat_at", "worker_nodes", ["heartbeat_at"], unique=False)
+
+    op.add_column(
+        "deliveries",
+        sa.Column("shard", sa.SmallInteger(), nullable=False, server_default=sa.text("0")),
+    )
+    # Must match app.sharding.shard_for_webhook: zlib.crc32 is the same CRC-32 as MySQL's CRC32().
+    op.execute("UPDATE deliveries SET shard = CRC32(webhook_id) % 64 WHERE status = 'pending'")
+    op.create_index(
+        "ix_deliveries_shard_status_next_attempt_at",
+        "deliveries",
+        ["shard", "status", "next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_deliveries_shard_status_next_attempt_at", table_name="deliveries")
+    op.drop_column("deliveries", "shard")
+    op.drop_index("ix_worker_nodes_heartbeat_at", table_name="worker_nodes")
+    op.drop_table("worker_nodes")
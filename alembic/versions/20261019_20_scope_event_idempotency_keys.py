@@ -0,0 +1,42 @@
+"""scope event idempotency keys per producer and store a request hash
+
+Revision ID: 20261019_20
+Revises: 20261019_19
+Create Date: 2026-10-19 23:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_20"
+down_revision: Union[str, None] = "20261019_19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing keys land in the anonymous scope and have no hash, so they replay without a body check
+    # until they expire.
+    op.add_column(
+        "event_idempotency_keys",
+        sa.Column("scope", sa.String(length=36), server_default="", nullable=False),
+    )
+    op.add_column("event_idempotency_keys", sa.Column("request_hash", sa.String(length=64), nullable=True))
+    op.create_index(
+        "ix_event_idempotency_keys_scope_key",
+        "event_idempotency_keys",
+        ["scope", "key"],
+        unique=True,
+    )
+    op.drop_index(op.f("ix_event_idempotency_keys_key"), table_name="event_idempotency_keys")
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM event_idempotency_keys WHERE scope <> ''")
+    op.create_index(op.f("ix_event_idempotency_keys_key"), "event_idempotency_keys", ["key"], unique=True)
+    op.drop_index("ix_event_idempotency_keys_scope_key", table_name="event_idempotency_keys")
+    op.drop_column("event_idempotency_keys", "request_hash")
+    op.drop_column("event_idempotency_keys", "scope")
@@ -0,0 +1,28 @@
+"""add ordering_deferred flag to deliveries
+
+Revision ID: 20261019_21
+Revises: 20261019_20
+Create Date: 2026-10-20 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_21"
+down_revision: Union[str, None] = "20261019_20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "deliveries",
+        sa.Column("ordering_deferred", sa.Boolean(), server_default=sa.text("0"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("deliveries", "ordering_deferred")
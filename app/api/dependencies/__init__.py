@@ -1,3 +1,5 @@
+from app.api.dependencies.admin import require_admin
 from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.ingest import get_ingest_credential
 
-__all__ = ["get_current_user"]
+__all__ = ["get_current_user", "get_ingest_credential", "require_admin"]
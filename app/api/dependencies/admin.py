@@ -0,0 +1,11 @@
+from fastapi import Depends, HTTPException, status
+
+from app.api.dependencies.auth import get_current_user
+from app.config import settings
+from app.models.user import User
+
+
+async def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    if current_user.email.lower() not in settings.ADMIN_EMAIL_LIST:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required.")
+    return current_user
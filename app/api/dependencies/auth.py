@@ -6,6 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.repositories.user_repository import get_user_by_id
 from app.db.session import get_session
 from app.models.user import User
+from app.request_timing import timed_phase
+from app.services.auth_cache import cache_token_subject, cache_user, get_cached_token_subject, get_cached_user
 from app.services.jwt import decode_access_token
 
 bearer_scheme = HTTPBearer(auto_error=False)
@@ -14,6 +16,14 @@ bearer_scheme = HTTPBearer(auto_error=False)
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
     session: AsyncSession = Depends(get_session),
+) -> User:
+    with timed_phase("auth"):
+        return await _resolve_current_user(credentials, session)
+
+
+async def _resolve_current_user(
+    credentials: HTTPAuthorizationCredentials | None,
+    session: AsyncSession,
 ) -> User:
     if credentials is None:
         raise HTTPException(
@@ -22,20 +32,27 @@ async def get_current_user(
         )
 
     token = credentials.credentials
-    try:
-        payload = decode_access_token(token)
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token.",
-        ) from None
+    user_id = get_cached_token_subject(token)
+    if user_id is None:
+        try:
+            payload = decode_access_token(token)
+        except JWTError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token.",
+            ) from None
 
-    user_id = payload.get("sub")
-    if not isinstance(user_id, str) or not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload.",
-        )
+        user_id = payload.get("sub")
+        if not isinstance(user_id, str) or not user_id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token payload.",
+            )
+        cache_token_subject(token, payload)
+
+    user = get_cached_user(user_id)
+    if user is not None:
+        return user
 
     user = await get_user_by_id(session, user_id)
     if user is None:
@@ -44,4 +61,5 @@ async def get_current_user(
             detail="Invalid or expired token.",
         )
 
+    cache_user(user)
     return user
@@ -0,0 +1,17 @@
+from fastapi import Depends
+from fastapi.security import APIKeyHeader
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_session
+from app.services.api_key_service import IngestCredential, authenticate_api_key
+
+api_key_scheme = APIKeyHeader(name="X-API-Key", auto_error=False)
+
+
+async def get_ingest_credential(
+    raw_key: str | None = Depends(api_key_scheme),
+    session: AsyncSession = Depends(get_session),
+) -> IngestCredential | None:
+    # Authenticates only. Routes charge the rate limit once the request has validated: per
+    # request for single events, per accepted line for streams.
+    return await authenticate_api_key(session, raw_key)
@@ -0,0 +1,34 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import UTC, datetime
+
+from fastapi import HTTPException, status
+
+
+def encode_keyset_cursor(created_at: datetime, row_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_keyset_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at_raw, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(row_id, str):
+            raise ValueError("cursor id must be a string")
+        # Every paginated table is keyed by a UUID; a tampered id must fail here, not at bind time.
+        return datetime.fromisoformat(created_at_raw), str(uuid.UUID(row_id))
+    except (binascii.Error, UnicodeError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        ) from None
+
+
+def to_utc_naive(value: datetime | None) -> datetime | None:
+    # Timestamps are stored as naive UTC DATETIME columns; compare like with like.
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
@@ -1,6 +1,21 @@
+from app.api.routes.admin import router as admin_router
+from app.api.routes.api_keys import router as api_keys_router
 from app.api.routes.auth import router as auth_router
+from app.api.routes.dead_letters import router as dead_letters_router
 from app.api.routes.deliveries import router as deliveries_router
+from app.api.routes.delivery_search import router as delivery_search_router
 from app.api.routes.events import router as events_router
+from app.api.routes.metrics import router as metrics_router
 from app.api.routes.webhooks import router as webhooks_router
 
-__all__ = ["auth_router", "webhooks_router", "events_router", "deliveries_router"]
+__all__ = [
+    "auth_router",
+    "webhooks_router",
+    "api_keys_router",
+    "events_router",
+    "deliveries_router",
+    "delivery_search_router",
+    "dead_letters_router",
+    "metrics_router",
+    "admin_router",
+]
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.api.dependencies.admin import require_admin
+from app.api.timing import TimedRoute
+from app.config import settings
+from app.services.profiler import ProfileMode, ProfilerBusyError, ProfilerUnavailableError, record_profile
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+    route_class=TimedRoute,
+)
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_process(
+    seconds: float = Query(default=10.0, gt=0, le=settings.PROFILER_MAX_SECONDS),
+    interval_ms: float = Query(default=10.0, ge=1, le=1000),
+    mode: ProfileMode = Query(default=ProfileMode.CPU),
+    include_idle: bool = Query(default=False),
+) -> PlainTextResponse:
+    try:
+        profile = await record_profile(
+            mode=mode,
+            seconds=seconds,
+            interval_seconds=interval_ms / 1000,
+            include_idle=include_idle,
+        )
+    except ProfilerBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A profile is already being recorded.",
+        ) from None
+    except ProfilerUnavailableError as exc:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(exc)) from None
+    return PlainTextResponse(
+        profile.folded(),
+        headers={
+            "X-Profile-Mode": profile.mode.value,
+            "X-Profile-Samples": str(profile.samples),
+            "X-Profile-Interval-Ms": f"{interval_ms:g}",
+        },
+    )
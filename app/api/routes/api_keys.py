@@ -0,0 +1,54 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.auth import get_current_user
+from app.api.timing import TimedRoute
+from app.db.repositories.api_key_repository import get_api_key_by_id_for_user, list_api_keys_by_user
+from app.db.session import get_session
+from app.models.user import User
+from app.schemas.api_key import ApiKeyCreateRequest, ApiKeyCreateResponse, ApiKeyResponse
+from app.services.api_key_service import issue_api_key, revoke_ingest_api_key
+
+router = APIRouter(prefix="/api-keys", tags=["api-keys"], route_class=TimedRoute)
+
+
+@router.post("", response_model=ApiKeyCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_api_key_route(
+    payload: ApiKeyCreateRequest,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> ApiKeyCreateResponse:
+    api_key, raw_key = await issue_api_key(
+        session,
+        user_id=current_user.id,
+        name=payload.name,
+        rate_limit_per_second=payload.rate_limit_per_second,
+        burst=payload.burst,
+    )
+    # The plaintext key is only ever returned here; the database keeps its hash.
+    return ApiKeyCreateResponse(**ApiKeyResponse.model_validate(api_key).model_dump(), api_key=raw_key)
+
+
+@router.get("", response_model=list[ApiKeyResponse])
+async def list_api_keys_route(
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> list[ApiKeyResponse]:
+    api_keys = await list_api_keys_by_user(session, current_user.id)
+    return [ApiKeyResponse.model_validate(api_key) for api_key in api_keys]
+
+
+@router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_api_key_route(
+    id: uuid.UUID,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    api_key = await get_api_key_by_id_for_user(session, str(id), current_user.id)
+    if api_key is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="API key not found.")
+
+    await revoke_ingest_api_key(session, api_key)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
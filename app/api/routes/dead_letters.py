@@ -0,0 +1,160 @@
+import uuid
+from datetime import UTC, datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.auth import get_current_user
+from app.api.pagination import decode_keyset_cursor, encode_keyset_cursor, to_utc_naive
+from app.api.timing import TimedRoute
+from app.db.repositories.delivery_history_repository import (
+    list_attempts_for_delivery_ids,
+    search_deliveries_for_user,
+)
+from app.db.repositories.delivery_replay_repository import (
+    cancel_delivery_replay,
+    get_delivery_replay_by_id_for_user,
+    list_delivery_replays_by_user,
+)
+from app.db.repositories.webhook_repository import get_webhook_by_id_for_user
+from app.db.session import get_session
+from app.models.delivery import DeliveryStatus
+from app.models.delivery_attempt import DeliveryAttempt
+from app.models.user import User
+from app.schemas.dead_letter import (
+    DeadLetterListResponse,
+    DeliveryReplayCreateRequest,
+    DeliveryReplayResponse,
+)
+from app.serialization import FastJSONResponse
+from app.services.delivery_replay import start_delivery_replay
+from app.services.response_capture import load_response_bodies
+
+router = APIRouter(prefix="/dead-letters", tags=["dead-letters"], route_class=TimedRoute)
+
+
+@router.get("", response_model=DeadLetterListResponse)
+async def list_dead_letters(
+    webhook_id: uuid.UUID | None = Query(default=None),
+    created_after: datetime | None = Query(default=None),
+    created_before: datetime | None = Query(default=None),
+    cursor: str | None = Query(default=None),
+    page_size: int = Query(default=20, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> FastJSONResponse:
+    before = decode_keyset_cursor(cursor) if cursor is not None else None
+
+    deliveries = await search_deliveries_for_user(
+        session=session,
+        user_id=current_user.id,
+        status=DeliveryStatus.PERMANENTLY_FAILED,
+        webhook_id=str(webhook_id) if webhook_id is not None else None,
+        created_from=to_utc_naive(created_after),
+        created_to=to_utc_naive(created_before),
+        before=before,
+        limit=page_size + 1,
+    )
+    next_cursor: str | None = None
+    if len(deliveries) > page_size:
+        deliveries = deliveries[:page_size]
+        last = deliveries[-1]
+        next_cursor = encode_keyset_cursor(last.created_at, last.id)
+
+    attempts = await list_attempts_for_delivery_ids(
+        session=session,
+        delivery_ids=[delivery.id for delivery in deliveries],
+    )
+    # Attempts come back ordered by attempt_number, so the last one seen per delivery wins.
+    attempt_counts: dict[str, int] = {}
+    last_attempts: dict[str, DeliveryAttempt] = {}
+    for attempt in attempts:
+        attempt_counts[attempt.delivery_id] = attempt_counts.get(attempt.delivery_id, 0) + 1
+        last_attempts[attempt.delivery_id] = attempt
+    response_bodies = await load_response_bodies(session, list(last_attempts.values()))
+
+    results = []
+    for delivery in deliveries:
+        last_attempt = last_attempts.get(delivery.id)
+        results.append(
+            {
+                "id": delivery.id,
+                "webhook_id": delivery.webhook_id,
+                "event_type": delivery.event_type,
+                "created_at": delivery.created_at,
+                "failed_at": delivery.updated_at,
+                "attempt_count": attempt_counts.get(delivery.id, 0),
+                "last_http_status": last_attempt.http_status if last_attempt is not None else None,
+                "last_response_body": response_bodies[last_attempt.id] if last_attempt is not None else None,
+                "last_attempted_at": last_attempt.attempted_at if last_attempt is not None else None,
+            }
+        )
+
+    return FastJSONResponse({"page_size": page_size, "next_cursor": next_cursor, "results": results})
+
+
+@router.post("/replays", response_model=DeliveryReplayResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_delivery_replay_route(
+    payload: DeliveryReplayCreateRequest,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> DeliveryReplayResponse:
+    webhook = await get_webhook_by_id_for_user(
+        session=session,
+        webhook_id=str(payload.webhook_id),
+        user_id=current_user.id,
+    )
+    if webhook is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook not found.")
+
+    replay = await start_delivery_replay(
+        session,
+        user_id=current_user.id,
+        webhook_id=webhook.id,
+        created_from=to_utc_naive(payload.created_after),
+        created_to=to_utc_naive(payload.created_before),
+        rate_per_second=payload.rate_per_second,
+        chunk_size=payload.chunk_size,
+    )
+    return DeliveryReplayResponse.model_validate(replay)
+
+
+@router.get("/replays", response_model=list[DeliveryReplayResponse])
+async def list_delivery_replays_route(
+    limit: int = Query(default=50, ge=1, le=200),
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> list[DeliveryReplayResponse]:
+    replays = await list_delivery_replays_by_user(session, current_user.id, limit=limit)
+    return [DeliveryReplayResponse.model_validate(replay) for replay in replays]
+
+
+@router.get("/replays/{id}", response_model=DeliveryReplayResponse)
+async def get_delivery_replay_route(
+    id: uuid.UUID,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> DeliveryReplayResponse:
+    replay = await get_delivery_replay_by_id_for_user(session, str(id), current_user.id)
+    if replay is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Replay not found.")
+    return DeliveryReplayResponse.model_validate(replay)
+
+
+@router.post("/replays/{id}/cancel", response_model=DeliveryReplayResponse)
+async def cancel_delivery_replay_route(
+    id: uuid.UUID,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> DeliveryReplayResponse:
+    replay = await get_delivery_replay_by_id_for_user(session, str(id), current_user.id)
+    if replay is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Replay not found.")
+
+    # Deliveries already requeued stay pending; cancelling only stops further chunks.
+    if not await cancel_delivery_replay(session, replay, now=datetime.now(UTC)):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Replay is already {replay.status.value}.",
+        )
+    return DeliveryReplayResponse.model_validate(replay)
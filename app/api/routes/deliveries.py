@@ -1,11 +1,17 @@
 import math
 import uuid
 from collections import defaultdict
+from datetime import datetime
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies.auth import get_current_user
+from app.api.pagination import decode_keyset_cursor, encode_keyset_cursor, to_utc_naive
+from app.api.timing import TimedRoute
+from app.config import settings
 from app.db.repositories.delivery_history_repository import (
     get_delivery_count_for_webhook,
     get_delivery_for_webhook,
@@ -16,25 +22,36 @@ from app.db.repositories.delivery_history_repository import (
 from app.db.repositories.webhook_repository import get_webhook_by_id_for_user
 from app.db.session import get_session
 from app.models.user import User
+from app.request_timing import timed_phase
 from app.schemas.delivery import (
     DeliveryAttemptDetailResponse,
-    DeliveryAttemptListItemResponse,
     DeliveryDetailResponse,
     DeliveryHistoryResponse,
-    DeliveryListItemResponse,
 )
+from app.serialization import FastJSONResponse
+from app.services.delivery_export import EXPORT_MEDIA_TYPES, ExportFormat, gzip_stream, iter_delivery_export
+from app.services.response_capture import load_response_bodies
 
-router = APIRouter(prefix="/webhooks/{id}/deliveries", tags=["deliveries"])
+router = APIRouter(prefix="/webhooks/{id}/deliveries", tags=["deliveries"], route_class=TimedRoute)
 
 
 @router.get("", response_model=DeliveryHistoryResponse)
 async def list_delivery_history(
     id: uuid.UUID,
-    page: int = Query(default=1, ge=1),
+    cursor: str | None = Query(default=None),
+    page: int | None = Query(default=None, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
+    include_total: bool = Query(default=False),
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
-) -> DeliveryHistoryResponse:
+) -> FastJSONResponse:
+    if cursor is not None and page is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or page, not both.",
+        )
+    before = decode_keyset_cursor(cursor) if cursor is not None else None
+
     webhook = await get_webhook_by_id_for_user(
         session=session,
         webhook_id=str(id),
@@ -43,51 +60,105 @@ async def list_delivery_history(
     if webhook is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook not found.")
 
-    total_count = await get_delivery_count_for_webhook(session=session, webhook_id=webhook.id)
-    total_pages = math.ceil(total_count / page_size) if total_count > 0 else 0
-    offset = (page - 1) * page_size
+    total_count: int | None = None
+    total_pages: int | None = None
+    if include_total:
+        with timed_phase("count"):
+            total_count = await get_delivery_count_for_webhook(session=session, webhook_id=webhook.id)
+        total_pages = math.ceil(total_count / page_size) if total_count > 0 else 0
+
+    with timed_phase("deliveries"):
+        deliveries = await list_deliveries_for_webhook(
+            session=session,
+            webhook_id=webhook.id,
+            offset=(page - 1) * page_size if page is not None else 0,
+            before=before,
+            limit=page_size + 1,
+        )
+    next_cursor: str | None = None
+    if len(deliveries) > page_size:
+        deliveries = deliveries[:page_size]
+        last = deliveries[-1]
+        next_cursor = encode_keyset_cursor(last.created_at, last.id)
 
-    deliveries = await list_deliveries_for_webhook(
-        session=session,
-        webhook_id=webhook.id,
-        offset=offset,
-        limit=page_size,
-    )
     delivery_ids = [delivery.id for delivery in deliveries]
-    attempts = await list_attempts_for_delivery_ids(session=session, delivery_ids=delivery_ids)
+    with timed_phase("attempts"):
+        attempts = await list_attempts_for_delivery_ids(session=session, delivery_ids=delivery_ids)
 
-    attempts_by_delivery: dict[str, list[DeliveryAttemptListItemResponse]] = defaultdict(list)
+    # Build plain dicts rather than response models; the shapes match DeliveryHistoryResponse.
+    attempts_by_delivery: dict[str, list[dict[str, Any]]] = defaultdict(list)
     for attempt in attempts:
         attempts_by_delivery[attempt.delivery_id].append(
-            DeliveryAttemptListItemResponse(
-                attempt_number=attempt.attempt_number,
-                http_status=attempt.http_status,
-                succeeded=attempt.succeeded,
-                attempted_at=attempt.attempted_at,
-            )
+            {
+                "attempt_number": attempt.attempt_number,
+                "http_status": attempt.http_status,
+                "succeeded": attempt.succeeded,
+                "attempted_at": attempt.attempted_at,
+            }
         )
 
     results = [
-        DeliveryListItemResponse(
-            id=delivery.id,
-            event_type=delivery.event_type,
-            status=delivery.status.value,
-            created_at=delivery.created_at,
-            updated_at=delivery.updated_at,
-            attempts=attempts_by_delivery.get(delivery.id, []),
-        )
+        {
+            "id": delivery.id,
+            "event_type": delivery.event_type,
+            "status": delivery.status.value,
+            "created_at": delivery.created_at,
+            "updated_at": delivery.updated_at,
+            "attempts": attempts_by_delivery.get(delivery.id, []),
+        }
         for delivery in deliveries
     ]
 
-    return DeliveryHistoryResponse(
-        total_count=total_count,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-        results=results,
+    return FastJSONResponse(
+        {
+            "total_count": total_count,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "next_cursor": next_cursor,
+            "results": results,
+        }
     )
 
 
+@router.get("/export", response_class=StreamingResponse)
+async def export_delivery_history(
+    id: uuid.UUID,
+    request: Request,
+    format: ExportFormat = Query(default=ExportFormat.NDJSON),
+    include_attempts: bool = Query(default=False),
+    created_after: datetime | None = Query(default=None),
+    created_before: datetime | None = Query(default=None),
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    webhook = await get_webhook_by_id_for_user(
+        session=session,
+        webhook_id=str(id),
+        user_id=current_user.id,
+    )
+    if webhook is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook not found.")
+
+    body = iter_delivery_export(
+        webhook.id,
+        export_format=format,
+        include_attempts=include_attempts,
+        created_from=to_utc_naive(created_after),
+        created_to=to_utc_naive(created_before),
+        chunk_size=settings.DELIVERY_EXPORT_CHUNK_SIZE,
+    )
+    headers = {
+        "Content-Disposition": f'attachment; filename="deliveries-{webhook.id}.{format.value}"',
+        "Vary": "Accept-Encoding",
+    }
+    if "gzip" in request.headers.get("accept-encoding", "").lower():
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(body, media_type=EXPORT_MEDIA_TYPES[format], headers=headers)
+
+
 @router.get("/{delivery_id}", response_model=DeliveryDetailResponse)
 async def get_delivery_detail(
     id: uuid.UUID,
@@ -112,13 +183,14 @@ async def get_delivery_detail(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Delivery not found.")
 
     attempts = await list_attempts_for_delivery(session=session, delivery_id=delivery.id)
+    response_bodies = await load_response_bodies(session, attempts)
     attempt_items = [
         DeliveryAttemptDetailResponse(
             attempt_number=attempt.attempt_number,
             http_status=attempt.http_status,
             succeeded=attempt.succeeded,
             attempted_at=attempt.attempted_at,
-            response_body=attempt.response_body,
+            response_body=response_bodies[attempt.id],
         )
         for attempt in attempts
     ]
@@ -128,6 +200,7 @@ async def get_delivery_detail(
         webhook_id=delivery.webhook_id,
         event_type=delivery.event_type,
         status=delivery.status.value,
+        ordering_key=delivery.ordering_key,
         payload=delivery.payload,
         created_at=delivery.created_at,
         updated_at=delivery.updated_at,
@@ -0,0 +1,67 @@
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.auth import get_current_user
+from app.api.pagination import decode_keyset_cursor, encode_keyset_cursor, to_utc_naive
+from app.api.timing import TimedRoute
+from app.db.repositories.delivery_history_repository import search_deliveries_for_user
+from app.db.session import get_session
+from app.models.delivery import DeliveryStatus
+from app.models.user import User
+from app.schemas.delivery import DeliverySearchResponse
+from app.serialization import FastJSONResponse
+
+router = APIRouter(prefix="/deliveries", tags=["deliveries"], route_class=TimedRoute)
+
+
+@router.get("", response_model=DeliverySearchResponse)
+async def search_deliveries(
+    status: DeliveryStatus | None = Query(default=None),
+    event_type: str | None = Query(default=None, min_length=1, max_length=255),
+    webhook_id: uuid.UUID | None = Query(default=None),
+    created_after: datetime | None = Query(default=None),
+    created_before: datetime | None = Query(default=None),
+    cursor: str | None = Query(default=None),
+    page_size: int = Query(default=20, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> FastJSONResponse:
+    before = decode_keyset_cursor(cursor) if cursor is not None else None
+
+    deliveries = await search_deliveries_for_user(
+        session=session,
+        user_id=current_user.id,
+        status=status,
+        event_type=event_type.strip() if event_type is not None else None,
+        webhook_id=str(webhook_id) if webhook_id is not None else None,
+        created_from=to_utc_naive(created_after),
+        created_to=to_utc_naive(created_before),
+        before=before,
+        limit=page_size + 1,
+    )
+    next_cursor: str | None = None
+    if len(deliveries) > page_size:
+        deliveries = deliveries[:page_size]
+        last = deliveries[-1]
+        next_cursor = encode_keyset_cursor(last.created_at, last.id)
+
+    return FastJSONResponse(
+        {
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "results": [
+                {
+                    "id": delivery.id,
+                    "webhook_id": delivery.webhook_id,
+                    "event_type": delivery.event_type,
+                    "status": delivery.status.value,
+                    "created_at": delivery.created_at,
+                    "updated_at": delivery.updated_at,
+                }
+                for delivery in deliveries
+            ],
+        }
+    )
@@ -1,22 +1,115 @@
-from fastapi import APIRouter, Depends, status
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.repositories.delivery_repository import create_pending_deliveries_for_event
+from app.api.dependencies.ingest import get_ingest_credential
+from app.api.timing import TimedRoute
+from app.config import settings
 from app.db.session import get_session
-from app.schemas.event import EventIngestRequest, EventIngestResponse
+from app.schemas.event import (
+    EventIngestRequest,
+    EventIngestResponse,
+    EventStreamIngestResponse,
+    EventStreamLineError,
+)
+from app.services.api_key_service import IngestCredential, charge_ingest_request, rate_limit_exceeded
+from app.services.event_service import event_request_hash, queue_event, scheduled_delivery_time
+from app.services.event_stream import (
+    StreamIngestInterrupted,
+    StreamIngestSummary,
+    StreamIngestThrottled,
+    ingest_ndjson_stream,
+)
+from app.services.ingest_batcher import ingest_batcher
+
+router = APIRouter(prefix="/events", tags=["events"], route_class=TimedRoute)
 
-router = APIRouter(prefix="/events", tags=["events"])
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/ndjson"}
 
 
 @router.post("", response_model=EventIngestResponse, status_code=status.HTTP_202_ACCEPTED)
 async def ingest_event(
     payload: EventIngestRequest,
+    response: Response,
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key", min_length=1, max_length=255),
     session: AsyncSession = Depends(get_session),
+    credential: IngestCredential | None = Depends(get_ingest_credential),
 ) -> EventIngestResponse:
-    deliveries = await create_pending_deliveries_for_event(
-        session=session,
-        event_type=payload.event_type,
-        payload=payload.payload,
+    # A key's events only reach its owner's webhooks; without one (keys optional) they fan out to all.
+    user_id = credential.user_id if credential is not None else None
+    request_hash = event_request_hash(payload) if idempotency_key is not None else None
+    deliver_at = scheduled_delivery_time(deliver_at=payload.deliver_at, delay_seconds=payload.delay_seconds)
+    charge_ingest_request(credential)
+    if settings.EVENT_INGEST_GROUP_COMMIT_ENABLED:
+        result = await ingest_batcher.submit(
+            event_type=payload.event_type,
+            payload=payload.payload,
+            idempotency_key=idempotency_key,
+            request_hash=request_hash,
+            deliver_at=deliver_at,
+            ordering_key=payload.ordering_key,
+            user_id=user_id,
+        )
+    else:
+        result = await queue_event(
+            session=session,
+            event_type=payload.event_type,
+            payload=payload.payload,
+            idempotency_key=idempotency_key,
+            request_hash=request_hash,
+            deliver_at=deliver_at,
+            ordering_key=payload.ordering_key,
+            user_id=user_id,
+        )
+    if result.replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return EventIngestResponse(queued_count=len(result.delivery_ids), delivery_ids=result.delivery_ids)
+
+
+@router.post("/stream", response_model=EventStreamIngestResponse, status_code=status.HTTP_202_ACCEPTED)
+async def ingest_event_stream(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    credential: IngestCredential | None = Depends(get_ingest_credential),
+) -> EventStreamIngestResponse:
+    content_type = request.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    if content_type not in NDJSON_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Content-Type must be application/x-ndjson.",
+        )
+
+    try:
+        summary = await ingest_ndjson_stream(
+            session,
+            request.stream(),
+            credential=credential,
+            chunk_size=settings.EVENT_STREAM_CHUNK_SIZE,
+            max_line_bytes=settings.EVENT_STREAM_MAX_LINE_BYTES,
+            max_errors=settings.EVENT_STREAM_MAX_ERRORS,
+        )
+    except StreamIngestThrottled as exc:
+        raise rate_limit_exceeded(exc.decision, detail=_interrupted_detail(exc)) from None
+    except StreamIngestInterrupted as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=_interrupted_detail(exc),
+        ) from None
+    return _stream_response(summary)
+
+
+def _stream_response(summary: StreamIngestSummary) -> EventStreamIngestResponse:
+    return EventStreamIngestResponse(
+        accepted=summary.accepted,
+        rejected=summary.rejected,
+        queued_count=summary.queued_count,
+        errors=[EventStreamLineError(line=error.line, error=error.error) for error in summary.errors],
+        errors_truncated=summary.errors_truncated,
+        committed_through_line=summary.committed_through_line,
     )
-    delivery_ids = [delivery.id for delivery in deliveries]
-    return EventIngestResponse(queued_count=len(delivery_ids), delivery_ids=delivery_ids)
+
+
+def _interrupted_detail(exc: StreamIngestInterrupted) -> dict[str, Any]:
+    # Lines after committed_through_line were not stored; the client resends from the next one.
+    return {"message": str(exc), **_stream_response(exc.summary).model_dump()}
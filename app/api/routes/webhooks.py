@@ -1,10 +1,13 @@
 import secrets
 import uuid
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies.auth import get_current_user
+from app.api.pagination import decode_keyset_cursor, encode_keyset_cursor
+from app.api.timing import TimedRoute
 from app.db.repositories.webhook_repository import (
     create_webhook,
     delete_webhook,
@@ -14,14 +17,25 @@ from app.db.repositories.webhook_repository import (
 )
 from app.db.session import get_session
 from app.models.user import User
+from app.models.webhook import Webhook
 from app.schemas.webhook import (
+    WebhookBulkActivationRequest,
+    WebhookBulkActivationResponse,
+    WebhookBulkCreateRequest,
+    WebhookBulkCreateResponse,
+    WebhookBulkUpdateRequest,
+    WebhookBulkUpdateResponse,
     WebhookCreateRequest,
     WebhookCreateResponse,
     WebhookResponse,
     WebhookUpdateRequest,
 )
+from app.serialization import FastJSONResponse
+from app.services.webhook_bulk_service import bulk_create_webhooks, bulk_set_webhooks_active, bulk_update_webhooks
 
-router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+router = APIRouter(prefix="/webhooks", tags=["webhooks"], route_class=TimedRoute)
+
+_DEFAULT_WEBHOOK_PAGE_SIZE = 100
 
 
 @router.post("", response_model=WebhookCreateResponse, status_code=status.HTTP_201_CREATED)
@@ -38,17 +52,84 @@ async def create_webhook_route(
         url=str(payload.url),
         event_types=payload.event_types,
         secret=secret,
+        response_sample_rate=payload.response_sample_rate,
+        payload_filter=payload.payload_filter,
     )
     return WebhookCreateResponse.model_validate(webhook)
 
 
 @router.get("", response_model=list[WebhookResponse])
 async def list_webhooks_route(
+    request: Request,
+    cursor: str | None = Query(default=None),
+    page_size: int | None = Query(default=None, ge=1, le=1000),
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> FastJSONResponse:
+    # Clients opt into pages by sending page_size or cursor; without either the whole list comes
+    # back as before, so existing clients never silently see only the first page.
+    if cursor is None and page_size is None:
+        webhooks = await list_webhooks_by_user(session=session, user_id=current_user.id)
+        return FastJSONResponse([_webhook_item(webhook) for webhook in webhooks])
+
+    page_size = page_size or _DEFAULT_WEBHOOK_PAGE_SIZE
+    before = decode_keyset_cursor(cursor) if cursor is not None else None
+    webhooks = await list_webhooks_by_user(
+        session=session,
+        user_id=current_user.id,
+        limit=page_size + 1,
+        before=before,
+    )
+
+    # The body stays a plain list; the next page is advertised in headers.
+    headers: dict[str, str] = {}
+    if len(webhooks) > page_size:
+        webhooks = webhooks[:page_size]
+        last = webhooks[-1]
+        next_cursor = encode_keyset_cursor(last.created_at, last.id)
+        next_url = request.url.include_query_params(cursor=next_cursor, page_size=page_size)
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    # Rows map 1:1 onto WebhookResponse, so skip per-item model construction and validation.
+    return FastJSONResponse([_webhook_item(webhook) for webhook in webhooks], headers=headers)
+
+
+@router.post("/bulk", response_model=WebhookBulkCreateResponse)
+async def bulk_create_webhooks_route(
+    payload: WebhookBulkCreateRequest,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> WebhookBulkCreateResponse:
+    results = await bulk_create_webhooks(session, user_id=current_user.id, items=payload.items)
+    succeeded = sum(1 for result in results if result.status == "created")
+    return WebhookBulkCreateResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+@router.patch("/bulk", response_model=WebhookBulkUpdateResponse)
+async def bulk_update_webhooks_route(
+    payload: WebhookBulkUpdateRequest,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
-) -> list[WebhookResponse]:
-    webhooks = await list_webhooks_by_user(session=session, user_id=current_user.id)
-    return [WebhookResponse.model_validate(webhook) for webhook in webhooks]
+) -> WebhookBulkUpdateResponse:
+    results = await bulk_update_webhooks(session, user_id=current_user.id, items=payload.items)
+    succeeded = sum(1 for result in results if result.status == "updated")
+    return WebhookBulkUpdateResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+@router.post("/bulk/activation", response_model=WebhookBulkActivationResponse)
+async def bulk_set_webhooks_active_route(
+    payload: WebhookBulkActivationRequest,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> WebhookBulkActivationResponse:
+    results = await bulk_set_webhooks_active(
+        session,
+        user_id=current_user.id,
+        webhook_ids=[str(webhook_id) for webhook_id in payload.ids],
+        is_active=payload.is_active,
+    )
+    succeeded = sum(1 for result in results if result.status == "updated")
+    return WebhookBulkActivationResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
 
 
 @router.get("/{id}", response_model=WebhookResponse)
@@ -87,6 +168,8 @@ async def update_webhook_route(
         webhook=webhook,
         url=str(payload.url) if payload.url is not None else None,
         event_types=payload.event_types,
+        response_sample_rate=payload.response_sample_rate,
+        payload_filter=payload.payload_filter,
     )
     return WebhookResponse.model_validate(updated)
 
@@ -107,3 +190,17 @@ async def delete_webhook_route(
 
     await delete_webhook(session=session, webhook=webhook)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+def _webhook_item(webhook: Webhook) -> dict[str, Any]:
+    return {
+        "id": webhook.id,
+        "user_id": webhook.user_id,
+        "url": webhook.url,
+        "event_types": webhook.event_types,
+        "is_active": webhook.is_active,
+        "response_sample_rate": webhook.response_sample_rate,
+        "payload_filter": webhook.payload_filter,
+        "created_at": webhook.created_at,
+        "updated_at": webhook.updated_at,
+    }
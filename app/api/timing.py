@@ -0,0 +1,119 @@
+import functools
+import time
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import registry
+from app.request_timing import (
+    RequestTimings,
+    current_request_timings,
+    finish_request_timings,
+    record_phase,
+    start_request_timings,
+)
+
+request_seconds = registry.histogram(
+    "http_request_seconds",
+    "HTTP request duration by route template and status.",
+    ("method", "route", "status"),
+)
+request_phase_seconds = registry.histogram(
+    "http_request_phase_seconds",
+    "Time spent in each request phase (deps, endpoint, serialize, db, ...).",
+    ("route", "phase"),
+)
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp, *, emit_header: bool = True) -> None:
+        self.app = app
+        self.emit_header = emit_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings, token = start_request_timings()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.emit_header:
+                    MutableHeaders(scope=message).append("Server-Timing", format_server_timing(timings))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - timings.started_at
+            route = _route_template(scope)
+            request_seconds.observe(elapsed, method=scope["method"], route=route, status=str(status_code))
+            for phase, seconds in timings.phases.items():
+                request_phase_seconds.observe(seconds, route=route, phase=phase)
+            finish_request_timings(token)
+
+
+class TimedRoute(APIRoute):
+    # Splits the route handler into dependency resolution, the endpoint body and response
+    # serialization by timestamping around the endpoint call.
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            timings = current_request_timings()
+            if timings is None:
+                return await handler(request)
+            started = time.perf_counter()
+            response = await handler(request)
+            finished = time.perf_counter()
+            endpoint_started = timings.marks.get("endpoint_started", finished)
+            endpoint_finished = timings.marks.get("endpoint_finished", finished)
+            record_phase("deps", endpoint_started - started)
+            record_phase("serialize", finished - endpoint_finished)
+            return response
+
+        return timed_handler
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(endpoint)
+    async def timed(*args: Any, **kwargs: Any) -> Any:
+        timings = current_request_timings()
+        if timings is None:
+            return await endpoint(*args, **kwargs)
+        timings.marks["endpoint_started"] = time.perf_counter()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timings.marks["endpoint_finished"] = time.perf_counter()
+            record_phase("endpoint", timings.marks["endpoint_finished"] - timings.marks["endpoint_started"])
+
+    return timed
+
+
+def format_server_timing(timings: RequestTimings) -> str:
+    entries = []
+    for phase, seconds in timings.phases.items():
+        entry = f"{phase};dur={seconds * 1000:.2f}"
+        if phase == "db":
+            entry += f';desc="{timings.counts[phase]} queries"'
+        entries.append(entry)
+    entries.append(f"total;dur={(time.perf_counter() - timings.started_at) * 1000:.2f}")
+    return ", ".join(entries)
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
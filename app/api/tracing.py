@@ -0,0 +1,39 @@
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.tracing import SpanKind, parse_traceparent, tracer
+
+
+class TracingMiddleware:
+    # Opens the server span for each request, continuing the caller's trace when it sends a
+    # traceparent header, so ingest spans (and the deliveries they create) join that trace.
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        with tracer.start_span(
+            f"{method} request",
+            parent=parse_traceparent(Headers(scope=scope).get("traceparent")),
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": method},
+        ) as span:
+
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_error(f"HTTP {message['status']}")
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None and span.recording:
+                    span.name = f"{method} {route}"
+                    span.set_attribute("http.route", route)
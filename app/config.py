@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -9,15 +11,60 @@ class Settings(BaseSettings):
     DB_USER: str = Field(default="webhook_user")
     DB_PASSWORD: str = Field(default="")
     DB_NAME: str = Field(default="webhook_db")
+    DB_STATEMENT_METRICS_ENABLED: bool = Field(default=True)
+    DB_SLOW_QUERY_THRESHOLD_MS: float = Field(default=500.0, ge=0)
+
+    # Database pools (per process role)
+    DB_API_POOL_SIZE: int = Field(default=10, ge=1)
+    DB_API_MAX_OVERFLOW: int = Field(default=20, ge=0)
+    DB_API_POOL_TIMEOUT_SECONDS: float = Field(default=10.0, gt=0)
+    DB_API_POOL_RECYCLE_SECONDS: int = Field(default=1800)
+    DB_API_POOL_PRE_PING: bool = Field(default=True)
+    DB_WORKER_POOL_SIZE: int = Field(default=4, ge=1)
+    DB_WORKER_MAX_OVERFLOW: int = Field(default=4, ge=0)
+    DB_WORKER_POOL_TIMEOUT_SECONDS: float = Field(default=30.0, gt=0)
+    DB_WORKER_POOL_RECYCLE_SECONDS: int = Field(default=1800)
+    DB_WORKER_POOL_PRE_PING: bool = Field(default=True)
 
     # JWT
     JWT_SECRET: str = Field(..., min_length=1)
     JWT_ALGORITHM: str = Field(default="HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(..., gt=0)
+    AUTH_CACHE_ENABLED: bool = Field(default=True)
+    AUTH_CACHE_TTL_SECONDS: float = Field(default=60.0, ge=0)
+    AUTH_CACHE_MAX_ENTRIES: int = Field(default=10000, ge=0)
+    PASSWORD_HASH_WORKERS: int = Field(default=4, ge=1)
+    PASSWORD_HASH_MAX_QUEUE: int = Field(default=64, ge=0)
 
     # App
     APP_ENV: str = Field(default="development")
     APP_DEBUG: bool = Field(default=False)
+    SERVER_TIMING_HEADER_ENABLED: bool = Field(default=True)
+    ADMIN_EMAILS: str = Field(default="")
+    PROFILER_MAX_SECONDS: float = Field(default=60.0, gt=0)
+
+    # Tracing
+    TRACING_EXPORTER: str = Field(default="none")
+    TRACING_SAMPLE_RATIO: float = Field(default=0.01, ge=0, le=1)
+    TRACING_SERVICE_NAME: str = Field(default="webhook-delivery-system")
+    TRACING_FILE_PATH: str = Field(default="traces-{role}.jsonl")
+    TRACING_OTLP_ENDPOINT: str = Field(default="http://localhost:4318")
+    TRACING_OTLP_TIMEOUT_SECONDS: float = Field(default=5.0, gt=0)
+    TRACING_EXPORT_BATCH_SIZE: int = Field(default=512, ge=1)
+    TRACING_EXPORT_QUEUE_SIZE: int = Field(default=4096, ge=1)
+    TRACING_EXPORT_INTERVAL_SECONDS: float = Field(default=2.0, gt=0)
+
+    # Webhooks
+    WEBHOOK_BULK_MAX_ITEMS: int = Field(default=1000, ge=1)
+
+    # Delivery history
+    DELIVERY_EXPORT_CHUNK_SIZE: int = Field(default=1000, ge=1)
+
+    # Dead-letter replay
+    DELIVERY_REPLAY_DEFAULT_RATE_PER_SECOND: float = Field(default=50.0, gt=0)
+    DELIVERY_REPLAY_MAX_RATE_PER_SECOND: float = Field(default=1000.0, gt=0)
+    DELIVERY_REPLAY_MAX_CHUNK_SIZE: int = Field(default=1000, ge=1)
+    DELIVERY_REPLAY_POLL_INTERVAL_SECONDS: float = Field(default=1.0, gt=0)
 
     # Worker
     WORKER_POLL_INTERVAL_SECONDS: float = Field(default=2.0, gt=0)
@@ -26,6 +73,50 @@ class Settings(BaseSettings):
     WORKER_MAX_BACKOFF_SECONDS: float = Field(default=60.0, ge=0)
     WORKER_HTTP_TIMEOUT_SECONDS: float = Field(default=10.0, gt=0)
     WORKER_SUCCESS_STATUS_CODES: str = Field(default="200,201,202,204")
+    WORKER_WEBHOOK_CACHE_MAX_ENTRIES: int = Field(default=10000, ge=0)
+    WORKER_WEBHOOK_CACHE_MAX_AGE_SECONDS: float = Field(default=300.0, ge=0)
+    WORKER_WEBHOOK_CACHE_REVALIDATE_SECONDS: float = Field(default=5.0, gt=0)
+    WORKER_METRICS_PORT: int = Field(default=0, ge=0, le=65535)
+    WORKER_SHUTDOWN_GRACE_SECONDS: float = Field(default=20.0, ge=0)
+    WORKER_ORDERING_DEFER_SECONDS: int = Field(default=300, ge=1)
+    WORKER_RESPONSE_CAPTURE_SUCCESSES: bool = Field(default=False)
+    WORKER_RESPONSE_CAPTURE_MAX_BYTES: int = Field(default=16384, ge=1, le=16777215)
+    WORKER_RESPONSE_CAPTURE_SAMPLE_RATE: float = Field(default=1.0, ge=0, le=1)
+    WORKER_SHARDING_ENABLED: bool = Field(default=False)
+    WORKER_HEARTBEAT_INTERVAL_SECONDS: float = Field(default=5.0, gt=0)
+    WORKER_HEARTBEAT_TTL_SECONDS: float = Field(default=20.0, gt=0)
+
+    # Delivery queue
+    DELIVERY_QUEUE_BACKEND: str = Field(default="mysql")
+    DELIVERY_QUEUE_LOG_DIR: str = Field(default="delivery-queue")
+    DELIVERY_QUEUE_LOG_SEGMENT_BYTES: int = Field(default=67108864, ge=4096)
+    DELIVERY_QUEUE_LOG_FSYNC: bool = Field(default=False)
+    DELIVERY_QUEUE_LOG_RETRY_BUCKET_SECONDS: int = Field(default=10, ge=1)
+    DELIVERY_QUEUE_LOG_READ_BATCH_SIZE: int = Field(default=1000, ge=1)
+    DELIVERY_QUEUE_LOG_RECONCILE_ON_START: bool = Field(default=True)
+    DELIVERY_QUEUE_LOG_SCHEDULED_CACHE_SIZE: int = Field(default=100000, ge=0)
+
+    # Event ingest
+    EVENT_IDEMPOTENCY_TTL_SECONDS: int = Field(default=86400, gt=0)
+    EVENT_MAX_SCHEDULE_AHEAD_SECONDS: int = Field(default=2592000, gt=0)
+    EVENT_IDEMPOTENCY_GC_INTERVAL_SECONDS: float = Field(default=300.0, gt=0)
+    EVENT_IDEMPOTENCY_GC_BATCH_SIZE: int = Field(default=1000, ge=1)
+    EVENT_INGEST_GROUP_COMMIT_ENABLED: bool = Field(default=False)
+    EVENT_INGEST_GROUP_COMMIT_MAX_BATCH_SIZE: int = Field(default=100, ge=1)
+    EVENT_INGEST_GROUP_COMMIT_MAX_WAIT_MS: float = Field(default=5.0, ge=0)
+    EVENT_STREAM_CHUNK_SIZE: int = Field(default=500, ge=1)
+    EVENT_STREAM_MAX_LINE_BYTES: int = Field(default=1048576, ge=1)
+    EVENT_STREAM_MAX_ERRORS: int = Field(default=100, ge=0)
+
+    # Ingest API keys
+    INGEST_API_KEY_REQUIRED: bool = Field(default=False)
+    API_KEY_DEFAULT_RATE_LIMIT_PER_SECOND: float = Field(default=100.0, gt=0)
+    API_KEY_DEFAULT_BURST: int = Field(default=200, ge=1)
+    API_KEY_CACHE_TTL_SECONDS: float = Field(default=30.0, ge=0)
+    API_KEY_CACHE_MAX_ENTRIES: int = Field(default=10000, ge=0)
+    API_KEY_USAGE_SYNC_INTERVAL_SECONDS: float = Field(default=1.0, gt=0)
+    API_KEY_USAGE_WINDOW_SECONDS: int = Field(default=60, ge=1)
+    API_KEY_USAGE_RETENTION_SECONDS: int = Field(default=86400, ge=1)
 
     @property
     def DATABASE_URL(self) -> str:
@@ -34,6 +125,20 @@ class Settings(BaseSettings):
             f"@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         )
 
+    def db_pool_options(self, role: str) -> dict[str, Any]:
+        prefix = f"DB_{role.upper()}_"
+        return {
+            "pool_size": getattr(self, prefix + "POOL_SIZE"),
+            "max_overflow": getattr(self, prefix + "MAX_OVERFLOW"),
+            "pool_timeout": getattr(self, prefix + "POOL_TIMEOUT_SECONDS"),
+            "pool_recycle": getattr(self, prefix + "POOL_RECYCLE_SECONDS"),
+            "pool_pre_ping": getattr(self, prefix + "POOL_PRE_PING"),
+        }
+
+    @property
+    def ADMIN_EMAIL_LIST(self) -> list[str]:
+        return [email.strip().lower() for email in self.ADMIN_EMAILS.split(",") if email.strip()]
+
     @property
     def WORKER_SUCCESS_STATUS_CODE_LIST(self) -> list[int]:
         codes: list[int] = []
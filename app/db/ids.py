@@ -0,0 +1,44 @@
+import os
+import threading
+import time
+import uuid
+
+_UNIX_TS_MS_MASK = (1 << 48) - 1
+_RAND_A_MASK = (1 << 12) - 1
+_RAND_B_MASK = (1 << 62) - 1
+
+_lock = threading.Lock()
+_last_timestamp_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    # RFC 9562 layout: 48-bit millisecond timestamp, version, 12-bit rand_a, variant, 62 random bits.
+    # rand_a is used as a counter within a millisecond (RFC 9562 section 6.2, method 1) so ids made
+    # by one process sort in creation order, which per-key ordered delivery relies on.
+    global _last_timestamp_ms, _counter
+    random_bits = int.from_bytes(os.urandom(8), "big")
+    with _lock:
+        timestamp_ms = time.time_ns() // 1_000_000
+        if timestamp_ms > _last_timestamp_ms:
+            _last_timestamp_ms = timestamp_ms
+            # Seeded below the midpoint so a burst within one millisecond has room to count up.
+            _counter = int.from_bytes(os.urandom(2), "big") & (_RAND_A_MASK >> 1)
+        else:
+            _counter += 1
+            if _counter > _RAND_A_MASK:
+                _last_timestamp_ms += 1
+                _counter = 0
+        timestamp_ms = _last_timestamp_ms
+        counter = _counter
+
+    value = (timestamp_ms & _UNIX_TS_MS_MASK) << 80
+    value |= 0x7 << 76
+    value |= counter << 64
+    value |= 0b10 << 62
+    value |= random_bits & _RAND_B_MASK
+    return uuid.UUID(int=value)
+
+
+def new_time_ordered_id() -> str:
+    return str(uuid7())
@@ -0,0 +1,118 @@
+import logging
+import time
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from app.metrics import registry
+from app.request_timing import record_phase
+from app.tracing import SpanKind, tracer
+
+logger = logging.getLogger("db")
+
+pool_checkout_seconds = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a pooled connection, including connect and pre-ping.",
+    ("role",),
+)
+pool_checkout_timeouts_counter = registry.counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after the pool timeout.",
+    ("role",),
+)
+pool_in_use_gauge = registry.gauge(
+    "db_pool_connections_in_use",
+    "Connections currently checked out of the pool.",
+    ("role",),
+)
+pool_overflow_gauge = registry.gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size (negative while the pool is still filling).",
+    ("role",),
+)
+statement_seconds = registry.histogram(
+    "db_statement_seconds",
+    "Statement execution time by pool role and SQL verb.",
+    ("role", "operation"),
+)
+slow_statements_counter = registry.counter(
+    "db_slow_statements_total",
+    "Statements slower than DB_SLOW_QUERY_THRESHOLD_MS.",
+    ("role",),
+)
+
+_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "SHOW", "BEGIN", "COMMIT", "ROLLBACK"}
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    # The pool's logging_name carries the role so it survives pool.recreate() on dispose.
+    def connect(self) -> PoolProxiedConnection:
+        role = self._orig_logging_name or "default"
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_checkout_timeouts_counter.inc(role=role)
+            raise
+        finally:
+            pool_checkout_seconds.observe(time.perf_counter() - started, role=role)
+
+
+def instrument_engine(
+    engine: Engine,
+    *,
+    role: str,
+    statement_timing: bool,
+    slow_query_threshold_ms: float,
+) -> None:
+    def update_pool_gauges(*_: Any) -> None:
+        pool = engine.pool
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            pool_in_use_gauge.set(pool.checkedout(), role=role)
+            pool_overflow_gauge.set(pool.overflow(), role=role)
+
+    event.listen(engine, "checkout", update_pool_gauges)
+    event.listen(engine, "checkin", update_pool_gauges)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        context._statement_started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop_timer(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        started_at = getattr(context, "_statement_started_at", None)
+        if started_at is None:
+            return
+        elapsed = time.perf_counter() - started_at
+        record_phase("db", elapsed)
+        if tracer.enabled:
+            finished_ns = time.time_ns()
+            operation = _operation(statement)
+            tracer.record_span(
+                f"db.{operation.lower()}",
+                start_ns=finished_ns - int(elapsed * 1_000_000_000),
+                end_ns=finished_ns,
+                kind=SpanKind.CLIENT,
+                attributes={"db.system": "mysql", "db.operation": operation, "db.pool": role},
+            )
+        if statement_timing:
+            statement_seconds.observe(elapsed, role=role, operation=_operation(statement))
+        if 0 < slow_query_threshold_ms <= elapsed * 1000:
+            slow_statements_counter.inc(role=role)
+            logger.warning("Slow query (%.1f ms, role=%s): %s", elapsed * 1000, role, _truncate(statement))
+
+
+def _operation(statement: str) -> str:
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return verb if verb in _OPERATIONS else "OTHER"
+
+
+def _truncate(statement: str, limit: int = 1000) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
@@ -1,33 +1,121 @@
+from app.db.repositories.api_key_repository import (
+    create_api_key,
+    delete_usage_windows_before,
+    get_active_api_key_by_hash,
+    get_api_key_by_id_for_user,
+    list_api_keys_by_user,
+    record_api_key_usage,
+    revoke_api_key,
+)
 from app.db.repositories.delivery_history_repository import (
     get_delivery_count_for_webhook,
     get_delivery_for_webhook,
+    list_attempt_responses,
     list_attempts_for_delivery,
     list_attempts_for_delivery_ids,
     list_deliveries_for_webhook,
+    list_deliveries_for_webhook_after,
+    search_deliveries_for_user,
+)
+from app.db.repositories.delivery_replay_repository import (
+    cancel_delivery_replay,
+    count_dead_deliveries_for_webhook,
+    create_delivery_replay,
+    get_delivery_replay_by_id_for_user,
+    list_dead_delivery_keys_for_webhook,
+    list_delivery_replays_by_user,
+    lock_next_due_delivery_replay,
+    requeue_dead_deliveries,
+)
+from app.db.repositories.delivery_repository import (
+    PendingEvent,
+    SubscribedWebhook,
+    add_pending_deliveries_for_events,
+    create_pending_deliveries_for_event,
+    list_pending_delivery_schedule,
+    list_subscribed_webhooks,
+)
+from app.db.repositories.idempotency_repository import (
+    IdempotencyRecord,
+    delete_expired_idempotency_key,
+    delete_expired_idempotency_keys,
+    delete_expired_idempotency_keys_by_key,
+    get_idempotency_record,
+    get_idempotency_records,
+    insert_idempotency_keys,
 )
-from app.db.repositories.delivery_repository import create_pending_deliveries_for_event
 from app.db.repositories.user_repository import create_user, get_user_by_email, get_user_by_id
 from app.db.repositories.webhook_repository import (
     create_webhook,
+    create_webhooks,
     delete_webhook,
     get_webhook_by_id_for_user,
+    list_owned_webhook_ids,
+    list_webhooks_by_ids_for_user,
     list_webhooks_by_user,
+    set_webhooks_active,
     update_webhook,
+    update_webhooks,
+)
+from app.db.repositories.worker_node_repository import (
+    delete_stale_worker_nodes,
+    delete_worker_node,
+    list_live_worker_ids,
+    record_worker_heartbeat,
 )
 
 __all__ = [
     "create_user",
+    "PendingEvent",
+    "SubscribedWebhook",
+    "add_pending_deliveries_for_events",
     "create_pending_deliveries_for_event",
+    "IdempotencyRecord",
+    "delete_expired_idempotency_key",
+    "delete_expired_idempotency_keys",
+    "delete_expired_idempotency_keys_by_key",
+    "get_idempotency_record",
+    "get_idempotency_records",
+    "insert_idempotency_keys",
+    "list_pending_delivery_schedule",
+    "list_subscribed_webhooks",
     "get_delivery_count_for_webhook",
     "get_delivery_for_webhook",
     "get_user_by_email",
     "get_user_by_id",
+    "list_attempt_responses",
     "list_attempts_for_delivery",
     "list_attempts_for_delivery_ids",
     "list_deliveries_for_webhook",
+    "list_deliveries_for_webhook_after",
+    "search_deliveries_for_user",
+    "cancel_delivery_replay",
+    "count_dead_deliveries_for_webhook",
+    "create_delivery_replay",
+    "get_delivery_replay_by_id_for_user",
+    "list_dead_delivery_keys_for_webhook",
+    "list_delivery_replays_by_user",
+    "lock_next_due_delivery_replay",
+    "requeue_dead_deliveries",
     "create_webhook",
     "delete_webhook",
     "get_webhook_by_id_for_user",
     "list_webhooks_by_user",
     "update_webhook",
+    "create_webhooks",
+    "list_owned_webhook_ids",
+    "list_webhooks_by_ids_for_user",
+    "set_webhooks_active",
+    "update_webhooks",
+    "create_api_key",
+    "delete_usage_windows_before",
+    "get_active_api_key_by_hash",
+    "get_api_key_by_id_for_user",
+    "list_api_keys_by_user",
+    "record_api_key_usage",
+    "revoke_api_key",
+    "delete_stale_worker_nodes",
+    "delete_worker_node",
+    "list_live_worker_ids",
+    "record_worker_heartbeat",
 ]
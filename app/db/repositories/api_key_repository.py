@@ -0,0 +1,118 @@
+from datetime import datetime
+
+from sqlalchemy import Select, delete, select, update
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.api_key import ApiKey
+from app.models.api_key_usage_window import ApiKeyUsageWindow
+
+
+async def create_api_key(
+    session: AsyncSession,
+    *,
+    api_key_id: str,
+    user_id: str,
+    name: str,
+    key_prefix: str,
+    key_hash: str,
+    rate_limit_per_second: float,
+    burst: int,
+) -> ApiKey:
+    api_key = ApiKey(
+        id=api_key_id,
+        user_id=user_id,
+        name=name,
+        key_prefix=key_prefix,
+        key_hash=key_hash,
+        rate_limit_per_second=rate_limit_per_second,
+        burst=burst,
+    )
+    session.add(api_key)
+    await session.commit()
+    await session.refresh(api_key)
+    return api_key
+
+
+async def list_api_keys_by_user(session: AsyncSession, user_id: str) -> list[ApiKey]:
+    statement: Select[tuple[ApiKey]] = (
+        select(ApiKey).where(ApiKey.user_id == user_id).order_by(ApiKey.created_at.desc())
+    )
+    result = await session.execute(statement)
+    return list(result.scalars().all())
+
+
+async def get_api_key_by_id_for_user(session: AsyncSession, api_key_id: str, user_id: str) -> ApiKey | None:
+    statement: Select[tuple[ApiKey]] = select(ApiKey).where(
+        ApiKey.id == api_key_id,
+        ApiKey.user_id == user_id,
+    )
+    result = await session.execute(statement)
+    return result.scalar_one_or_none()
+
+
+async def get_active_api_key_by_hash(session: AsyncSession, key_hash: str) -> ApiKey | None:
+    statement: Select[tuple[ApiKey]] = select(ApiKey).where(
+        ApiKey.key_hash == key_hash,
+        ApiKey.is_active.is_(True),
+    )
+    result = await session.execute(statement)
+    return result.scalar_one_or_none()
+
+
+async def revoke_api_key(session: AsyncSession, api_key: ApiKey) -> ApiKey:
+    api_key.is_active = False
+    await session.commit()
+    await session.refresh(api_key)
+    return api_key
+
+
+async def record_api_key_usage(
+    session: AsyncSession,
+    *,
+    deltas: dict[str, int],
+    window_start: datetime,
+    used_at: datetime,
+) -> dict[str, int]:
+    if not deltas:
+        return {}
+
+    # A key deleted since its usage was counted would fail the foreign key; skip it.
+    existing = await session.execute(select(ApiKey.id).where(ApiKey.id.in_(list(deltas))))
+    existing_ids = set(existing.scalars().all())
+    deltas = {api_key_id: delta for api_key_id, delta in deltas.items() if api_key_id in existing_ids}
+    if not deltas:
+        return {}
+
+    statement = insert(ApiKeyUsageWindow).values(
+        [
+            {"api_key_id": api_key_id, "window_start": window_start, "request_count": delta}
+            for api_key_id, delta in deltas.items()
+        ]
+    )
+    statement = statement.on_duplicate_key_update(
+        request_count=ApiKeyUsageWindow.request_count + statement.inserted.request_count
+    )
+    await session.execute(statement)
+
+    for api_key_id, delta in deltas.items():
+        await session.execute(
+            update(ApiKey)
+            .where(ApiKey.id == api_key_id)
+            .values(request_count=ApiKey.request_count + delta, last_used_at=used_at)
+        )
+
+    totals = await session.execute(
+        select(ApiKeyUsageWindow.api_key_id, ApiKeyUsageWindow.request_count).where(
+            ApiKeyUsageWindow.api_key_id.in_(list(deltas)),
+            ApiKeyUsageWindow.window_start == window_start,
+        )
+    )
+    await session.commit()
+    return {api_key_id: int(request_count) for api_key_id, request_count in totals.all()}
+
+
+async def delete_usage_windows_before(session: AsyncSession, cutoff: datetime) -> int:
+    result = await session.execute(delete(ApiKeyUsageWindow).where(ApiKeyUsageWindow.window_start < cutoff))
+    await session.commit()
+    return int(result.rowcount or 0)
@@ -1,8 +1,12 @@
-from sqlalchemy import Select, func, select
+from datetime import datetime
+
+from sqlalchemy import Select, and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
-from app.models.delivery import Delivery
+from app.models.delivery import Delivery, DeliveryStatus
 from app.models.delivery_attempt import DeliveryAttempt
+from app.models.delivery_attempt_response import DeliveryAttemptResponse
 
 
 async def get_delivery_count_for_webhook(session: AsyncSession, webhook_id: str) -> int:
@@ -15,16 +19,92 @@ async def list_deliveries_for_webhook(
     session: AsyncSession,
     webhook_id: str,
     *,
-    offset: int,
     limit: int,
+    offset: int = 0,
+    before: tuple[datetime, str] | None = None,
+) -> list[Delivery]:
+    statement: Select[tuple[Delivery]] = select(Delivery).where(Delivery.webhook_id == webhook_id)
+    if before is not None:
+        before_created_at, before_id = before
+        statement = statement.where(
+            or_(
+                Delivery.created_at < before_created_at,
+                and_(Delivery.created_at == before_created_at, Delivery.id < before_id),
+            )
+        )
+    # Matches ix_deliveries_webhook_id_created_at_id so MySQL can walk the index backwards.
+    statement = (
+        statement.order_by(Delivery.created_at.desc(), Delivery.id.desc()).offset(offset).limit(limit)
+    )
+    result = await session.execute(statement)
+    return list(result.scalars().all())
+
+
+async def list_deliveries_for_webhook_after(
+    session: AsyncSession,
+    webhook_id: str,
+    *,
+    limit: int,
+    after: tuple[datetime, str] | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
 ) -> list[Delivery]:
+    statement: Select[tuple[Delivery]] = select(Delivery).where(Delivery.webhook_id == webhook_id)
+    if created_from is not None:
+        statement = statement.where(Delivery.created_at >= created_from)
+    if created_to is not None:
+        statement = statement.where(Delivery.created_at < created_to)
+    if after is not None:
+        after_created_at, after_id = after
+        statement = statement.where(
+            or_(
+                Delivery.created_at > after_created_at,
+                and_(Delivery.created_at == after_created_at, Delivery.id > after_id),
+            )
+        )
+
+    statement = statement.order_by(Delivery.created_at.asc(), Delivery.id.asc()).limit(limit)
+    result = await session.execute(statement)
+    return list(result.scalars().all())
+
+
+async def search_deliveries_for_user(
+    session: AsyncSession,
+    user_id: str,
+    *,
+    limit: int,
+    status: DeliveryStatus | None = None,
+    event_type: str | None = None,
+    webhook_id: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    before: tuple[datetime, str] | None = None,
+) -> list[Delivery]:
+    # Each filter combination leads with user_id (or webhook_id) followed by created_at, id,
+    # matching one of the composite indexes on deliveries, so ordering needs no filesort.
     statement: Select[tuple[Delivery]] = (
-        select(Delivery)
-        .where(Delivery.webhook_id == webhook_id)
-        .order_by(Delivery.created_at.desc())
-        .offset(offset)
-        .limit(limit)
+        select(Delivery).options(defer(Delivery.payload)).where(Delivery.user_id == user_id)
     )
+    if webhook_id is not None:
+        statement = statement.where(Delivery.webhook_id == webhook_id)
+    if status is not None:
+        statement = statement.where(Delivery.status == status)
+    if event_type is not None:
+        statement = statement.where(Delivery.event_type == event_type)
+    if created_from is not None:
+        statement = statement.where(Delivery.created_at >= created_from)
+    if created_to is not None:
+        statement = statement.where(Delivery.created_at < created_to)
+    if before is not None:
+        before_created_at, before_id = before
+        statement = statement.where(
+            or_(
+                Delivery.created_at < before_created_at,
+                and_(Delivery.created_at == before_created_at, Delivery.id < before_id),
+            )
+        )
+
+    statement = statement.order_by(Delivery.created_at.desc(), Delivery.id.desc()).limit(limit)
     result = await session.execute(statement)
     return list(result.scalars().all())
 
@@ -63,3 +143,15 @@ async def list_attempts_for_delivery(session: AsyncSession, delivery_id: str) ->
     )
     result = await session.execute(statement)
     return list(result.scalars().all())
+
+
+async def list_attempt_responses(
+    session: AsyncSession, attempt_ids: list[str]
+) -> list[DeliveryAttemptResponse]:
+    if not attempt_ids:
+        return []
+    statement: Select[tuple[DeliveryAttemptResponse]] = select(DeliveryAttemptResponse).where(
+        DeliveryAttemptResponse.attempt_id.in_(attempt_ids)
+    )
+    result = await session.execute(statement)
+    return list(result.scalars().all())
@@ -0,0 +1,176 @@
+from datetime import datetime
+
+from sqlalchemy import ColumnElement, Select, and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.delivery import Delivery, DeliveryStatus
+from app.models.delivery_attempt import DeliveryAttempt
+from app.models.delivery_replay import DeliveryReplay, DeliveryReplayStatus
+from app.sharding import shard_for_webhook
+
+
+async def create_delivery_replay(
+    session: AsyncSession,
+    *,
+    replay_id: str,
+    user_id: str,
+    webhook_id: str,
+    created_from: datetime | None,
+    created_to: datetime | None,
+    rate_per_second: float,
+    chunk_size: int,
+    total_count: int,
+    next_run_at: datetime,
+) -> DeliveryReplay:
+    replay = DeliveryReplay(
+        id=replay_id,
+        user_id=user_id,
+        webhook_id=webhook_id,
+        created_from=created_from,
+        created_to=created_to,
+        status=DeliveryReplayStatus.RUNNING,
+        rate_per_second=rate_per_second,
+        chunk_size=chunk_size,
+        total_count=total_count,
+        next_run_at=next_run_at,
+    )
+    session.add(replay)
+    await session.commit()
+    await session.refresh(replay)
+    return replay
+
+
+async def list_delivery_replays_by_user(session: AsyncSession, user_id: str, *, limit: int) -> list[DeliveryReplay]:
+    statement: Select[tuple[DeliveryReplay]] = (
+        select(DeliveryReplay)
+        .where(DeliveryReplay.user_id == user_id)
+        .order_by(DeliveryReplay.created_at.desc(), DeliveryReplay.id.desc())
+        .limit(limit)
+    )
+    result = await session.execute(statement)
+    return list(result.scalars().all())
+
+
+async def get_delivery_replay_by_id_for_user(
+    session: AsyncSession, replay_id: str, user_id: str
+) -> DeliveryReplay | None:
+    statement: Select[tuple[DeliveryReplay]] = select(DeliveryReplay).where(
+        DeliveryReplay.id == replay_id,
+        DeliveryReplay.user_id == user_id,
+    )
+    result = await session.execute(statement)
+    return result.scalar_one_or_none()
+
+
+async def cancel_delivery_replay(session: AsyncSession, replay: DeliveryReplay, *, now: datetime) -> bool:
+    statement = (
+        update(DeliveryReplay)
+        .where(DeliveryReplay.id == replay.id, DeliveryReplay.status == DeliveryReplayStatus.RUNNING)
+        .values(status=DeliveryReplayStatus.CANCELLED, finished_at=now)
+    )
+    result = await session.execute(statement)
+    await session.commit()
+    await session.refresh(replay)
+    return result.rowcount > 0
+
+
+async def lock_next_due_delivery_replay(session: AsyncSession, *, now: datetime) -> DeliveryReplay | None:
+    # SKIP LOCKED lets every API process run the replay loop; each job advances one chunk at a
+    # time no matter how many processes poll it.
+    statement: Select[tuple[DeliveryReplay]] = (
+        select(DeliveryReplay)
+        .where(DeliveryReplay.status == DeliveryReplayStatus.RUNNING, DeliveryReplay.next_run_at <= now)
+        .order_by(DeliveryReplay.next_run_at.asc())
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    result = await session.execute(statement)
+    return result.scalar_one_or_none()
+
+
+def _dead_deliveries_for_webhook(
+    webhook_id: str,
+    *,
+    created_from: datetime | None,
+    created_to: datetime | None,
+) -> list[ColumnElement[bool]]:
+    conditions: list[ColumnElement[bool]] = [Delivery.webhook_id == webhook_id, Delivery.status == DeliveryStatus.PERMANENTLY_FAILED]
+    if created_from is not None:
+        conditions.append(Delivery.created_at >= created_from)
+    if created_to is not None:
+        conditions.append(Delivery.created_at < created_to)
+    return conditions
+
+
+async def count_dead_deliveries_for_webhook(
+    session: AsyncSession,
+    webhook_id: str,
+    *,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> int:
+    statement = select(func.count(Delivery.id)).where(
+        *_dead_deliveries_for_webhook(webhook_id, created_from=created_from, created_to=created_to)
+    )
+    result = await session.execute(statement)
+    return int(result.scalar_one())
+
+
+async def list_dead_delivery_keys_for_webhook(
+    session: AsyncSession,
+    webhook_id: str,
+    *,
+    limit: int,
+    after: tuple[datetime, str] | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> list[tuple[datetime, str]]:
+    statement = select(Delivery.created_at, Delivery.id).where(
+        *_dead_deliveries_for_webhook(webhook_id, created_from=created_from, created_to=created_to)
+    )
+    if after is not None:
+        after_created_at, after_id = after
+        statement = statement.where(
+            or_(
+                Delivery.created_at > after_created_at,
+                and_(Delivery.created_at == after_created_at, Delivery.id > after_id),
+            )
+        )
+    # Walks ix_deliveries_webhook_id_created_at_id forwards; status is filtered on the way.
+    statement = statement.order_by(Delivery.created_at.asc(), Delivery.id.asc()).limit(limit)
+    result = await session.execute(statement)
+    return [(created_at, delivery_id) for created_at, delivery_id in result.all()]
+
+
+async def requeue_dead_deliveries(
+    session: AsyncSession,
+    webhook_id: str,
+    delivery_ids: list[str],
+    *,
+    now: datetime,
+) -> int:
+    if not delivery_ids:
+        return 0
+    attempts_so_far = (
+        select(func.count(DeliveryAttempt.id))
+        .where(DeliveryAttempt.delivery_id == Delivery.id)
+        .scalar_subquery()
+    )
+    statement = (
+        update(Delivery)
+        .where(
+            Delivery.id.in_(delivery_ids),
+            Delivery.webhook_id == webhook_id,
+            Delivery.status == DeliveryStatus.PERMANENTLY_FAILED,
+        )
+        .values(
+            status=DeliveryStatus.PENDING,
+            # Rows that died before deliveries were sharded still carry the column default.
+            shard=shard_for_webhook(webhook_id),
+            next_attempt_at=now,
+            attempts_before_replay=attempts_so_far,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(statement)
+    return result.rowcount
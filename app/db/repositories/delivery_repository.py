@@ -1,40 +1,167 @@
 import json
 import uuid
-from typing import Any
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any, NamedTuple
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import Select, and_, func, insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.ids import new_time_ordered_id
 from app.models.delivery import Delivery, DeliveryStatus
+from app.models.event_idempotency_key import EventIdempotencyKey
 from app.models.webhook import Webhook
+from app.payload_filters import filter_subscribers
+from app.sharding import shard_for_webhook
 
 
-async def create_pending_deliveries_for_event(
+class PendingEvent(NamedTuple):
+    event_type: str
+    payload: dict[str, Any]
+    trace_context: str | None = None
+    deliver_at: datetime | None = None
+    ordering_key: str | None = None
+    user_id: str | None = None
+
+
+class SubscribedWebhook(NamedTuple):
+    id: str
+    user_id: str
+    payload_filter: str | None
+
+
+async def list_subscribed_webhooks(
     session: AsyncSession,
-    *,
     event_type: str,
-    payload: dict[str, Any],
-) -> list[Delivery]:
-    statement: Select[tuple[str]] = select(Webhook.id).where(
+    *,
+    user_id: str | None = None,
+) -> list[SubscribedWebhook]:
+    statement: Select[tuple[str, str, str | None]] = select(
+        Webhook.id, Webhook.user_id, Webhook.payload_filter
+    ).where(
         Webhook.is_active.is_(True),
         func.json_contains(Webhook.event_types, json.dumps([event_type])) == 1,
     )
+    if user_id is not None:
+        statement = statement.where(Webhook.user_id == user_id)
     result = await session.execute(statement)
-    webhook_ids = list(result.scalars().all())
+    return [SubscribedWebhook(*row) for row in result.all()]
 
-    if not webhook_ids:
-        return []
+
+def _matching_webhooks(webhooks: Sequence[SubscribedWebhook], payload: dict[str, Any]) -> list[SubscribedWebhook]:
+    return filter_subscribers(webhooks, payload, expression=lambda webhook: webhook.payload_filter)
+
+
+async def create_pending_deliveries_for_event(
+    session: AsyncSession,
+    *,
+    event_type: str,
+    payload: dict[str, Any],
+    idempotency_key: str | None = None,
+    idempotency_scope: str = "",
+    idempotency_request_hash: str | None = None,
+    idempotency_expires_at: datetime | None = None,
+    trace_context: str | None = None,
+    deliver_at: datetime | None = None,
+    ordering_key: str | None = None,
+    user_id: str | None = None,
+) -> list[Delivery]:
+    subscribed = await list_subscribed_webhooks(session, event_type, user_id=user_id)
+    webhooks = _matching_webhooks(subscribed, payload)
+    # Every pending delivery carries a due time, so the worker's claim is a range scan on
+    # (status, next_attempt_at) that never touches work scheduled for later.
+    next_attempt_at = deliver_at or datetime.now(UTC)
 
     deliveries = [
         Delivery(
-            id=str(uuid.uuid4()),
+            id=new_time_ordered_id(),
             webhook_id=webhook_id,
+            shard=shard_for_webhook(webhook_id),
+            user_id=owner_id,
             event_type=event_type,
             payload=payload,
             status=DeliveryStatus.PENDING,
+            ordering_key=ordering_key,
+            next_attempt_at=next_attempt_at,
+            trace_context=trace_context,
         )
-        for webhook_id in webhook_ids
+        for webhook_id, owner_id, _ in webhooks
     ]
+    if idempotency_key is not None and idempotency_expires_at is not None:
+        # Recorded even when nothing matched so a retry cannot fan out to webhooks created later.
+        session.add(
+            EventIdempotencyKey(
+                id=str(uuid.uuid4()),
+                scope=idempotency_scope,
+                key=idempotency_key,
+                request_hash=idempotency_request_hash,
+                delivery_ids=[delivery.id for delivery in deliveries],
+                expires_at=idempotency_expires_at,
+            )
+        )
+    elif not deliveries:
+        return []
+
     session.add_all(deliveries)
     await session.commit()
     return deliveries
+
+
+async def add_pending_deliveries_for_events(
+    session: AsyncSession,
+    events: Sequence[PendingEvent],
+) -> list[list[str]]:
+    webhooks_by_audience: dict[tuple[str, str | None], list[SubscribedWebhook]] = {}
+    for audience in {(event.event_type, event.user_id) for event in events}:
+        event_type, user_id = audience
+        webhooks_by_audience[audience] = await list_subscribed_webhooks(session, event_type, user_id=user_id)
+
+    now = datetime.now(UTC)
+    rows: list[dict[str, Any]] = []
+    delivery_ids_by_event: list[list[str]] = []
+    for event in events:
+        delivery_ids: list[str] = []
+        webhooks = _matching_webhooks(webhooks_by_audience[(event.event_type, event.user_id)], event.payload)
+        for webhook_id, user_id, _ in webhooks:
+            delivery_id = new_time_ordered_id()
+            delivery_ids.append(delivery_id)
+            rows.append(
+                {
+                    "id": delivery_id,
+                    "webhook_id": webhook_id,
+                    "shard": shard_for_webhook(webhook_id),
+                    "user_id": user_id,
+                    "event_type": event.event_type,
+                    "payload": event.payload,
+                    "status": DeliveryStatus.PENDING,
+                    "ordering_key": event.ordering_key,
+                    "next_attempt_at": event.deliver_at or now,
+                    "trace_context": event.trace_context,
+                }
+            )
+        delivery_ids_by_event.append(delivery_ids)
+
+    if rows:
+        await session.execute(insert(Delivery), rows)
+    return delivery_ids_by_event
+
+
+async def list_pending_delivery_schedule(
+    session: AsyncSession,
+    *,
+    after: tuple[datetime, str] | None,
+    limit: int,
+) -> list[tuple[datetime, str]]:
+    statement = select(Delivery.next_attempt_at, Delivery.id).where(Delivery.status == DeliveryStatus.PENDING)
+    if after is not None:
+        after_next_attempt_at, after_id = after
+        statement = statement.where(
+            or_(
+                Delivery.next_attempt_at > after_next_attempt_at,
+                and_(Delivery.next_attempt_at == after_next_attempt_at, Delivery.id > after_id),
+            )
+        )
+    # Walks ix_deliveries_status_next_attempt_at, whose entries end in the primary key.
+    statement = statement.order_by(Delivery.next_attempt_at.asc(), Delivery.id.asc()).limit(limit)
+    result = await session.execute(statement)
+    return [(next_attempt_at, delivery_id) for next_attempt_at, delivery_id in result.all()]
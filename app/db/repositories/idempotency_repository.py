@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from sqlalchemy import Select, delete, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.event_idempotency_key import EventIdempotencyKey
+
+
+class IdempotencyRecord(NamedTuple):
+    delivery_ids: list[str]
+    request_hash: str | None
+
+
+async def get_idempotency_record(
+    session: AsyncSession, key: str, *, scope: str, now: datetime
+) -> IdempotencyRecord | None:
+    statement: Select[tuple[list[str], str | None]] = select(
+        EventIdempotencyKey.delivery_ids, EventIdempotencyKey.request_hash
+    ).where(
+        EventIdempotencyKey.scope == scope,
+        EventIdempotencyKey.key == key,
+        EventIdempotencyKey.expires_at > now,
+    )
+    result = await session.execute(statement)
+    row = result.first()
+    if row is None:
+        return None
+    return IdempotencyRecord(list(row[0]), row[1])
+
+
+async def get_idempotency_records(
+    session: AsyncSession, keys: list[tuple[str, str]], *, now: datetime
+) -> dict[tuple[str, str], IdempotencyRecord]:
+    if not keys:
+        return {}
+
+    statement: Select[tuple[str, str, list[str], str | None]] = select(
+        EventIdempotencyKey.scope,
+        EventIdempotencyKey.key,
+        EventIdempotencyKey.delivery_ids,
+        EventIdempotencyKey.request_hash,
+    ).where(
+        tuple_(EventIdempotencyKey.scope, EventIdempotencyKey.key).in_(keys),
+        EventIdempotencyKey.expires_at > now,
+    )
+    result = await session.execute(statement)
+    return {
+        (scope, key): IdempotencyRecord(list(delivery_ids), request_hash)
+        for scope, key, delivery_ids, request_hash in result.all()
+    }
+
+
+async def delete_expired_idempotency_key(session: AsyncSession, key: str, *, scope: str, now: datetime) -> None:
+    statement = delete(EventIdempotencyKey).where(
+        EventIdempotencyKey.scope == scope,
+        EventIdempotencyKey.key == key,
+        EventIdempotencyKey.expires_at <= now,
+    )
+    await session.execute(statement)
+
+
+async def delete_expired_idempotency_keys_by_key(
+    session: AsyncSession, keys: list[tuple[str, str]], *, now: datetime
+) -> None:
+    if not keys:
+        return
+    statement = delete(EventIdempotencyKey).where(
+        tuple_(EventIdempotencyKey.scope, EventIdempotencyKey.key).in_(keys),
+        EventIdempotencyKey.expires_at <= now,
+    )
+    await session.execute(statement)
+
+
+async def insert_idempotency_keys(session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    if not rows:
+        return
+    await session.execute(insert(EventIdempotencyKey), rows)
+
+
+async def delete_expired_idempotency_keys(session: AsyncSession, *, now: datetime, limit: int) -> int:
+    expired_ids: Select[tuple[str]] = (
+        select(EventIdempotencyKey.id)
+        .where(EventIdempotencyKey.expires_at <= now)
+        .order_by(EventIdempotencyKey.expires_at.asc())
+        .limit(limit)
+    )
+    result = await session.execute(expired_ids)
+    ids = list(result.scalars().all())
+    if not ids:
+        return 0
+
+    await session.execute(delete(EventIdempotencyKey).where(EventIdempotencyKey.id.in_(ids)))
+    await session.commit()
+    return len(ids)
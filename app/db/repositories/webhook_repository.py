@@ -1,4 +1,8 @@
-from sqlalchemy import Select, select
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Literal
+
+from sqlalchemy import Row, Select, and_, case, func, insert, literal, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.webhook import Webhook
@@ -11,6 +15,8 @@ async def create_webhook(
     url: str,
     event_types: list[str],
     secret: str,
+    response_sample_rate: float | Literal[""] | None = None,
+    payload_filter: str | None = None,
 ) -> Webhook:
     webhook = Webhook(
         id=webhook_id,
@@ -18,6 +24,8 @@ async def create_webhook(
         url=url,
         event_types=event_types,
         secret=secret,
+        response_sample_rate=response_sample_rate,
+        payload_filter=payload_filter,
     )
     session.add(webhook)
     await session.commit()
@@ -25,14 +33,54 @@ async def create_webhook(
     return webhook
 
 
-async def list_webhooks_by_user(session: AsyncSession, user_id: str) -> list[Webhook]:
-    statement: Select[tuple[Webhook]] = (
-        select(Webhook).where(Webhook.user_id == user_id).order_by(Webhook.created_at.desc())
+async def list_webhooks_by_user(
+    session: AsyncSession,
+    user_id: str,
+    *,
+    limit: int | None = None,
+    before: tuple[datetime, str] | None = None,
+) -> list[Webhook]:
+    statement: Select[tuple[Webhook]] = select(Webhook).where(Webhook.user_id == user_id)
+    if before is not None:
+        before_created_at, before_id = before
+        statement = statement.where(
+            or_(
+                Webhook.created_at < before_created_at,
+                and_(Webhook.created_at == before_created_at, Webhook.id < before_id),
+            )
+        )
+    # Matches ix_webhooks_user_id_created_at_id so MySQL can walk the index backwards.
+    statement = statement.order_by(Webhook.created_at.desc(), Webhook.id.desc())
+    if limit is not None:
+        statement = statement.limit(limit)
+    result = await session.execute(statement)
+    return list(result.scalars().all())
+
+
+async def list_webhooks_by_ids_for_user(
+    session: AsyncSession,
+    webhook_ids: Sequence[str],
+    user_id: str,
+) -> list[Webhook]:
+    if not webhook_ids:
+        return []
+    statement: Select[tuple[Webhook]] = select(Webhook).where(
+        Webhook.id.in_(list(webhook_ids)),
+        Webhook.user_id == user_id,
     )
     result = await session.execute(statement)
     return list(result.scalars().all())
 
 
+async def list_owned_webhook_ids(session: AsyncSession, webhook_ids: Sequence[str], user_id: str) -> set[str]:
+    if not webhook_ids:
+        return set()
+    result = await session.execute(
+        select(Webhook.id).where(Webhook.id.in_(list(webhook_ids)), Webhook.user_id == user_id)
+    )
+    return set(result.scalars().all())
+
+
 async def get_webhook_by_id_for_user(
     session: AsyncSession, webhook_id: str, user_id: str
 ) -> Webhook | None:
@@ -50,11 +98,18 @@ async def update_webhook(
     *,
     url: str | None = None,
     event_types: list[str] | None = None,
+    response_sample_rate: float | Literal[""] | None = None,
+    payload_filter: str | None = None,
 ) -> Webhook:
     if url is not None:
         webhook.url = url
     if event_types is not None:
         webhook.event_types = event_types
+    if response_sample_rate is not None:
+        webhook.response_sample_rate = None if response_sample_rate == "" else response_sample_rate
+    if payload_filter is not None:
+        webhook.payload_filter = payload_filter or None
+    webhook.version = Webhook.version + 1
 
     await session.commit()
     await session.refresh(webhook)
@@ -64,3 +119,115 @@ async def update_webhook(
 async def delete_webhook(session: AsyncSession, webhook: Webhook) -> None:
     await session.delete(webhook)
     await session.commit()
+
+
+async def create_webhooks(session: AsyncSession, rows: Sequence[dict[str, Any]]) -> None:
+    if rows:
+        await session.execute(insert(Webhook), list(rows))
+
+
+async def update_webhooks(
+    session: AsyncSession,
+    user_id: str,
+    changes: Sequence[dict[str, Any]],
+) -> None:
+    # One UPDATE for the whole batch: each column takes its new value per id through a CASE,
+    # falling back to the current value for rows that leave it unchanged.
+    if not changes:
+        return
+
+    url_by_id = {change["id"]: change["url"] for change in changes if change.get("url") is not None}
+    event_types_by_id = {
+        change["id"]: change["event_types"] for change in changes if change.get("event_types") is not None
+    }
+    sample_rate_by_id = {
+        change["id"]: None if change["response_sample_rate"] == "" else change["response_sample_rate"]
+        for change in changes
+        if change.get("response_sample_rate") is not None
+    }
+    filter_by_id = {
+        change["id"]: change["payload_filter"] or None
+        for change in changes
+        if change.get("payload_filter") is not None
+    }
+    values: dict[str, Any] = {"version": Webhook.version + 1, "updated_at": func.now()}
+    if url_by_id:
+        values["url"] = case(
+            {webhook_id: literal(url, Webhook.url.type) for webhook_id, url in url_by_id.items()},
+            value=Webhook.id,
+            else_=Webhook.url,
+        )
+    if event_types_by_id:
+        values["event_types"] = case(
+            {
+                webhook_id: literal(event_types, Webhook.event_types.type)
+                for webhook_id, event_types in event_types_by_id.items()
+            },
+            value=Webhook.id,
+            else_=Webhook.event_types,
+        )
+    if sample_rate_by_id:
+        values["response_sample_rate"] = case(
+            {
+                webhook_id: literal(rate, Webhook.response_sample_rate.type)
+                for webhook_id, rate in sample_rate_by_id.items()
+            },
+            value=Webhook.id,
+            else_=Webhook.response_sample_rate,
+        )
+    if filter_by_id:
+        values["payload_filter"] = case(
+            {
+                webhook_id: literal(expression, Webhook.payload_filter.type)
+                for webhook_id, expression in filter_by_id.items()
+            },
+            value=Webhook.id,
+            else_=Webhook.payload_filter,
+        )
+
+    await session.execute(
+        update(Webhook)
+        .where(Webhook.id.in_([change["id"] for change in changes]), Webhook.user_id == user_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def set_webhooks_active(
+    session: AsyncSession,
+    webhook_ids: Sequence[str],
+    user_id: str,
+    *,
+    is_active: bool,
+) -> None:
+    if not webhook_ids:
+        return
+    await session.execute(
+        update(Webhook)
+        .where(Webhook.id.in_(list(webhook_ids)), Webhook.user_id == user_id)
+        .values(is_active=is_active, version=Webhook.version + 1, updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def get_webhook_delivery_config(session: AsyncSession, webhook_id: str) -> Row[Any] | None:
+    result = await session.execute(
+        select(
+            Webhook.id,
+            Webhook.url,
+            Webhook.secret,
+            Webhook.is_active,
+            Webhook.response_sample_rate,
+            Webhook.version,
+        ).where(Webhook.id == webhook_id)
+    )
+    return result.first()
+
+
+async def get_webhook_versions(session: AsyncSession, webhook_ids: Sequence[str]) -> dict[str, int]:
+    if not webhook_ids:
+        return {}
+    result = await session.execute(
+        select(Webhook.id, Webhook.version).where(Webhook.id.in_(list(webhook_ids)))
+    )
+    return {webhook_id: int(version) for webhook_id, version in result.all()}
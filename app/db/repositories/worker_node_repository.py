@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.worker_node import WorkerNode
+
+
+async def record_worker_heartbeat(
+    session: AsyncSession,
+    *,
+    worker_id: str,
+    hostname: str,
+    started_at: datetime,
+    now: datetime,
+) -> None:
+    statement = insert(WorkerNode).values(
+        id=worker_id,
+        hostname=hostname,
+        started_at=started_at,
+        heartbeat_at=now,
+    )
+    statement = statement.on_duplicate_key_update(heartbeat_at=statement.inserted.heartbeat_at)
+    await session.execute(statement)
+
+
+async def list_live_worker_ids(session: AsyncSession, *, since: datetime) -> list[str]:
+    result = await session.execute(select(WorkerNode.id).where(WorkerNode.heartbeat_at >= since))
+    return list(result.scalars().all())
+
+
+async def delete_worker_node(session: AsyncSession, *, worker_id: str) -> None:
+    await session.execute(delete(WorkerNode).where(WorkerNode.id == worker_id))
+
+
+async def delete_stale_worker_nodes(session: AsyncSession, *, before: datetime) -> int:
+    result = await session.execute(delete(WorkerNode).where(WorkerNode.heartbeat_at < before))
+    return result.rowcount or 0
@@ -1,13 +1,55 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
+from app.db.instrumentation import InstrumentedAsyncQueuePool, instrument_engine
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.APP_DEBUG)
+
+def create_engine_for_role(role: str) -> AsyncEngine:
+    pool = settings.db_pool_options(role)
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.APP_DEBUG,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name=role,
+        pool_size=pool["pool_size"],
+        max_overflow=pool["max_overflow"],
+        pool_timeout=pool["pool_timeout"],
+        pool_recycle=pool["pool_recycle"],
+        pool_pre_ping=pool["pool_pre_ping"],
+    )
+    instrument_engine(
+        engine.sync_engine,
+        role=role,
+        statement_timing=settings.DB_STATEMENT_METRICS_ENABLED,
+        slow_query_threshold_ms=settings.DB_SLOW_QUERY_THRESHOLD_MS,
+    )
+    return engine
+
+
+engine_role = "api"
+engine = create_engine_for_role(engine_role)
 
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+def use_engine_role(role: str) -> None:
+    # Called once at process start-up (before any connection is made) by entry points that are
+    # not the API, so each process type gets its own pool sizing and metrics label.
+    global engine, engine_role
+    if role == engine_role:
+        return
+    previous = engine
+    engine = create_engine_for_role(role)
+    engine_role = role
+    async_session.configure(bind=engine)
+    previous.sync_engine.dispose(close=False)
+
+
+async def dispose_engine() -> None:
+    await engine.dispose()
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -0,0 +1,26 @@
+import uuid
+from typing import Any
+
+from sqlalchemy import BINARY
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator
+
+
+# Stored as BINARY(16); Python code keeps seeing the canonical 36-character string form.
+class BinaryUUID(TypeDecorator[str]):
+    impl = BINARY(16)
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> bytes | None:
+        if value is None:
+            return None
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        if isinstance(value, bytes):
+            return value
+        return uuid.UUID(str(value)).bytes
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> str | None:
+        if value is None:
+            return None
+        return str(uuid.UUID(bytes=bytes(value)))
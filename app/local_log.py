@@ -0,0 +1,246 @@
+import fcntl
+import json
+import mmap
+import os
+import struct
+import zlib
+from collections.abc import Iterator, Sequence
+from contextlib import suppress
+from typing import NamedTuple
+
+# Record layout: payload length, CRC-32 over (due time + payload), due time in epoch ms, payload.
+_HEADER = struct.Struct("<IIq")
+_SEGMENT_SUFFIX = ".log"
+
+
+class LogPosition(NamedTuple):
+    segment: int
+    offset: int
+
+
+class LogRecord(NamedTuple):
+    position: LogPosition
+    due_ms: int
+    payload: bytes
+
+
+def encode_record(payload: bytes, due_ms: int) -> bytes:
+    due = struct.pack("<q", due_ms)
+    return _HEADER.pack(len(payload), zlib.crc32(payload, zlib.crc32(due)), due_ms) + payload
+
+
+def decode_record(buffer: bytes | mmap.mmap, offset: int, size: int) -> tuple[int, bytes, int] | None:
+    # Returns (due_ms, payload, next offset), or None when the bytes at offset are not a whole,
+    # intact record: the writer is mid-append, or a crash tore the tail of the file.
+    if offset + _HEADER.size > size:
+        return None
+    length, crc, due_ms = _HEADER.unpack_from(buffer, offset)
+    end = offset + _HEADER.size + length
+    if end > size:
+        return None
+    payload = bytes(buffer[offset + _HEADER.size : end])
+    if zlib.crc32(payload, zlib.crc32(bytes(buffer[offset + 8 : offset + _HEADER.size]))) != crc:
+        return None
+    return due_ms, payload, end
+
+
+def iter_file_records(path: str) -> Iterator[tuple[int, bytes]]:
+    with open(path, "rb") as handle:
+        data = handle.read()
+    offset = 0
+    while (decoded := decode_record(data, offset, len(data))) is not None:
+        due_ms, payload, offset = decoded
+        yield due_ms, payload
+
+
+def list_segments(directory: str) -> list[int]:
+    return sorted(
+        int(name.removesuffix(_SEGMENT_SUFFIX))
+        for name in os.listdir(directory)
+        if name.endswith(_SEGMENT_SUFFIX) and name.removesuffix(_SEGMENT_SUFFIX).isdigit()
+    )
+
+
+def segment_path(directory: str, segment: int) -> str:
+    return os.path.join(directory, f"{segment:020d}{_SEGMENT_SUFFIX}")
+
+
+def delete_segments_before(directory: str, segment: int) -> int:
+    deleted = 0
+    for existing in list_segments(directory):
+        if existing >= segment:
+            break
+        os.unlink(segment_path(directory, existing))
+        deleted += 1
+    return deleted
+
+
+class SegmentedLogWriter:
+    # Safe to share across processes: appends happen under an exclusive flock, and a segment is
+    # never written again once the next one exists. Each writer starts a fresh segment the first
+    # time it appends, so a tail torn by a crash is always in a sealed segment that readers skip.
+    def __init__(self, directory: str, *, segment_bytes: int, fsync: bool = False) -> None:
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self._segment: int | None = None
+        self._fd: int | None = None
+        self._lock_fd: int | None = None
+
+    def append(self, records: Sequence[tuple[bytes, int]]) -> None:
+        if not records:
+            return
+        data = b"".join(encode_record(payload, due_ms) for payload, due_ms in records)
+        if self._lock_fd is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._lock_fd = os.open(os.path.join(self.directory, "append.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            fd = self._current_fd()
+            start = os.fstat(fd).st_size
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view) :]
+                if self.fsync:
+                    os.fsync(fd)
+            except OSError:
+                # Cut a partly written batch back off and seal the segment straight away, so no
+                # writer appends behind a torn record; if the truncate fails too, readers skip
+                # the rest of a sealed segment anyway.
+                with suppress(OSError):
+                    os.ftruncate(fd, start)
+                assert self._segment is not None
+                self._open(self._segment + 1)
+                raise
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        for fd in (self._fd, self._lock_fd):
+            if fd is not None:
+                os.close(fd)
+        self._fd = self._lock_fd = self._segment = None
+
+    def _current_fd(self) -> int:
+        if self._fd is None or self._segment is None:
+            segments = list_segments(self.directory)
+            return self._open(segments[-1] + 1 if segments else 0)
+        next_segment = self._segment + 1
+        while os.path.exists(segment_path(self.directory, next_segment)):
+            next_segment += 1
+        if next_segment != self._segment + 1:
+            return self._open(next_segment - 1)
+        if os.fstat(self._fd).st_size >= self.segment_bytes:
+            return self._open(next_segment)
+        return self._fd
+
+    def _open(self, segment: int) -> int:
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = os.open(segment_path(self.directory, segment), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._segment = segment
+        return self._fd
+
+
+class SegmentedLogReader:
+    def __init__(self, directory: str, *, start: LogPosition | None = None) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        if start is None:
+            segments = list_segments(directory)
+            start = LogPosition(segments[0] if segments else 0, 0)
+        self.position = start
+        self._file = None
+        self._map: mmap.mmap | None = None
+        self._mapped_size = 0
+
+    def read(self, max_records: int) -> list[LogRecord]:
+        records: list[LogRecord] = []
+        while len(records) < max_records:
+            decoded = self._decode_next()
+            if decoded is None:
+                if not self._advance_segment():
+                    break
+                continue
+            due_ms, payload, end = decoded
+            records.append(LogRecord(self.position, due_ms, payload))
+            self.position = LogPosition(self.position.segment, end)
+        return records
+
+    def close(self) -> None:
+        self._unmap()
+
+    def _decode_next(self) -> tuple[int, bytes, int] | None:
+        if self._map is None or self.position.offset >= self._mapped_size:
+            self._remap()
+        if self._map is None:
+            return None
+        decoded = decode_record(self._map, self.position.offset, self._mapped_size)
+        if decoded is None:
+            # The mapping may have caught an append halfway; pick up whatever has landed since.
+            mapped_size = self._mapped_size
+            self._remap()
+            if self._map is not None and self._mapped_size != mapped_size:
+                decoded = decode_record(self._map, self.position.offset, self._mapped_size)
+        return decoded
+
+    def _advance_segment(self) -> bool:
+        # A segment is final once a later one exists; anything undecodable left in it is a
+        # torn write from a crashed writer and is skipped.
+        later = [segment for segment in list_segments(self.directory) if segment > self.position.segment]
+        if not later:
+            return False
+        self._remap()
+        if self._map is not None and decode_record(self._map, self.position.offset, self._mapped_size):
+            return True
+        self._unmap()
+        self.position = LogPosition(later[0], 0)
+        return True
+
+    def _remap(self) -> None:
+        path = segment_path(self.directory, self.position.segment)
+        if self._file is None:
+            try:
+                self._file = open(path, "rb")
+            except FileNotFoundError:
+                return
+        size = os.fstat(self._file.fileno()).st_size
+        if size == self._mapped_size and self._map is not None:
+            return
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if size:
+            self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+        self._mapped_size = size
+
+    def _unmap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+        self._map = None
+        self._file = None
+        self._mapped_size = 0
+
+
+class OffsetStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def load(self) -> LogPosition | None:
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                stored = json.load(handle)
+        except FileNotFoundError:
+            return None
+        return LogPosition(int(stored["segment"]), int(stored["offset"]))
+
+    def store(self, position: LogPosition) -> None:
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump({"segment": position.segment, "offset": position.offset}, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self.path)
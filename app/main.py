@@ -1,12 +1,61 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 
+from app.api.routes.admin import router as admin_router
+from app.api.routes.api_keys import router as api_keys_router
 from app.api.routes.auth import router as auth_router
+from app.api.routes.dead_letters import router as dead_letters_router
 from app.api.routes.deliveries import router as deliveries_router
+from app.api.routes.delivery_search import router as delivery_search_router
 from app.api.routes.events import router as events_router
+from app.api.routes.metrics import router as metrics_router
 from app.api.routes.webhooks import router as webhooks_router
+from app.api.timing import ServerTimingMiddleware
+from app.api.tracing import TracingMiddleware
+from app.config import settings
+from app.serialization import FastJSONResponse
+from app.services.delivery_queue import delivery_queue
+from app.services.delivery_replay import run_delivery_replay_loop
+from app.services.idempotency_gc import run_idempotency_gc_loop
+from app.services.ingest_batcher import ingest_batcher
+from app.services.rate_limiter import ingest_rate_limiter, run_rate_limit_sync_loop, sync_rate_limiter_usage
+from app.tracing import configure_tracing, tracer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    configure_tracing(role="api")
+    idempotency_gc_task = asyncio.create_task(run_idempotency_gc_loop())
+    rate_limit_sync_task = asyncio.create_task(run_rate_limit_sync_loop(ingest_rate_limiter))
+    delivery_replay_task = asyncio.create_task(run_delivery_replay_loop())
+    if settings.EVENT_INGEST_GROUP_COMMIT_ENABLED:
+        ingest_batcher.start()
+    try:
+        yield
+    finally:
+        await ingest_batcher.stop()
+        for task in (idempotency_gc_task, rate_limit_sync_task, delivery_replay_task):
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        with suppress(Exception):
+            await sync_rate_limiter_usage(ingest_rate_limiter)
+        delivery_queue.close()
+        await asyncio.to_thread(tracer.shutdown)
+
 
-app = FastAPI(title="Webhook Delivery System")
+app = FastAPI(title="Webhook Delivery System", lifespan=lifespan, default_response_class=FastJSONResponse)
 app.include_router(auth_router)
 app.include_router(webhooks_router)
+app.include_router(api_keys_router)
 app.include_router(events_router)
 app.include_router(deliveries_router)
+app.include_router(delivery_search_router)
+app.include_router(dead_letters_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
+app.add_middleware(ServerTimingMiddleware, emit_header=settings.SERVER_TIMING_HEADER_ENABLED)
+app.add_middleware(TracingMiddleware)
@@ -1,6 +1,25 @@
+from app.models.api_key import ApiKey
+from app.models.api_key_usage_window import ApiKeyUsageWindow
 from app.models.delivery import Delivery, DeliveryStatus
 from app.models.delivery_attempt import DeliveryAttempt
+from app.models.delivery_attempt_response import DeliveryAttemptResponse
+from app.models.delivery_replay import DeliveryReplay, DeliveryReplayStatus
+from app.models.event_idempotency_key import EventIdempotencyKey
 from app.models.user import User
 from app.models.webhook import Webhook
+from app.models.worker_node import WorkerNode
 
-__all__ = ["User", "Webhook", "Delivery", "DeliveryStatus", "DeliveryAttempt"]
+__all__ = [
+    "User",
+    "Webhook",
+    "Delivery",
+    "DeliveryStatus",
+    "DeliveryAttempt",
+    "DeliveryAttemptResponse",
+    "DeliveryReplay",
+    "DeliveryReplayStatus",
+    "EventIdempotencyKey",
+    "ApiKey",
+    "ApiKeyUsageWindow",
+    "WorkerNode",
+]
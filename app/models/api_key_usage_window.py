@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class ApiKeyUsageWindow(Base):
+    __tablename__ = "api_key_usage_windows"
+
+    api_key_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("api_keys.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    window_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, index=True)
+    request_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
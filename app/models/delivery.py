@@ -2,10 +2,23 @@ from datetime import datetime
 from enum import Enum
 from typing import Any
 
-from sqlalchemy import DateTime, Enum as SqlEnum, ForeignKey, JSON, String, func, text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Enum as SqlEnum,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    func,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.session import Base
+from app.db.types import BinaryUUID
 
 
 class DeliveryStatus(str, Enum):
@@ -16,14 +29,26 @@ class DeliveryStatus(str, Enum):
 
 class Delivery(Base):
     __tablename__ = "deliveries"
+    __table_args__ = (
+        Index("ix_deliveries_webhook_id_created_at_id", "webhook_id", "created_at", "id"),
+        Index("ix_deliveries_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_deliveries_user_id_status_created_at_id", "user_id", "status", "created_at", "id"),
+        Index("ix_deliveries_user_id_event_type_created_at_id", "user_id", "event_type", "created_at", "id"),
+        Index("ix_deliveries_status_next_attempt_at", "status", "next_attempt_at"),
+        Index("ix_deliveries_webhook_id_ordering_key_status_id", "webhook_id", "ordering_key", "status", "id"),
+        Index("ix_deliveries_shard_status_next_attempt_at", "shard", "status", "next_attempt_at"),
+    )
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    id: Mapped[str] = mapped_column(BinaryUUID, primary_key=True)
     webhook_id: Mapped[str] = mapped_column(
         String(36),
         ForeignKey("webhooks.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
+    # app.sharding.shard_for_webhook(webhook_id); sharded workers claim only from their own shards.
+    shard: Mapped[int] = mapped_column(SmallInteger, nullable=False, server_default=text("0"))
+    # Copied from the webhook at ingest so cross-webhook searches can stay on one index.
+    user_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
     event_type: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
     status: Mapped[DeliveryStatus] = mapped_column(
@@ -31,7 +56,16 @@ class Delivery(Base):
         nullable=False,
         server_default=text("'pending'"),
     )
-    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    # Deliveries sharing (webhook_id, ordering_key) are attempted one at a time in id order.
+    ordering_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Moved out of the due range while an earlier delivery for its ordering key runs; the worker
+    # that finishes that delivery makes the next deferred one due again.
+    ordering_deferred: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("0"))
+    # Attempts made before the last dead-letter replay; the retry budget counts from here.
+    attempts_before_replay: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    # W3C traceparent of the ingest span, set only when that request was sampled.
+    trace_context: Mapped[str | None] = mapped_column(String(55), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -4,14 +4,15 @@ from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.session import Base
+from app.db.types import BinaryUUID
 
 
 class DeliveryAttempt(Base):
     __tablename__ = "delivery_attempts"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    id: Mapped[str] = mapped_column(BinaryUUID, primary_key=True)
     delivery_id: Mapped[str] = mapped_column(
-        String(36),
+        BinaryUUID,
         ForeignKey("deliveries.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
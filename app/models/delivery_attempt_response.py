@@ -0,0 +1,20 @@
+from sqlalchemy import Boolean, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+from app.db.types import BinaryUUID
+
+
+class DeliveryAttemptResponse(Base):
+    __tablename__ = "delivery_attempt_responses"
+
+    attempt_id: Mapped[str] = mapped_column(
+        BinaryUUID,
+        ForeignKey("delivery_attempts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    encoding: Mapped[str] = mapped_column(String(16), nullable=False)
+    body: Mapped[bytes] = mapped_column(LargeBinary(16777215), nullable=False)
+    # Size of the captured body before compression, and whether the response was longer.
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    truncated: Mapped[bool] = mapped_column(Boolean, nullable=False)
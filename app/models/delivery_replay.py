@@ -0,0 +1,63 @@
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import DateTime, Enum as SqlEnum, Float, ForeignKey, Index, Integer, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class DeliveryReplayStatus(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+class DeliveryReplay(Base):
+    __tablename__ = "delivery_replays"
+    __table_args__ = (Index("ix_delivery_replays_status_next_run_at", "status", "next_run_at"),)
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    user_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    webhook_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("webhooks.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    created_from: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_to: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    status: Mapped[DeliveryReplayStatus] = mapped_column(
+        SqlEnum(
+            DeliveryReplayStatus,
+            name="delivery_replay_status",
+            values_callable=lambda statuses: [status.value for status in statuses],
+        ),
+        nullable=False,
+        server_default=text("'running'"),
+    )
+    rate_per_second: Mapped[float] = mapped_column(Float, nullable=False)
+    chunk_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    total_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    replayed_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    # Keyset position of the last dead delivery handled, so each one is replayed at most once
+    # per job even if it fails again before the job finishes.
+    cursor_created_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    cursor_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    next_run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
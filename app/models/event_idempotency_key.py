@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Index, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class EventIdempotencyKey(Base):
+    __tablename__ = "event_idempotency_keys"
+    __table_args__ = (Index("ix_event_idempotency_keys_scope_key", "scope", "key", unique=True),)
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # The producer's user id, or "" for anonymous ingest, so producers never share a key space.
+    scope: Mapped[str] = mapped_column(String(36), nullable=False, server_default="")
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    request_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    delivery_ids: Mapped[list[str]] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, JSON, String, func, text
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Index, JSON, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.session import Base
@@ -8,18 +8,24 @@ from app.db.session import Base
 
 class Webhook(Base):
     __tablename__ = "webhooks"
+    __table_args__ = (Index("ix_webhooks_user_id_created_at_id", "user_id", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     user_id: Mapped[str] = mapped_column(
         String(36),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     url: Mapped[str] = mapped_column(String(2048), nullable=False)
     event_types: Mapped[list[str]] = mapped_column(JSON, nullable=False)
     secret: Mapped[str | None] = mapped_column(String(255), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("1"))
+    # Fraction of attempt responses to capture; NULL follows WORKER_RESPONSE_CAPTURE_SAMPLE_RATE.
+    response_sample_rate: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Predicate over the event payload (see app.payload_filters); NULL delivers every event.
+    payload_filter: Mapped[str | None] = mapped_column(String(1024), nullable=True)
+    # Bumped on every configuration change so workers can tell when a cached copy is stale.
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("1"))
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
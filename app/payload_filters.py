@@ -0,0 +1,297 @@
+import json
+import re
+from collections.abc import Callable, Sequence
+from functools import lru_cache
+from typing import Any, TypeVar
+
+# A small predicate language over the event payload, for example:
+#
+#   $.order.total >= 100 and $.order.currency in ["EUR", "USD"]
+#   not ($.customer.tier == "free") or $.tags contains "vip"
+#   $.items[0].sku exists
+#
+# A comparison against a missing field, or between values of different JSON types, is false.
+
+MAX_EXPRESSION_LENGTH = 1024
+_MAX_DEPTH = 32
+
+PayloadFilter = Callable[[Any], bool]
+T = TypeVar("T")
+
+_MISSING = object()
+_TOKEN = re.compile(
+    r"""
+    (?P<space>\s+)
+    | (?P<path>\$(?:\.[A-Za-z_][A-Za-z0-9_]*|\[-?\d+\]|\["(?:[^"\\]|\\.)*"\])*)
+    | (?P<string>"(?:[^"\\]|\\.)*")
+    | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+    | (?P<op>==|!=|<=|>=|<|>)
+    | (?P<punct>[()\[\],])
+    | (?P<word>[A-Za-z_]+)
+    """,
+    re.VERBOSE,
+)
+_PATH_SEGMENT = re.compile(r'\.([A-Za-z_][A-Za-z0-9_]*)|\[(-?\d+)\]|\[("(?:[^"\\]|\\.)*")\]')
+_LITERAL_WORDS = {"true": True, "false": False, "null": None}
+
+
+class PayloadFilterError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=4096)
+def compile_payload_filter(expression: str) -> PayloadFilter:
+    # Keyed by the expression text, so an edited filter compiles once and identical filters
+    # on different webhooks share one compiled predicate.
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise PayloadFilterError(f"Filter is longer than {MAX_EXPRESSION_LENGTH} characters.")
+    parser = _Parser(_tokenize(expression))
+    predicate = parser.parse_or(0)
+    if parser.peek() is not None:
+        raise PayloadFilterError(f"Unexpected {parser.peek()[1]!r} at position {parser.peek()[2]}.")
+    return predicate
+
+
+def filter_subscribers(
+    subscribers: Sequence[T],
+    payload: Any,
+    *,
+    expression: Callable[[T], str | None],
+) -> list[T]:
+    # Each distinct expression is evaluated once per event, however many webhooks share it.
+    verdicts: dict[str, bool] = {}
+    matched: list[T] = []
+    for subscriber in subscribers:
+        text = expression(subscriber)
+        if text is None:
+            matched.append(subscriber)
+            continue
+        verdict = verdicts.get(text)
+        if verdict is None:
+            try:
+                verdict = compile_payload_filter(text)(payload)
+            except PayloadFilterError:
+                # Stored filters are validated on write; an unparsable one fails open.
+                verdict = True
+            verdicts[text] = verdict
+        if verdict:
+            matched.append(subscriber)
+    return matched
+
+
+def _tokenize(expression: str) -> list[tuple[str, str, int]]:
+    tokens: list[tuple[str, str, int]] = []
+    position = 0
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if match is None:
+            raise PayloadFilterError(f"Unexpected character {expression[position]!r} at position {position}.")
+        kind = match.lastgroup or ""
+        if kind != "space":
+            tokens.append((kind, match.group(), position))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: list[tuple[str, str, int]]) -> None:
+        self.tokens = tokens
+        self.index = 0
+
+    def peek(self) -> tuple[str, str, int] | None:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def take(self) -> tuple[str, str, int]:
+        token = self.peek()
+        if token is None:
+            raise PayloadFilterError("Unexpected end of filter.")
+        self.index += 1
+        return token
+
+    def accept(self, text: str) -> bool:
+        token = self.peek()
+        if token is not None and token[0] in ("word", "op", "punct") and token[1] == text:
+            self.index += 1
+            return True
+        return False
+
+    def expect(self, text: str) -> None:
+        token = self.take()
+        if token[1] != text:
+            raise PayloadFilterError(f"Expected {text!r} at position {token[2]}, got {token[1]!r}.")
+
+    def parse_or(self, depth: int) -> PayloadFilter:
+        terms = [self.parse_and(depth)]
+        while self.accept("or"):
+            terms.append(self.parse_and(depth))
+        if len(terms) == 1:
+            return terms[0]
+        return lambda payload: any(term(payload) for term in terms)
+
+    def parse_and(self, depth: int) -> PayloadFilter:
+        terms = [self.parse_unary(depth)]
+        while self.accept("and"):
+            terms.append(self.parse_unary(depth))
+        if len(terms) == 1:
+            return terms[0]
+        return lambda payload: all(term(payload) for term in terms)
+
+    def parse_unary(self, depth: int) -> PayloadFilter:
+        if depth >= _MAX_DEPTH:
+            raise PayloadFilterError(f"Filter nests deeper than {_MAX_DEPTH} levels.")
+        if self.accept("not"):
+            inner = self.parse_unary(depth + 1)
+            return lambda payload: not inner(payload)
+        if self.accept("("):
+            inner = self.parse_or(depth + 1)
+            self.expect(")")
+            return inner
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> PayloadFilter:
+        kind, text, position = self.take()
+        if kind != "path":
+            raise PayloadFilterError(f"Expected a $ path at position {position}, got {text!r}.")
+        resolve = _compile_path(text)
+
+        kind, operator, position = self.take()
+        if operator == "exists":
+            return lambda payload: resolve(payload) is not _MISSING
+        if operator == "in":
+            return _compile_in(resolve, self.parse_list())
+        if operator == "contains":
+            return _compile_contains(resolve, self.parse_literal())
+        if kind == "op":
+            return _compile_compare(resolve, operator, self.parse_literal())
+        raise PayloadFilterError(f"Expected an operator at position {position}, got {operator!r}.")
+
+    def parse_list(self) -> list[Any]:
+        self.expect("[")
+        values: list[Any] = []
+        if self.accept("]"):
+            return values
+        values.append(self.parse_literal())
+        while self.accept(","):
+            values.append(self.parse_literal())
+        self.expect("]")
+        return values
+
+    def parse_literal(self) -> Any:
+        kind, text, position = self.take()
+        if kind in ("string", "number"):
+            return _decode_json(text, position)
+        if kind == "word" and text in _LITERAL_WORDS:
+            return _LITERAL_WORDS[text]
+        raise PayloadFilterError(f"Expected a literal at position {position}, got {text!r}.")
+
+
+def _decode_json(text: str, position: int) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError as exc:
+        raise PayloadFilterError(f"Invalid literal {text!r} at position {position}.") from exc
+
+
+def _compile_path(text: str) -> Callable[[Any], Any]:
+    segments: list[str | int] = []
+    for name, index, quoted in _PATH_SEGMENT.findall(text[1:]):
+        if name:
+            segments.append(name)
+        elif index:
+            segments.append(int(index))
+        else:
+            segments.append(_decode_json(quoted, 0))
+    keys = tuple(segments)
+
+    def resolve(payload: Any) -> Any:
+        value = payload
+        for key in keys:
+            if isinstance(key, str):
+                if not isinstance(value, dict):
+                    return _MISSING
+                value = value.get(key, _MISSING)
+                if value is _MISSING:
+                    return _MISSING
+            else:
+                if not isinstance(value, list) or not -len(value) <= key < len(value):
+                    return _MISSING
+                value = value[key]
+        return value
+
+    return resolve
+
+
+def _json_type(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    return "object"
+
+
+def _json_equal(left: Any, right: Any) -> bool:
+    # Python treats True == 1; JSON does not.
+    return _json_type(left) == _json_type(right) and left == right
+
+
+def _compile_compare(resolve: Callable[[Any], Any], operator: str, literal: Any) -> PayloadFilter:
+    if operator == "==":
+        return lambda payload: _json_equal(resolve(payload), literal)
+    if operator == "!=":
+
+        def not_equal(payload: Any) -> bool:
+            value = resolve(payload)
+            return value is not _MISSING and not _json_equal(value, literal)
+
+        return not_equal
+
+    literal_type = _json_type(literal)
+    if literal_type not in ("number", "string"):
+        raise PayloadFilterError(f"{operator} needs a number or string to compare against.")
+    compare: Callable[[Any, Any], bool] = {
+        "<": lambda left, right: left < right,
+        "<=": lambda left, right: left <= right,
+        ">": lambda left, right: left > right,
+        ">=": lambda left, right: left >= right,
+    }[operator]
+
+    def ordered(payload: Any) -> bool:
+        value = resolve(payload)
+        return _json_type(value) == literal_type and compare(value, literal)
+
+    return ordered
+
+
+def _compile_in(resolve: Callable[[Any], Any], values: list[Any]) -> PayloadFilter:
+    if all(isinstance(value, str) for value in values):
+        strings = frozenset(values)
+
+        def in_strings(payload: Any) -> bool:
+            value = resolve(payload)
+            return isinstance(value, str) and value in strings
+
+        return in_strings
+
+    def in_values(payload: Any) -> bool:
+        value = resolve(payload)
+        return any(_json_equal(value, candidate) for candidate in values)
+
+    return in_values
+
+
+def _compile_contains(resolve: Callable[[Any], Any], literal: Any) -> PayloadFilter:
+    def contains(payload: Any) -> bool:
+        value = resolve(payload)
+        if isinstance(value, str):
+            return isinstance(literal, str) and literal in value
+        if isinstance(value, list):
+            return any(_json_equal(item, literal) for item in value)
+        return False
+
+    return contains
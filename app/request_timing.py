@@ -0,0 +1,51 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RequestTimings:
+    started_at: float = field(default_factory=time.perf_counter)
+    phases: dict[str, float] = field(default_factory=dict)
+    counts: dict[str, int] = field(default_factory=dict)
+    marks: dict[str, float] = field(default_factory=dict)
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> tuple[RequestTimings, object]:
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def finish_request_timings(token: object) -> None:
+    _current.reset(token)  # type: ignore[arg-type]
+
+
+def current_request_timings() -> RequestTimings | None:
+    return _current.get()
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+@contextmanager
+def timed_phase(phase: str) -> Iterator[None]:
+    if _current.get() is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, time.perf_counter() - started)
@@ -1,13 +1,37 @@
+from app.schemas.api_key import ApiKeyCreateRequest, ApiKeyCreateResponse, ApiKeyResponse
 from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse, UserResponse
+from app.schemas.dead_letter import (
+    DeadLetterItemResponse,
+    DeadLetterListResponse,
+    DeliveryReplayCreateRequest,
+    DeliveryReplayResponse,
+)
 from app.schemas.delivery import (
     DeliveryAttemptDetailResponse,
     DeliveryAttemptListItemResponse,
     DeliveryDetailResponse,
     DeliveryHistoryResponse,
     DeliveryListItemResponse,
+    DeliverySearchItemResponse,
+    DeliverySearchResponse,
+)
+from app.schemas.event import (
+    EventIngestRequest,
+    EventIngestResponse,
+    EventStreamIngestResponse,
+    EventStreamLineError,
 )
-from app.schemas.event import EventIngestRequest, EventIngestResponse
 from app.schemas.webhook import (
+    WebhookBulkActivationRequest,
+    WebhookBulkActivationResponse,
+    WebhookBulkActivationResult,
+    WebhookBulkCreateRequest,
+    WebhookBulkCreateResponse,
+    WebhookBulkCreateResult,
+    WebhookBulkUpdateItem,
+    WebhookBulkUpdateRequest,
+    WebhookBulkUpdateResponse,
+    WebhookBulkUpdateResult,
     WebhookCreateRequest,
     WebhookCreateResponse,
     WebhookResponse,
@@ -23,11 +47,32 @@ __all__ = [
     "WebhookCreateResponse",
     "WebhookResponse",
     "WebhookUpdateRequest",
+    "WebhookBulkActivationRequest",
+    "WebhookBulkActivationResponse",
+    "WebhookBulkActivationResult",
+    "WebhookBulkCreateRequest",
+    "WebhookBulkCreateResponse",
+    "WebhookBulkCreateResult",
+    "WebhookBulkUpdateItem",
+    "WebhookBulkUpdateRequest",
+    "WebhookBulkUpdateResponse",
+    "WebhookBulkUpdateResult",
+    "ApiKeyCreateRequest",
+    "ApiKeyCreateResponse",
+    "ApiKeyResponse",
     "EventIngestRequest",
     "EventIngestResponse",
+    "EventStreamIngestResponse",
+    "EventStreamLineError",
     "DeliveryAttemptDetailResponse",
     "DeliveryAttemptListItemResponse",
     "DeliveryDetailResponse",
     "DeliveryHistoryResponse",
     "DeliveryListItemResponse",
+    "DeliverySearchItemResponse",
+    "DeliverySearchResponse",
+    "DeadLetterItemResponse",
+    "DeadLetterListResponse",
+    "DeliveryReplayCreateRequest",
+    "DeliveryReplayResponse",
 ]
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+class ApiKeyCreateRequest(BaseModel):
+    name: str = Field(max_length=255)
+    rate_limit_per_second: float | None = Field(default=None, gt=0)
+    burst: int | None = Field(default=None, ge=1)
+
+    @field_validator("name")
+    @classmethod
+    def validate_name(cls, value: str) -> str:
+        name = value.strip()
+        if not name:
+            raise ValueError("name must be a non-empty string.")
+        return name
+
+
+class ApiKeyResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    name: str
+    key_prefix: str
+    rate_limit_per_second: float
+    burst: int
+    request_count: int
+    is_active: bool
+    last_used_at: datetime | None
+    created_at: datetime
+
+
+class ApiKeyCreateResponse(ApiKeyResponse):
+    api_key: str
@@ -0,0 +1,60 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.config import settings
+from app.models.delivery_replay import DeliveryReplayStatus
+
+
+class DeadLetterItemResponse(BaseModel):
+    id: str
+    webhook_id: str
+    event_type: str
+    created_at: datetime
+    failed_at: datetime
+    attempt_count: int
+    last_http_status: int | None
+    last_response_body: str | None
+    last_attempted_at: datetime | None
+
+
+class DeadLetterListResponse(BaseModel):
+    page_size: int
+    next_cursor: str | None
+    results: list[DeadLetterItemResponse]
+
+
+class DeliveryReplayCreateRequest(BaseModel):
+    webhook_id: uuid.UUID
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    rate_per_second: float | None = Field(default=None, gt=0, le=settings.DELIVERY_REPLAY_MAX_RATE_PER_SECOND)
+    chunk_size: int | None = Field(default=None, ge=1, le=settings.DELIVERY_REPLAY_MAX_CHUNK_SIZE)
+
+    @model_validator(mode="after")
+    def validate_time_range(self) -> "DeliveryReplayCreateRequest":
+        if (
+            self.created_after is not None
+            and self.created_before is not None
+            and self.created_after >= self.created_before
+        ):
+            raise ValueError("created_after must be earlier than created_before.")
+        return self
+
+
+class DeliveryReplayResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    webhook_id: str
+    status: DeliveryReplayStatus
+    created_from: datetime | None
+    created_to: datetime | None
+    rate_per_second: float
+    chunk_size: int
+    total_count: int
+    replayed_count: int
+    created_at: datetime
+    updated_at: datetime
+    finished_at: datetime | None
@@ -24,18 +24,35 @@ class DeliveryListItemResponse(BaseModel):
 
 
 class DeliveryHistoryResponse(BaseModel):
-    total_count: int
-    page: int
+    total_count: int | None
+    page: int | None
     page_size: int
-    total_pages: int
+    total_pages: int | None
+    next_cursor: str | None
     results: list[DeliveryListItemResponse]
 
 
+class DeliverySearchItemResponse(BaseModel):
+    id: str
+    webhook_id: str
+    event_type: str
+    status: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class DeliverySearchResponse(BaseModel):
+    page_size: int
+    next_cursor: str | None
+    results: list[DeliverySearchItemResponse]
+
+
 class DeliveryDetailResponse(BaseModel):
     id: str
     webhook_id: str
     event_type: str
     status: str
+    ordering_key: str | None
     payload: dict
     created_at: datetime
     updated_at: datetime
@@ -1,11 +1,17 @@
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.config import settings
 
 
 class EventIngestRequest(BaseModel):
     event_type: str
     payload: dict[str, Any]
+    deliver_at: datetime | None = None
+    delay_seconds: float | None = Field(default=None, ge=0, le=settings.EVENT_MAX_SCHEDULE_AHEAD_SECONDS)
+    ordering_key: str | None = Field(default=None, min_length=1, max_length=255)
 
     @field_validator("event_type")
     @classmethod
@@ -15,7 +21,41 @@ class EventIngestRequest(BaseModel):
             raise ValueError("event_type must be a non-empty string.")
         return event_type
 
+    @field_validator("deliver_at")
+    @classmethod
+    def validate_deliver_at(cls, value: datetime | None) -> datetime | None:
+        if value is None:
+            return None
+        # Naive timestamps are taken as UTC, matching how the API returns them.
+        deliver_at = value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+        horizon = datetime.now(UTC) + timedelta(seconds=settings.EVENT_MAX_SCHEDULE_AHEAD_SECONDS)
+        if deliver_at > horizon:
+            raise ValueError(
+                f"deliver_at cannot be more than {settings.EVENT_MAX_SCHEDULE_AHEAD_SECONDS} seconds ahead."
+            )
+        return deliver_at
+
+    @model_validator(mode="after")
+    def validate_schedule(self) -> "EventIngestRequest":
+        if self.deliver_at is not None and self.delay_seconds is not None:
+            raise ValueError("Use either deliver_at or delay_seconds, not both.")
+        return self
+
 
 class EventIngestResponse(BaseModel):
     queued_count: int
     delivery_ids: list[str]
+
+
+class EventStreamLineError(BaseModel):
+    line: int
+    error: str
+
+
+class EventStreamIngestResponse(BaseModel):
+    accepted: int
+    rejected: int
+    queued_count: int
+    errors: list[EventStreamLineError]
+    errors_truncated: bool
+    committed_through_line: int
@@ -1,12 +1,26 @@
+import uuid
 from datetime import datetime
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, ConfigDict, HttpUrl, field_validator
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
+
+from app.config import settings
+from app.payload_filters import MAX_EXPRESSION_LENGTH, compile_payload_filter
+
+
+def _normalize_payload_filter(value: str) -> str:
+    expression = value.strip()
+    if expression:
+        compile_payload_filter(expression)
+    return expression
 
 
 class WebhookCreateRequest(BaseModel):
     url: HttpUrl
     event_types: list[str]
     secret: str | None = None
+    response_sample_rate: float | None = Field(default=None, ge=0, le=1)
+    payload_filter: str | None = Field(default=None, max_length=MAX_EXPRESSION_LENGTH)
 
     @field_validator("event_types")
     @classmethod
@@ -32,10 +46,21 @@ class WebhookCreateRequest(BaseModel):
             raise ValueError("secret cannot be empty.")
         return secret
 
+    @field_validator("payload_filter")
+    @classmethod
+    def validate_payload_filter(cls, value: str | None) -> str | None:
+        if value is None:
+            return None
+        return _normalize_payload_filter(value) or None
+
 
 class WebhookUpdateRequest(BaseModel):
     url: HttpUrl | None = None
     event_types: list[str] | None = None
+    # An empty string removes the rate, so the global default applies again; null leaves it unchanged.
+    response_sample_rate: Annotated[float, Field(ge=0, le=1)] | Literal[""] | None = None
+    # An empty string removes the filter; null leaves it unchanged.
+    payload_filter: str | None = Field(default=None, max_length=MAX_EXPRESSION_LENGTH)
 
     @field_validator("event_types")
     @classmethod
@@ -53,6 +78,13 @@ class WebhookUpdateRequest(BaseModel):
             normalized.append(event_type)
         return normalized
 
+    @field_validator("payload_filter")
+    @classmethod
+    def validate_payload_filter(cls, value: str | None) -> str | None:
+        if value is None:
+            return None
+        return _normalize_payload_filter(value)
+
 
 class WebhookResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -62,9 +94,67 @@ class WebhookResponse(BaseModel):
     url: str
     event_types: list[str]
     is_active: bool
+    response_sample_rate: float | None
+    payload_filter: str | None
     created_at: datetime
     updated_at: datetime
 
 
 class WebhookCreateResponse(WebhookResponse):
     secret: str
+
+
+class WebhookBulkUpdateItem(WebhookUpdateRequest):
+    id: uuid.UUID
+
+
+class WebhookBulkCreateRequest(BaseModel):
+    # Items are validated one by one so a bad entry is reported in its result, not for the whole batch.
+    items: list[dict[str, Any]] = Field(min_length=1, max_length=settings.WEBHOOK_BULK_MAX_ITEMS)
+
+
+class WebhookBulkUpdateRequest(BaseModel):
+    items: list[dict[str, Any]] = Field(min_length=1, max_length=settings.WEBHOOK_BULK_MAX_ITEMS)
+
+
+class WebhookBulkActivationRequest(BaseModel):
+    ids: list[uuid.UUID] = Field(min_length=1, max_length=settings.WEBHOOK_BULK_MAX_ITEMS)
+    is_active: bool
+
+
+class WebhookBulkCreateResult(BaseModel):
+    index: int
+    status: Literal["created", "invalid"]
+    webhook: WebhookCreateResponse | None = None
+    error: str | None = None
+
+
+class WebhookBulkUpdateResult(BaseModel):
+    index: int
+    id: str | None = None
+    status: Literal["updated", "not_found", "invalid"]
+    webhook: WebhookResponse | None = None
+    error: str | None = None
+
+
+class WebhookBulkActivationResult(BaseModel):
+    id: str
+    status: Literal["updated", "not_found"]
+
+
+class WebhookBulkCreateResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[WebhookBulkCreateResult]
+
+
+class WebhookBulkUpdateResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[WebhookBulkUpdateResult]
+
+
+class WebhookBulkActivationResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[WebhookBulkActivationResult]
@@ -0,0 +1,67 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.request_timing import timed_phase
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only when orjson is not installed
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, datetime):
+        encoded = value.isoformat()
+        if encoded.endswith("+00:00"):
+            encoded = encoded.removesuffix("+00:00") + "Z"
+        return encoded
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS)
+
+    def loads(data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+else:
+
+    def dumps(value: Any) -> bytes:
+        # Same compact, non-ASCII-escaped output as orjson so signatures do not depend on the encoder.
+        return json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+def dumps_webhook_body(value: Any) -> bytes:
+    # Outgoing webhook bodies keep the stdlib's default output (", "/": " separators, non-ASCII as
+    # \u escapes) so receivers that re-serialise the parsed body to check the signature still match.
+    return json.dumps(value, default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        with timed_phase("render"):
+            return dumps(content)
+
@@ -1,12 +1,34 @@
+from app.services.api_key_service import IngestCredential, issue_api_key, revoke_ingest_api_key
+from app.services.auth_cache import clear_auth_cache, invalidate_user
 from app.services.auth_service import login_user, register_user
+from app.services.delivery_replay import replay_next_chunk, start_delivery_replay
+from app.services.event_service import IngestResult, queue_event
 from app.services.jwt import create_access_token, decode_access_token
-from app.services.password import hash_password, verify_password
+from app.services.password import (
+    PasswordHasherBusyError,
+    hash_password,
+    hash_password_async,
+    verify_password,
+    verify_password_async,
+)
 
 __all__ = [
     "register_user",
     "login_user",
     "hash_password",
     "verify_password",
+    "hash_password_async",
+    "verify_password_async",
+    "PasswordHasherBusyError",
     "create_access_token",
     "decode_access_token",
+    "clear_auth_cache",
+    "invalidate_user",
+    "IngestResult",
+    "queue_event",
+    "start_delivery_replay",
+    "replay_next_chunk",
+    "IngestCredential",
+    "issue_api_key",
+    "revoke_ingest_api_key",
 ]
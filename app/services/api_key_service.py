@@ -0,0 +1,119 @@
+import hashlib
+import math
+import secrets
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.repositories.api_key_repository import create_api_key, get_active_api_key_by_hash, revoke_api_key
+from app.models.api_key import ApiKey
+from app.services.rate_limiter import RateLimitDecision, ingest_rate_limiter
+from app.services.ttl_cache import TTLCache
+
+API_KEY_PREFIX = "whk_"
+
+
+@dataclass(frozen=True)
+class IngestCredential:
+    api_key_id: str
+    user_id: str
+    rate_limit_per_second: float
+    burst: int
+
+
+_credentials: TTLCache[str, IngestCredential] = TTLCache(
+    max_entries=settings.API_KEY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.API_KEY_CACHE_TTL_SECONDS,
+)
+
+
+async def issue_api_key(
+    session: AsyncSession,
+    *,
+    user_id: str,
+    name: str,
+    rate_limit_per_second: float | None = None,
+    burst: int | None = None,
+) -> tuple[ApiKey, str]:
+    raw_key = API_KEY_PREFIX + secrets.token_urlsafe(32)
+    api_key = await create_api_key(
+        session,
+        api_key_id=str(uuid.uuid4()),
+        user_id=user_id,
+        name=name,
+        key_prefix=raw_key[:12],
+        key_hash=hash_api_key(raw_key),
+        rate_limit_per_second=rate_limit_per_second or settings.API_KEY_DEFAULT_RATE_LIMIT_PER_SECOND,
+        burst=burst or settings.API_KEY_DEFAULT_BURST,
+    )
+    return api_key, raw_key
+
+
+async def revoke_ingest_api_key(session: AsyncSession, api_key: ApiKey) -> ApiKey:
+    revoked = await revoke_api_key(session, api_key)
+    _credentials.pop(revoked.key_hash)
+    ingest_rate_limiter.forget(revoked.id)
+    return revoked
+
+
+async def authenticate_api_key(session: AsyncSession, raw_key: str | None) -> IngestCredential | None:
+    if raw_key is None:
+        if settings.INGEST_API_KEY_REQUIRED:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="An X-API-Key header is required.",
+            )
+        return None
+
+    key_hash = hash_api_key(raw_key)
+    credential = _credentials.get(key_hash)
+    if credential is None:
+        api_key = await get_active_api_key_by_hash(session, key_hash)
+        if api_key is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key.")
+        credential = IngestCredential(
+            api_key_id=api_key.id,
+            user_id=api_key.user_id,
+            rate_limit_per_second=api_key.rate_limit_per_second,
+            burst=api_key.burst,
+        )
+        _credentials.set(key_hash, credential)
+    return credential
+
+
+def charge_ingest_events(credential: IngestCredential, *, events: int) -> RateLimitDecision:
+    return ingest_rate_limiter.check(
+        credential.api_key_id,
+        rate_limit_per_second=credential.rate_limit_per_second,
+        burst=credential.burst,
+        tokens=events,
+    )
+
+
+def charge_ingest_request(credential: IngestCredential | None) -> None:
+    # Called once the request is known to be valid, so a rejected body costs no quota.
+    if credential is None:
+        return
+    decision = charge_ingest_events(credential, events=1)
+    if not decision.allowed:
+        raise rate_limit_exceeded(decision)
+
+
+def rate_limit_exceeded(
+    decision: RateLimitDecision,
+    *,
+    detail: Any = "Rate limit exceeded for this API key.",
+) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(decision.retry_after_seconds)))},
+    )
+
+
+def hash_api_key(raw_key: str) -> str:
+    return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
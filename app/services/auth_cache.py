@@ -0,0 +1,118 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import event
+
+from app.config import settings
+from app.models.user import User
+from app.metrics import registry
+from app.services.ttl_cache import TTLCache
+
+cache_requests_counter = registry.counter(
+    "auth_cache_requests_total",
+    "Authentication cache lookups by cache and result.",
+    ("cache", "result"),
+)
+cache_entries_gauge = registry.gauge(
+    "auth_cache_entries",
+    "Entries currently held in each authentication cache.",
+    ("cache",),
+)
+
+
+@dataclass(frozen=True)
+class _UserSnapshot:
+    id: str
+    email: str
+    hashed_password: str
+    created_at: datetime
+    updated_at: datetime
+
+
+_token_subjects: TTLCache[bytes, str] = TTLCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
+_users: TTLCache[str, _UserSnapshot] = TTLCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+
+def get_cached_token_subject(token: str) -> str | None:
+    if not settings.AUTH_CACHE_ENABLED:
+        return None
+    user_id = _token_subjects.get(_token_key(token))
+    cache_requests_counter.inc(cache="token", result="hit" if user_id is not None else "miss")
+    return user_id
+
+
+def cache_token_subject(token: str, payload: dict[str, Any]) -> None:
+    user_id = payload.get("sub")
+    if not settings.AUTH_CACHE_ENABLED or not isinstance(user_id, str) or not user_id:
+        return
+    # Never keep a token past its own expiry.
+    expires_at = payload.get("exp")
+    ttl = float(expires_at) - time.time() if isinstance(expires_at, (int, float)) else None
+    _token_subjects.set(_token_key(token), user_id, ttl_seconds=ttl)
+    cache_entries_gauge.set(len(_token_subjects), cache="token")
+
+
+def get_cached_user(user_id: str) -> User | None:
+    if not settings.AUTH_CACHE_ENABLED:
+        return None
+    snapshot = _users.get(user_id)
+    cache_requests_counter.inc(cache="user", result="hit" if snapshot is not None else "miss")
+    if snapshot is None:
+        return None
+    # A fresh transient instance per request, so no ORM object is shared between sessions.
+    return User(
+        id=snapshot.id,
+        email=snapshot.email,
+        hashed_password=snapshot.hashed_password,
+        created_at=snapshot.created_at,
+        updated_at=snapshot.updated_at,
+    )
+
+
+def cache_user(user: User) -> None:
+    if not settings.AUTH_CACHE_ENABLED:
+        return
+    _users.set(
+        user.id,
+        _UserSnapshot(
+            id=user.id,
+            email=user.email,
+            hashed_password=user.hashed_password,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        ),
+    )
+    cache_entries_gauge.set(len(_users), cache="user")
+
+
+def invalidate_user(user_id: str) -> None:
+    # Cached tokens for this user only resolve to an id; with the user entry gone the next
+    # request reloads the row and fails authentication if it no longer exists.
+    _users.pop(user_id)
+    cache_entries_gauge.set(len(_users), cache="user")
+
+
+def clear_auth_cache() -> None:
+    _token_subjects.clear()
+    _users.clear()
+    cache_entries_gauge.set(0, cache="token")
+    cache_entries_gauge.set(0, cache="user")
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper: Any, connection: Any, target: User) -> None:
+    invalidate_user(target.id)
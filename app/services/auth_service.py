@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.repositories.user_repository import create_user, get_user_by_email
 from app.models.user import User
 from app.services.jwt import create_access_token
-from app.services.password import hash_password, verify_password
+from app.services.password import PasswordHasherBusyError, hash_password_async, verify_password_async
 
 
 async def register_user(session: AsyncSession, email: str, password: str) -> User:
@@ -19,16 +19,31 @@ async def register_user(session: AsyncSession, email: str, password: str) -> Use
         )
 
     user_id = str(uuid.uuid4())
-    hashed = hash_password(password)
+    try:
+        hashed = await hash_password_async(password)
+    except PasswordHasherBusyError:
+        raise _busy_error() from None
     return await create_user(session, user_id=user_id, email=normalized_email, hashed_password=hashed)
 
 
 async def login_user(session: AsyncSession, email: str, password: str) -> str:
     normalized_email = email.lower()
     user = await get_user_by_email(session, normalized_email)
-    if user is None or not verify_password(password, user.hashed_password):
+    try:
+        password_matches = user is not None and await verify_password_async(password, user.hashed_password)
+    except PasswordHasherBusyError:
+        raise _busy_error() from None
+    if user is None or not password_matches:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password.",
         )
     return create_access_token(user.id)
+
+
+def _busy_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is temporarily overloaded. Please retry shortly.",
+        headers={"Retry-After": "1"},
+    )
@@ -0,0 +1,147 @@
+import csv
+import io
+import zlib
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from app.db.repositories.delivery_history_repository import (
+    list_attempts_for_delivery_ids,
+    list_deliveries_for_webhook_after,
+)
+from app.db.session import async_session
+from app.models.delivery import Delivery
+from app.models.delivery_attempt import DeliveryAttempt
+from app.serialization import dumps
+from app.services.response_capture import load_response_bodies
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+CSV_COLUMNS = ["id", "webhook_id", "event_type", "status", "created_at", "updated_at", "payload"]
+
+
+async def iter_delivery_export(
+    webhook_id: str,
+    *,
+    export_format: ExportFormat,
+    include_attempts: bool,
+    created_from: datetime | None,
+    created_to: datetime | None,
+    chunk_size: int,
+) -> AsyncIterator[bytes]:
+    if export_format == ExportFormat.CSV:
+        yield _csv_row(CSV_COLUMNS + (["attempts"] if include_attempts else []))
+
+    # A dedicated session: the request-scoped one may already be closed while the body streams.
+    async with async_session() as session:
+        after: tuple[datetime, str] | None = None
+        while True:
+            deliveries = await list_deliveries_for_webhook_after(
+                session=session,
+                webhook_id=webhook_id,
+                after=after,
+                created_from=created_from,
+                created_to=created_to,
+                limit=chunk_size,
+            )
+            if not deliveries:
+                return
+
+            attempts_by_delivery: dict[str, list[DeliveryAttempt]] = defaultdict(list)
+            response_bodies: dict[str, str | None] = {}
+            if include_attempts:
+                attempts = await list_attempts_for_delivery_ids(
+                    session=session,
+                    delivery_ids=[delivery.id for delivery in deliveries],
+                )
+                for attempt in attempts:
+                    attempts_by_delivery[attempt.delivery_id].append(attempt)
+                response_bodies = await load_response_bodies(session, attempts)
+
+            yield b"".join(
+                _encode_delivery(
+                    delivery,
+                    attempts_by_delivery.get(delivery.id, []) if include_attempts else None,
+                    response_bodies,
+                    export_format,
+                )
+                for delivery in deliveries
+            )
+
+            last = deliveries[-1]
+            after = (last.created_at, last.id)
+            # Keep memory flat and do not hold one read snapshot open for the whole export.
+            session.expunge_all()
+            await session.commit()
+            if len(deliveries) < chunk_size:
+                return
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes], *, level: int = 6) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _encode_delivery(
+    delivery: Delivery,
+    attempts: list[DeliveryAttempt] | None,
+    response_bodies: dict[str, str | None],
+    export_format: ExportFormat,
+) -> bytes:
+    record: dict[str, Any] = {
+        "id": delivery.id,
+        "webhook_id": delivery.webhook_id,
+        "event_type": delivery.event_type,
+        "status": delivery.status.value,
+        "created_at": delivery.created_at,
+        "updated_at": delivery.updated_at,
+        "payload": delivery.payload,
+    }
+    if attempts is not None:
+        record["attempts"] = [
+            {
+                "attempt_number": attempt.attempt_number,
+                "http_status": attempt.http_status,
+                "succeeded": attempt.succeeded,
+                "attempted_at": attempt.attempted_at,
+                "response_body": response_bodies.get(attempt.id),
+            }
+            for attempt in attempts
+        ]
+
+    if export_format == ExportFormat.NDJSON:
+        return dumps(record) + b"\n"
+
+    row = [
+        record["id"],
+        record["webhook_id"],
+        record["event_type"],
+        record["status"],
+        delivery.created_at.isoformat(),
+        delivery.updated_at.isoformat(),
+        dumps(record["payload"]).decode("utf-8"),
+    ]
+    if attempts is not None:
+        row.append(dumps(record["attempts"]).decode("utf-8"))
+    return _csv_row(row)
+
+
+def _csv_row(values: list[Any]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue().encode("utf-8")
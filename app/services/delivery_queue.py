@@ -0,0 +1,453 @@
+import asyncio
+import fcntl
+import heapq
+import logging
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import NamedTuple, Protocol
+
+from sqlalchemy import Exists, Select, exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.config import settings
+from app.db.repositories.delivery_repository import list_pending_delivery_schedule
+from app.db.session import async_session
+from app.local_log import (
+    LogPosition,
+    OffsetStore,
+    SegmentedLogReader,
+    SegmentedLogWriter,
+    delete_segments_before,
+    encode_record,
+    iter_file_records,
+)
+from app.metrics import registry
+from app.models.delivery import Delivery, DeliveryStatus
+
+logger = logging.getLogger("delivery_queue")
+
+queue_depth_gauge = registry.gauge(
+    "delivery_queue_due_entries",
+    "Entries held in memory by the local log queue, due now or within the loaded retry buckets.",
+)
+retry_index_gauge = registry.gauge(
+    "delivery_queue_retry_buckets",
+    "Retry index bucket files on disk for the local log queue.",
+)
+publish_failures_counter = registry.counter(
+    "delivery_queue_publish_failures_total",
+    "Committed deliveries that could not be published to the queue.",
+)
+
+
+class QueuedDelivery(NamedTuple):
+    delivery_id: str
+    due_at: datetime | None = None
+
+
+@dataclass
+class DeliveryClaim:
+    delivery: Delivery
+    token: object = None
+
+
+class DeliveryQueue(Protocol):
+    # Delivery rows in MySQL stay the record of truth for status, attempts and next_attempt_at;
+    # a backend only decides which pending row a worker should lock next.
+    shardable: bool
+
+    async def publish(self, entries: Sequence[QueuedDelivery]) -> None: ...
+
+    async def start(self) -> None: ...
+
+    async def claim(self, session: AsyncSession, *, shards: Sequence[int] | None = None) -> DeliveryClaim | None: ...
+
+    def settle(self, claim: DeliveryClaim) -> None: ...
+
+    def release(self, claim: DeliveryClaim) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def _ordering_blocked() -> Exists:
+    earlier = aliased(Delivery)
+    # A keyed delivery waits while any earlier delivery for the same key is still pending,
+    # including one that is in flight on another worker or waiting out a retry backoff.
+    # "Earlier" is id order, and UUIDv7 ids are only monotonic within the process that made
+    # them, so across API replicas the order is only as good as their clocks (see README).
+    return (
+        exists()
+        .where(
+            earlier.webhook_id == Delivery.webhook_id,
+            earlier.ordering_key == Delivery.ordering_key,
+            earlier.status == DeliveryStatus.PENDING,
+            earlier.id < Delivery.id,
+        )
+        .correlate(Delivery)
+    )
+
+
+def _claim_statement(*, now: datetime, shards: Sequence[int] | None) -> Select[tuple[Delivery]]:
+    statement: Select[tuple[Delivery]] = (
+        select(Delivery)
+        .where(
+            Delivery.status == DeliveryStatus.PENDING,
+            Delivery.next_attempt_at <= now,
+            or_(Delivery.ordering_key.is_(None), ~_ordering_blocked()),
+        )
+        # A range scan over (status, next_attempt_at) that stops at "now", so deliveries
+        # scheduled for later never get read, however many of them there are.
+        .order_by(Delivery.next_attempt_at.asc())
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    if shards is not None:
+        # Same range scan on (shard, status, next_attempt_at), confined to the given shards' slices.
+        statement = statement.where(Delivery.shard == shards[0] if len(shards) == 1 else Delivery.shard.in_(shards))
+    return statement
+
+
+class MySqlDeliveryQueue:
+    # The deliveries table is the queue: ingest has nothing to publish beyond the row itself, and
+    # a claim is a locking range scan for the oldest due row.
+    shardable = True
+
+    async def publish(self, entries: Sequence[QueuedDelivery]) -> None:
+        pass
+
+    async def start(self) -> None:
+        pass
+
+    async def claim(self, session: AsyncSession, *, shards: Sequence[int] | None = None) -> DeliveryClaim | None:
+        statement = _claim_statement(now=datetime.now(UTC), shards=shards)
+        result = await session.execute(statement)
+        delivery = result.scalar_one_or_none()
+        return DeliveryClaim(delivery) if delivery is not None else None
+
+    def settle(self, claim: DeliveryClaim) -> None:
+        pass
+
+    def release(self, claim: DeliveryClaim) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+@dataclass(order=True)
+class _Entry:
+    due_ms: int
+    sequence: int
+    delivery_id: str = field(compare=False)
+    # LogPosition of the main-log record, or the start (epoch ms) of the retry bucket it came from.
+    source: LogPosition | int = field(compare=False)
+
+
+@dataclass
+class _Bucket:
+    loaded: bool = False
+    outstanding: int = 0
+
+
+class LocalLogDeliveryQueue:
+    # Ingest appends (delivery id, due time) records to a segmented, memory-mapped log; one worker
+    # process consumes it. Records that are not yet due move into the retry index: append-only
+    # bucket files, one per DELIVERY_QUEUE_LOG_RETRY_BUCKET_SECONDS of due time, loaded into memory
+    # once their window opens. The consumer offset only moves past records that are done or safely
+    # in a bucket, so after a crash entries can repeat but not vanish; a repeat is harmless because
+    # every claim re-checks the row's status and next_attempt_at under FOR UPDATE.
+    shardable = False
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        segment_bytes: int,
+        fsync: bool,
+        retry_bucket_seconds: int,
+        read_batch_size: int,
+        reconcile_on_start: bool,
+        scheduled_cache_size: int = 100000,
+        offset_commit_interval_seconds: float = 1.0,
+    ) -> None:
+        self.directory = directory
+        self.log_directory = os.path.join(directory, "log")
+        self.retry_directory = os.path.join(directory, "retry")
+        self.fsync = fsync
+        self.retry_bucket_ms = retry_bucket_seconds * 1000
+        self.read_batch_size = read_batch_size
+        self.reconcile_on_start = reconcile_on_start
+        self.scheduled_cache_size = scheduled_cache_size
+        self.offset_commit_interval_seconds = offset_commit_interval_seconds
+        self._writer = SegmentedLogWriter(self.log_directory, segment_bytes=segment_bytes, fsync=fsync)
+        self._append_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="delivery-queue-append")
+        self._reader: SegmentedLogReader | None = None
+        self._offsets = OffsetStore(os.path.join(directory, "consumer.offset"))
+        self._consumer_lock_fd: int | None = None
+        self._heap: list[_Entry] = []
+        self._sequence = 0
+        self._unresolved: set[LogPosition] = set()
+        self._buckets: dict[int, _Bucket] = {}
+        # Due time last written to the retry index per delivery id, so repeats are not appended
+        # again. Bounded: forgetting an id only costs a duplicate record, which claims drop.
+        self._scheduled: OrderedDict[str, int] = OrderedDict()
+        self._committed: LogPosition | None = None
+        self._committed_at = 0.0
+
+    async def publish(self, entries: Sequence[QueuedDelivery]) -> None:
+        if not entries:
+            return
+        now_ms = _epoch_ms(datetime.now(UTC))
+        records = [
+            (entry.delivery_id.encode("ascii"), _epoch_ms(entry.due_at) if entry.due_at else now_ms)
+            for entry in entries
+        ]
+        # The append blocks on the cross-process flock and, with fsync on, on the disk; a single
+        # writer thread keeps that off the event loop and the writer's own state single-threaded.
+        await asyncio.get_running_loop().run_in_executor(self._append_executor, self._writer.append, records)
+
+    async def start(self) -> None:
+        os.makedirs(self.retry_directory, exist_ok=True)
+        lock_path = os.path.join(self.directory, "consumer.lock")
+        self._consumer_lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._consumer_lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(self._consumer_lock_fd)
+            self._consumer_lock_fd = None
+            raise RuntimeError(f"Another worker is already consuming the delivery queue in {self.directory}.")
+
+        self._committed = self._offsets.load()
+        self._reader = SegmentedLogReader(self.log_directory, start=self._committed)
+        for name in os.listdir(self.retry_directory):
+            if name.endswith(".log") and name.removesuffix(".log").isdigit():
+                self._buckets[int(name.removesuffix(".log"))] = _Bucket()
+        retry_index_gauge.set(len(self._buckets))
+        if self.reconcile_on_start:
+            await self._reconcile()
+
+    async def claim(self, session: AsyncSession, *, shards: Sequence[int] | None = None) -> DeliveryClaim | None:
+        now = datetime.now(UTC)
+        now_ms = _epoch_ms(now)
+        self._pump(now_ms)
+        while self._heap and self._heap[0].due_ms <= now_ms:
+            entry = heapq.heappop(self._heap)
+            result = await session.execute(
+                select(Delivery)
+                .where(Delivery.id == entry.delivery_id, Delivery.status == DeliveryStatus.PENDING)
+                .with_for_update(skip_locked=True)
+            )
+            delivery = result.scalar_one_or_none()
+            if delivery is None:
+                # SKIP LOCKED also returns nothing for a row another transaction holds, so look
+                # again without locking before dropping the entry.
+                still_pending = await session.execute(
+                    select(Delivery.id).where(
+                        Delivery.id == entry.delivery_id, Delivery.status == DeliveryStatus.PENDING
+                    )
+                )
+                if still_pending.scalar_one_or_none() is not None:
+                    self._reschedule(entry, now_ms + int(settings.WORKER_POLL_INTERVAL_SECONDS * 1000))
+                    continue
+                # Delivered, dead-lettered, deleted with its webhook, or a repeated entry.
+                self._scheduled.pop(entry.delivery_id, None)
+                self._resolve(entry)
+                continue
+            due_at = delivery.next_attempt_at
+            if due_at is not None and _epoch_ms(due_at) > now_ms:
+                self._reschedule(entry, _epoch_ms(due_at))
+                continue
+            if delivery.ordering_key is not None:
+                blocked = await session.execute(
+                    select(Delivery.id).where(Delivery.id == delivery.id, _ordering_blocked())
+                )
+                if blocked.scalar_one_or_none() is not None:
+                    self._reschedule(entry, now_ms + int(settings.WORKER_POLL_INTERVAL_SECONDS * 1000))
+                    continue
+            return DeliveryClaim(delivery, entry)
+        queue_depth_gauge.set(len(self._heap))
+        return None
+
+    def settle(self, claim: DeliveryClaim) -> None:
+        entry = claim.token
+        assert isinstance(entry, _Entry)
+        delivery = claim.delivery
+        if delivery.status == DeliveryStatus.PENDING:
+            # Retry scheduled, or the attempt could not run (webhook gone); never spin on it.
+            floor_ms = _epoch_ms(datetime.now(UTC)) + int(settings.WORKER_POLL_INTERVAL_SECONDS * 1000)
+            due_ms = max(_epoch_ms(delivery.next_attempt_at) if delivery.next_attempt_at else 0, floor_ms)
+            self._reschedule(entry, due_ms)
+        else:
+            self._scheduled.pop(entry.delivery_id, None)
+            self._resolve(entry)
+
+    def release(self, claim: DeliveryClaim) -> None:
+        entry = claim.token
+        assert isinstance(entry, _Entry)
+        heapq.heappush(self._heap, entry)
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._commit_offset(force=True)
+            self._reader.close()
+            self._reader = None
+        self._append_executor.shutdown(wait=True)
+        self._writer.close()
+        if self._consumer_lock_fd is not None:
+            os.close(self._consumer_lock_fd)
+            self._consumer_lock_fd = None
+
+    def _pump(self, now_ms: int) -> None:
+        assert self._reader is not None, "start() must run before claim()"
+        for record in self._reader.read(self.read_batch_size):
+            entry = self._new_entry(record.due_ms, record.payload.decode("ascii"), record.position)
+            self._unresolved.add(record.position)
+            if record.due_ms > now_ms:
+                self._reschedule(entry, record.due_ms)
+            else:
+                heapq.heappush(self._heap, entry)
+        for start_ms in sorted(self._buckets):
+            if start_ms > now_ms:
+                break
+            bucket = self._buckets[start_ms]
+            if bucket.loaded:
+                continue
+            bucket.loaded = True
+            for due_ms, payload in iter_file_records(self._bucket_path(start_ms)):
+                self._push(due_ms, payload.decode("ascii"), start_ms)
+                bucket.outstanding += 1
+            self._maybe_drop_bucket(start_ms)
+        self._commit_offset()
+
+    def _new_entry(self, due_ms: int, delivery_id: str, source: LogPosition | int) -> _Entry:
+        self._sequence += 1
+        return _Entry(due_ms, self._sequence, delivery_id, source)
+
+    def _push(self, due_ms: int, delivery_id: str, source: LogPosition | int) -> _Entry:
+        entry = self._new_entry(due_ms, delivery_id, source)
+        heapq.heappush(self._heap, entry)
+        return entry
+
+    def _reschedule(self, entry: _Entry, due_ms: int) -> None:
+        # Append to the retry index first, then let go of the old entry, so a crash in between
+        # leaves a duplicate rather than a gap.
+        self._schedule([(entry.delivery_id, due_ms)])
+        self._resolve(entry)
+
+    def _schedule(self, items: Sequence[tuple[str, int]]) -> None:
+        records_by_bucket: dict[int, list[tuple[str, int]]] = {}
+        for delivery_id, due_ms in items:
+            if self._scheduled.get(delivery_id) == due_ms:
+                continue
+            self._scheduled[delivery_id] = due_ms
+            self._scheduled.move_to_end(delivery_id)
+            records_by_bucket.setdefault(due_ms - due_ms % self.retry_bucket_ms, []).append((delivery_id, due_ms))
+        while len(self._scheduled) > self.scheduled_cache_size:
+            self._scheduled.popitem(last=False)
+
+        # One append per bucket file, however many records land in it.
+        for start_ms, records in records_by_bucket.items():
+            data = b"".join(encode_record(delivery_id.encode("ascii"), due_ms) for delivery_id, due_ms in records)
+            with open(self._bucket_path(start_ms), "ab") as handle:
+                handle.write(data)
+                if self.fsync:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+            bucket = self._buckets.get(start_ms)
+            if bucket is None:
+                bucket = self._buckets[start_ms] = _Bucket()
+                retry_index_gauge.set(len(self._buckets))
+            if bucket.loaded:
+                # Already read into memory, so the new records have to join the heap directly.
+                for delivery_id, due_ms in records:
+                    self._push(due_ms, delivery_id, start_ms)
+                bucket.outstanding += len(records)
+
+    def _resolve(self, entry: _Entry) -> None:
+        if isinstance(entry.source, LogPosition):
+            self._unresolved.discard(entry.source)
+        else:
+            bucket = self._buckets.get(entry.source)
+            if bucket is not None:
+                bucket.outstanding -= 1
+                self._maybe_drop_bucket(entry.source)
+
+    def _maybe_drop_bucket(self, start_ms: int) -> None:
+        bucket = self._buckets[start_ms]
+        if bucket.loaded and bucket.outstanding <= 0:
+            os.unlink(self._bucket_path(start_ms))
+            del self._buckets[start_ms]
+            retry_index_gauge.set(len(self._buckets))
+
+    def _commit_offset(self, *, force: bool = False) -> None:
+        assert self._reader is not None
+        low_water = min(self._unresolved) if self._unresolved else self._reader.position
+        if low_water == self._committed:
+            return
+        if not force and time.monotonic() - self._committed_at < self.offset_commit_interval_seconds:
+            return
+        self._offsets.store(low_water)
+        self._committed = low_water
+        self._committed_at = time.monotonic()
+        delete_segments_before(self.log_directory, low_water.segment)
+
+    async def _reconcile(self) -> None:
+        # Ingest commits the row before it appends to the log, so a crash in between leaves a
+        # pending row with no record. Sweeping pending rows into the retry index on start closes
+        # that gap; rows that already have a record just become harmless repeats.
+        after: tuple[datetime, str] | None = None
+        count = 0
+        while True:
+            async with async_session() as session:
+                rows = await list_pending_delivery_schedule(session, after=after, limit=self.read_batch_size)
+            if not rows:
+                break
+            self._schedule([(delivery_id, _epoch_ms(next_attempt_at)) for next_attempt_at, delivery_id in rows])
+            count += len(rows)
+            after = rows[-1]
+        logger.info("Reconciled %d pending deliveries into the local queue", count)
+
+    def _bucket_path(self, start_ms: int) -> str:
+        return os.path.join(self.retry_directory, f"{start_ms:015d}.log")
+
+
+def _epoch_ms(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return int(value.timestamp() * 1000)
+
+
+def build_delivery_queue() -> DeliveryQueue:
+    backend = settings.DELIVERY_QUEUE_BACKEND.strip().lower()
+    if backend == "mysql":
+        return MySqlDeliveryQueue()
+    if backend == "local_log":
+        return LocalLogDeliveryQueue(
+            settings.DELIVERY_QUEUE_LOG_DIR,
+            segment_bytes=settings.DELIVERY_QUEUE_LOG_SEGMENT_BYTES,
+            fsync=settings.DELIVERY_QUEUE_LOG_FSYNC,
+            retry_bucket_seconds=settings.DELIVERY_QUEUE_LOG_RETRY_BUCKET_SECONDS,
+            read_batch_size=settings.DELIVERY_QUEUE_LOG_READ_BATCH_SIZE,
+            reconcile_on_start=settings.DELIVERY_QUEUE_LOG_RECONCILE_ON_START,
+            scheduled_cache_size=settings.DELIVERY_QUEUE_LOG_SCHEDULED_CACHE_SIZE,
+        )
+    raise ValueError(f"Unknown DELIVERY_QUEUE_BACKEND {settings.DELIVERY_QUEUE_BACKEND!r}; use mysql or local_log.")
+
+
+delivery_queue = build_delivery_queue()
+
+
+async def publish_committed(entries: Sequence[QueuedDelivery]) -> None:
+    # The rows are already committed, so a failed publish must not fail (and get retried as) the
+    # write that created them. The local log's reconcile on start picks such rows up again.
+    try:
+        await delivery_queue.publish(entries)
+    except Exception:
+        publish_failures_counter.inc(len(entries))
+        logger.exception("Could not publish %d committed deliveries to the queue", len(entries))
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import math
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.repositories.delivery_replay_repository import (
+    count_dead_deliveries_for_webhook,
+    create_delivery_replay,
+    list_dead_delivery_keys_for_webhook,
+    lock_next_due_delivery_replay,
+    requeue_dead_deliveries,
+)
+from app.db.session import async_session
+from app.metrics import registry
+from app.models.delivery_replay import DeliveryReplay, DeliveryReplayStatus
+from app.services.delivery_queue import QueuedDelivery, publish_committed
+
+logger = logging.getLogger("delivery_replay")
+
+requeued_counter = registry.counter(
+    "delivery_replay_requeued_total",
+    "Permanently failed deliveries reset to pending by dead-letter replays.",
+)
+
+
+async def start_delivery_replay(
+    session: AsyncSession,
+    *,
+    user_id: str,
+    webhook_id: str,
+    created_from: datetime | None,
+    created_to: datetime | None,
+    rate_per_second: float | None,
+    chunk_size: int | None,
+) -> DeliveryReplay:
+    rate = rate_per_second or settings.DELIVERY_REPLAY_DEFAULT_RATE_PER_SECOND
+    if chunk_size is None:
+        # One chunk per poll keeps the requeue rate smooth instead of bursty.
+        chunk_size = math.ceil(rate * settings.DELIVERY_REPLAY_POLL_INTERVAL_SECONDS)
+    chunk_size = max(1, min(chunk_size, settings.DELIVERY_REPLAY_MAX_CHUNK_SIZE))
+
+    total_count = await count_dead_deliveries_for_webhook(
+        session,
+        webhook_id,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    return await create_delivery_replay(
+        session,
+        replay_id=str(uuid.uuid4()),
+        user_id=user_id,
+        webhook_id=webhook_id,
+        created_from=created_from,
+        created_to=created_to,
+        rate_per_second=rate,
+        chunk_size=chunk_size,
+        total_count=total_count,
+        next_run_at=datetime.now(UTC),
+    )
+
+
+async def run_delivery_replay_loop() -> None:
+    while True:
+        try:
+            while await replay_next_chunk():
+                pass
+        except Exception:
+            # Keep replaying even if a cycle fails unexpectedly.
+            logger.exception("Delivery replay cycle failed")
+
+        await asyncio.sleep(settings.DELIVERY_REPLAY_POLL_INTERVAL_SECONDS)
+
+
+async def replay_next_chunk() -> bool:
+    delivery_ids: list[str] = []
+    async with async_session() as session:
+        async with session.begin():
+            now = datetime.now(UTC)
+            replay = await lock_next_due_delivery_replay(session, now=now)
+            if replay is None:
+                return False
+
+            after = None
+            if replay.cursor_created_at is not None and replay.cursor_id is not None:
+                after = (replay.cursor_created_at, replay.cursor_id)
+            keys = await list_dead_delivery_keys_for_webhook(
+                session,
+                replay.webhook_id,
+                limit=replay.chunk_size,
+                after=after,
+                created_from=replay.created_from,
+                created_to=replay.created_to,
+            )
+            if keys:
+                delivery_ids = [delivery_id for _, delivery_id in keys]
+                requeued = await requeue_dead_deliveries(session, replay.webhook_id, delivery_ids, now=now)
+                requeued_counter.inc(requeued)
+                replay.replayed_count += requeued
+                replay.cursor_created_at, replay.cursor_id = keys[-1]
+
+            if len(keys) < replay.chunk_size:
+                replay.status = DeliveryReplayStatus.COMPLETED
+                replay.finished_at = now
+                logger.info("Delivery replay %s completed: %d requeued", replay.id, replay.replayed_count)
+            else:
+                replay.next_run_at = now + timedelta(seconds=replay.chunk_size / replay.rate_per_second)
+    # Ids that were not dead any more are published too; the worker drops them on claim.
+    await publish_committed([QueuedDelivery(delivery_id) for delivery_id in delivery_ids])
+    return True
@@ -1,55 +1,141 @@
 import asyncio
-import json
 import logging
 import random
-import uuid
+import time
+from contextlib import suppress
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import httpx
-from sqlalchemy import Select, func, or_, select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.db.ids import new_time_ordered_id
 from app.db.session import async_session
+from app.metrics import registry
 from app.models.delivery import Delivery, DeliveryStatus
 from app.models.delivery_attempt import DeliveryAttempt
-from app.models.webhook import Webhook
+from app.serialization import dumps_webhook_body
+from app.services.delivery_queue import DeliveryClaim, QueuedDelivery, delivery_queue, publish_committed
+from app.services.response_capture import build_attempt_response, response_capture_policy
 from app.services.signature import generate_hmac_sha256_signature
+from app.services.webhook_config_cache import webhook_config_cache
+from app.services.worker_membership import WorkerMembership, worker_membership_from_settings
+from app.tracing import UNSAMPLED, Span, SpanKind, parse_traceparent, tracer
 
 logger = logging.getLogger("delivery_worker")
 
+claims_released_counter = registry.counter(
+    "delivery_worker_claims_released_total",
+    "Claimed deliveries rolled back unfinished during shutdown so another worker can retry them.",
+)
+
 
 @dataclass
 class AttemptResult:
     succeeded: bool
     http_status: int | None
-    response_body: str | None
+    response_body: bytes | None
+
+
+async def run_worker(stop: asyncio.Event, force: asyncio.Event, *, grace_seconds: float) -> None:
+    await delivery_queue.start()
+    membership = worker_membership_from_settings() if delivery_queue.shardable else None
+    if membership is not None:
+        await membership.join()
+    try:
+        await _run_until_drained(stop, force, grace_seconds=grace_seconds, membership=membership)
+    finally:
+        # Leaving right away hands this worker's shards to the others without waiting for the TTL.
+        if membership is not None:
+            await membership.leave()
+        delivery_queue.close()
+
+
+async def _run_until_drained(
+    stop: asyncio.Event,
+    force: asyncio.Event,
+    *,
+    grace_seconds: float,
+    membership: WorkerMembership | None,
+) -> None:
+    # Once stop is set the loop claims nothing new; the attempt in flight gets grace_seconds (or
+    # until force is set) to finish and commit, after which it is cancelled and rolled back.
+    worker = asyncio.create_task(run_worker_loop(stop, membership=membership))
+    stopping = asyncio.create_task(stop.wait())
+    try:
+        await asyncio.wait({worker, stopping}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        stopping.cancel()
+    if worker.done():
+        await worker
+        return
+
+    logger.info("Draining: no new claims, waiting up to %.1fs for the attempt in flight", grace_seconds)
+    forced = asyncio.create_task(force.wait())
+    try:
+        await asyncio.wait({worker, forced}, timeout=grace_seconds, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        forced.cancel()
+    if not worker.done():
+        logger.warning("Drain did not finish in time; releasing unfinished claims")
+        worker.cancel()
+    with suppress(asyncio.CancelledError):
+        await worker
+    logger.info("Worker drained")
 
 
-async def run_worker_loop() -> None:
+async def run_worker_loop(
+    stop: asyncio.Event | None = None,
+    *,
+    membership: WorkerMembership | None = None,
+) -> None:
+    stop = stop or asyncio.Event()
     timeout = httpx.Timeout(settings.WORKER_HTTP_TIMEOUT_SECONDS)
     success_statuses = set(settings.WORKER_SUCCESS_STATUS_CODE_LIST)
 
     async with httpx.AsyncClient(timeout=timeout) as client:
-        while True:
+        while not stop.is_set():
             try:
-                while True:
-                    processed = await process_one_pending_delivery(
-                        client=client,
-                        success_statuses=success_statuses,
-                        max_attempts=settings.WORKER_MAX_DELIVERY_ATTEMPTS,
-                        min_backoff=settings.WORKER_MIN_BACKOFF_SECONDS,
-                        max_backoff=settings.WORKER_MAX_BACKOFF_SECONDS,
-                    )
-                    if not processed:
-                        break
+                # Shards that yielded a delivery on the previous pass get a claim of their own, so a
+                # backlog in one cannot starve the rest. Every other owned shard shares one claim, so
+                # an idle pass is a single query however many shards this worker owns. Ownership is
+                # re-read on every pass.
+                busy_shards: set[int] = set()
+                busy = True
+                while busy and not stop.is_set():
+                    shard_groups: list[list[int] | None] = [None]
+                    if membership:
+                        owned = membership.owned_shards()
+                        shard_groups = [[shard] for shard in owned if shard in busy_shards]
+                        quiet_shards = [shard for shard in owned if shard not in busy_shards]
+                        if quiet_shards:
+                            shard_groups.append(quiet_shards)
+                    busy_shards = set()
+                    busy = False
+                    for shards in shard_groups:
+                        if stop.is_set():
+                            break
+                        delivery = await process_one_pending_delivery(
+                            client=client,
+                            success_statuses=success_statuses,
+                            max_attempts=settings.WORKER_MAX_DELIVERY_ATTEMPTS,
+                            min_backoff=settings.WORKER_MIN_BACKOFF_SECONDS,
+                            max_backoff=settings.WORKER_MAX_BACKOFF_SECONDS,
+                            shards=shards,
+                        )
+                        if delivery is not None:
+                            busy = True
+                            if shards is not None:
+                                busy_shards.add(delivery.shard)
             except Exception:
                 # Keep polling even if a cycle fails unexpectedly.
                 logger.exception("Worker cycle failed")
 
-            await asyncio.sleep(settings.WORKER_POLL_INTERVAL_SECONDS)
+            with suppress(TimeoutError):
+                await asyncio.wait_for(stop.wait(), settings.WORKER_POLL_INTERVAL_SECONDS)
 
 
 async def process_one_pending_delivery(
@@ -59,71 +145,227 @@ async def process_one_pending_delivery(
     max_attempts: int,
     min_backoff: float,
     max_backoff: float,
-) -> bool:
+    shards: list[int] | None = None,
+) -> Delivery | None:
+    claim: DeliveryClaim | None = None
+    released_id: str | None = None
     async with async_session() as session:
-        async with session.begin():
-            delivery, webhook_url, webhook_secret = await _lock_next_delivery(session=session)
-            if delivery is None or webhook_url is None:
-                return False
-
-            attempt_number = await _next_attempt_number(session=session, delivery_id=delivery.id)
-            attempt_result = await _perform_http_attempt(
-                client=client,
-                webhook_url=webhook_url,
-                payload=delivery.payload,
-                webhook_secret=webhook_secret,
-                success_statuses=success_statuses,
-            )
+        try:
+            async with session.begin():
+                claim_started_ns = time.time_ns()
+                claim = await delivery_queue.claim(session, shards=shards)
+                if claim is None:
+                    return None
+                delivery = claim.delivery
+                if delivery.ordering_key is not None:
+                    await _defer_waiting_successors(delivery)
+                try:
+                    # Deliveries carry the ingest span's context, so every attempt joins the ingest
+                    # trace; those ingested unsampled are not traced here either.
+                    with tracer.start_span(
+                        "delivery_attempt",
+                        parent=parse_traceparent(delivery.trace_context) or UNSAMPLED,
+                        kind=SpanKind.CONSUMER,
+                        start_ns=claim_started_ns,
+                        attributes={"delivery.id": str(delivery.id), "webhook.id": delivery.webhook_id},
+                    ) as span:
+                        tracer.record_span("claim_delivery", start_ns=claim_started_ns, end_ns=time.time_ns())
+                        processed = await _attempt_delivery(
+                            session,
+                            delivery,
+                            span=span,
+                            client=client,
+                            success_statuses=success_statuses,
+                            max_attempts=max_attempts,
+                            min_backoff=min_backoff,
+                            max_backoff=max_backoff,
+                        )
+                    if delivery.ordering_key is not None and delivery.status != DeliveryStatus.PENDING:
+                        released_id = await _release_next_ordered_delivery(session, delivery)
+                except asyncio.CancelledError:
+                    # Leaving session.begin() rolls back, which drops the row lock and leaves the
+                    # delivery pending and due, so another worker claims it on its next poll.
+                    claims_released_counter.inc()
+                    logger.warning("Released claim on delivery %s before its attempt finished", delivery.id)
+                    raise
+        except BaseException:
+            if claim is not None:
+                delivery_queue.release(claim)
+            raise
+    # Only once the outcome is committed may the queue forget the entry or schedule its retry.
+    delivery_queue.settle(claim)
+    if released_id is not None:
+        await publish_committed([QueuedDelivery(released_id)])
+    return delivery if processed else None
 
-            session.add(
-                DeliveryAttempt(
-                    id=str(uuid.uuid4()),
-                    delivery_id=delivery.id,
-                    attempt_number=attempt_number,
-                    http_status=attempt_result.http_status,
-                    response_body=_truncate_response(attempt_result.response_body),
-                    attempted_at=datetime.now(UTC),
-                    succeeded=attempt_result.succeeded,
-                )
-            )
 
-            if attempt_result.succeeded:
-                delivery.status = DeliveryStatus.SUCCESS
-                delivery.next_attempt_at = None
-                return True
+async def _attempt_delivery(
+    session: AsyncSession,
+    delivery: Delivery,
+    *,
+    span: Span,
+    client: httpx.AsyncClient,
+    success_statuses: set[int],
+    max_attempts: int,
+    min_backoff: float,
+    max_backoff: float,
+) -> bool:
+    with tracer.start_span("webhook_config_cache.get"):
+        webhook = await webhook_config_cache.get(session, delivery.webhook_id)
+    if webhook is not None and not webhook.is_active:
+        # Paused: hold the delivery, and whatever waits behind its ordering key, without spending
+        # an attempt. It resumes within max_backoff of the webhook being reactivated.
+        delivery.next_attempt_at = datetime.now(UTC) + timedelta(seconds=max_backoff)
+        if delivery.ordering_key is not None:
+            await _defer_ordered_successors(session, delivery)
+        span.set_attribute("delivery.outcome", "webhook_inactive")
+        return True
+
+    attempt_number = await _next_attempt_number(session=session, delivery_id=delivery.id)
+    span.set_attribute("delivery.attempt_number", attempt_number)
+    if webhook is None:
+        # Deliveries are deleted with their webhook, so this is a row that outlived it somehow.
+        # It can never be delivered; left due, every poll would claim it again.
+        attempt_result = AttemptResult(succeeded=False, http_status=None, response_body=b"Webhook not found.")
+    else:
+        attempt_result = await _perform_http_attempt(
+            client=client,
+            webhook_url=webhook.url,
+            payload=delivery.payload,
+            webhook_secret=webhook.secret,
+            success_statuses=success_statuses,
+        )
+    if attempt_result.http_status is not None:
+        span.set_attribute("http.response.status_code", attempt_result.http_status)
+
+    attempt_id = new_time_ordered_id()
+    session.add(
+        DeliveryAttempt(
+            id=attempt_id,
+            delivery_id=delivery.id,
+            attempt_number=attempt_number,
+            http_status=attempt_result.http_status,
+            attempted_at=datetime.now(UTC),
+            succeeded=attempt_result.succeeded,
+        )
+    )
+    captured_response = build_attempt_response(
+        attempt_id,
+        attempt_result.response_body,
+        succeeded=attempt_result.succeeded,
+        sample_rate=webhook.response_sample_rate if webhook is not None else None,
+        policy=response_capture_policy,
+    )
+    if captured_response is not None:
+        session.add(captured_response)
+
+    if attempt_result.succeeded:
+        delivery.status = DeliveryStatus.SUCCESS
+        delivery.next_attempt_at = None
+        span.set_attribute("delivery.outcome", "success")
+        return True
+
+    # A dead-letter replay grants a fresh retry budget on top of the attempts already made.
+    budget_used = attempt_number - delivery.attempts_before_replay
+    if budget_used >= max_attempts or webhook is None:
+        delivery.status = DeliveryStatus.PERMANENTLY_FAILED
+        delivery.next_attempt_at = None
+        span.set_attribute("delivery.outcome", "permanently_failed")
+        return True
+
+    delay_seconds = _compute_backoff_seconds(
+        attempt_number=budget_used,
+        min_backoff=min_backoff,
+        max_backoff=max_backoff,
+    )
+    delivery.status = DeliveryStatus.PENDING
+    delivery.next_attempt_at = datetime.now(UTC) + timedelta(seconds=delay_seconds)
+    if delivery.ordering_key is not None:
+        await _defer_ordered_successors(session, delivery)
+    span.set_attribute("delivery.outcome", "retry_scheduled")
+    span.set_attribute("delivery.retry_in_seconds", round(delay_seconds, 3))
+    return True
+
+
+async def _defer_ordered_successors(session: AsyncSession, delivery: Delivery) -> None:
+    # Later deliveries for the key cannot run before this retry does, so move them out of the
+    # due range instead of having every claim step over them until then.
+    statement = (
+        update(Delivery)
+        .where(
+            Delivery.webhook_id == delivery.webhook_id,
+            Delivery.ordering_key == delivery.ordering_key,
+            Delivery.status == DeliveryStatus.PENDING,
+            Delivery.id > delivery.id,
+            Delivery.next_attempt_at < delivery.next_attempt_at,
+        )
+        .values(next_attempt_at=delivery.next_attempt_at, ordering_deferred=True)
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(statement)
 
-            if attempt_number >= max_attempts:
-                delivery.status = DeliveryStatus.PERMANENTLY_FAILED
-                delivery.next_attempt_at = None
-                return True
 
-            delay_seconds = _compute_backoff_seconds(
-                attempt_number=attempt_number,
-                min_backoff=min_backoff,
-                max_backoff=max_backoff,
+async def _defer_waiting_successors(delivery: Delivery) -> None:
+    # While this delivery is in flight every claim would step over the due deliveries queued
+    # behind it for the same key, so move them out of the due range until it finishes. This
+    # commits on its own so other workers see it during the attempt. Rows another transaction
+    # holds are skipped; they stay due and get deferred by a later head. If nothing releases
+    # them (a crashed worker), they fall due again after WORKER_ORDERING_DEFER_SECONDS.
+    now = datetime.now(UTC)
+    # Whole seconds, so the value round-trips through DATETIME unchanged.
+    deferred_until = (now + timedelta(seconds=settings.WORKER_ORDERING_DEFER_SECONDS)).replace(microsecond=0)
+    try:
+        async with async_session() as session, session.begin():
+            result = await session.execute(
+                select(Delivery.id)
+                .where(
+                    Delivery.webhook_id == delivery.webhook_id,
+                    Delivery.ordering_key == delivery.ordering_key,
+                    Delivery.status == DeliveryStatus.PENDING,
+                    Delivery.id > delivery.id,
+                    Delivery.next_attempt_at <= now,
+                )
+                .with_for_update(skip_locked=True)
             )
-            delivery.status = DeliveryStatus.PENDING
-            delivery.next_attempt_at = datetime.now(UTC) + timedelta(seconds=delay_seconds)
-            return True
+            waiting_ids = list(result.scalars().all())
+            if waiting_ids:
+                await session.execute(
+                    update(Delivery)
+                    .where(Delivery.id.in_(waiting_ids))
+                    .values(next_attempt_at=deferred_until, ordering_deferred=True)
+                    .execution_options(synchronize_session=False)
+                )
+    except Exception:
+        # Only an optimisation: the claim's ordering check still holds the successors back.
+        logger.exception("Could not defer deliveries waiting behind %s", delivery.id)
 
 
-async def _lock_next_delivery(session: AsyncSession) -> tuple[Delivery | None, str | None, str | None]:
-    statement: Select[tuple[Delivery, str, str | None]] = (
-        select(Delivery, Webhook.url, Webhook.secret)
-        .join(Webhook, Webhook.id == Delivery.webhook_id)
+async def _release_next_ordered_delivery(session: AsyncSession, delivery: Delivery) -> str | None:
+    # A locking read, so it sees deferrals committed after this transaction's snapshot was taken.
+    result = await session.execute(
+        select(Delivery.id, Delivery.ordering_deferred)
         .where(
+            Delivery.webhook_id == delivery.webhook_id,
+            Delivery.ordering_key == delivery.ordering_key,
             Delivery.status == DeliveryStatus.PENDING,
-            or_(Delivery.next_attempt_at.is_(None), Delivery.next_attempt_at <= func.now()),
+            Delivery.id > delivery.id,
         )
-        .order_by(Delivery.created_at.asc())
+        .order_by(Delivery.id.asc())
         .limit(1)
-        .with_for_update(skip_locked=True)
+        .with_for_update()
     )
-    result = await session.execute(statement)
     row = result.first()
-    if row is None:
-        return None, None, None
-    return row[0], row[1], row[2]
+    if row is None or not row.ordering_deferred:
+        return None
+    # Only rows that were already due (or behind a retry that has now finished) are ever
+    # deferred, so making the next one due now never runs it before its scheduled time.
+    await session.execute(
+        update(Delivery)
+        .where(Delivery.id == row.id)
+        .values(next_attempt_at=datetime.now(UTC), ordering_deferred=False)
+        .execution_options(synchronize_session=False)
+    )
+    return row.id
 
 
 async def _next_attempt_number(session: AsyncSession, delivery_id: str) -> int:
@@ -141,19 +383,26 @@ async def _perform_http_attempt(
     webhook_secret: str | None,
     success_statuses: set[int],
 ) -> AttemptResult:
-    raw_payload = json.dumps(payload)
-    headers = {"Content-Type": "application/json"}
-    if webhook_secret:
-        signature = generate_hmac_sha256_signature(raw_payload=raw_payload, secret=webhook_secret)
-        headers["X-Hub-Signature-256"] = f"sha256={signature}"
-
     try:
-        response = await client.post(
-            webhook_url,
-            content=raw_payload,
-            headers=headers,
-        )
-        body = response.text if response.text else None
+        # Inside the try so a payload that cannot be encoded records a failed attempt instead of
+        # rolling back and being claimed again on every poll.
+        with tracer.start_span("sign_payload") as sign_span:
+            raw_payload = dumps_webhook_body(payload)
+            headers = {"Content-Type": "application/json"}
+            if webhook_secret:
+                signature = generate_hmac_sha256_signature(raw_payload=raw_payload, secret=webhook_secret)
+                headers["X-Hub-Signature-256"] = f"sha256={signature}"
+            sign_span.set_attribute("payload.bytes", len(raw_payload))
+
+        with tracer.start_span("POST", kind=SpanKind.CLIENT) as post_span:
+            if post_span.recording:
+                post_span.set_attribute("http.request.method", "POST")
+                post_span.set_attribute("server.address", httpx.URL(webhook_url).host)
+            async with client.stream("POST", webhook_url, content=raw_payload, headers=headers) as response:
+                post_span.set_attribute("http.response.status_code", response.status_code)
+                # One byte past the capture limit is enough to tell that the body was truncated;
+                # the rest is never read, however large (or endless) the response is.
+                body = await _read_body_prefix(response, response_capture_policy.max_bytes + 1) or None
         return AttemptResult(
             succeeded=response.status_code in success_statuses,
             http_status=response.status_code,
@@ -164,21 +413,26 @@ async def _perform_http_attempt(
         return AttemptResult(
             succeeded=False,
             http_status=None,
-            response_body=str(exc),
+            response_body=str(exc).encode("utf-8"),
         )
     except Exception as exc:
         logger.exception("Unexpected delivery attempt error for url=%s", webhook_url)
         return AttemptResult(
             succeeded=False,
             http_status=None,
-            response_body=str(exc),
+            response_body=str(exc).encode("utf-8"),
         )
 
 
-def _truncate_response(response_body: str | None) -> str | None:
-    if response_body is None:
-        return None
-    return response_body[:500]
+async def _read_body_prefix(response: httpx.Response, limit: int) -> bytes:
+    chunks: list[bytes] = []
+    size = 0
+    async for chunk in response.aiter_bytes():
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return b"".join(chunks)[:limit]
 
 
 def _compute_backoff_seconds(*, attempt_number: int, min_backoff: float, max_backoff: float) -> float:
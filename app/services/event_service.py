@@ -0,0 +1,147 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.repositories.delivery_repository import create_pending_deliveries_for_event
+from app.db.repositories.idempotency_repository import (
+    IdempotencyRecord,
+    delete_expired_idempotency_key,
+    get_idempotency_record,
+)
+from app.schemas.event import EventIngestRequest
+from app.services.delivery_queue import QueuedDelivery, publish_committed
+from app.tracing import SpanKind, tracer
+
+
+@dataclass
+class IngestResult:
+    delivery_ids: list[str]
+    replayed: bool
+
+
+def event_request_hash(request: EventIngestRequest) -> str:
+    canonical = json.dumps(request.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def idempotency_scope(user_id: str | None) -> str:
+    return user_id or ""
+
+
+def replay_idempotent_request(record: IdempotencyRecord, *, request_hash: str | None) -> IngestResult:
+    # Keys stored before request hashes were recorded replay without the check.
+    if record.request_hash is not None and request_hash is not None and record.request_hash != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request body.",
+        )
+    return IngestResult(delivery_ids=record.delivery_ids, replayed=True)
+
+
+def scheduled_delivery_time(*, deliver_at: datetime | None, delay_seconds: float | None) -> datetime | None:
+    now = datetime.now(UTC)
+    if delay_seconds is not None:
+        return now + timedelta(seconds=delay_seconds)
+    if deliver_at is None:
+        return None
+    # Claims run in next_attempt_at order, so a past time would jump ahead of everyone's due work.
+    return max(deliver_at, now)
+
+
+async def queue_event(
+    session: AsyncSession,
+    *,
+    event_type: str,
+    payload: dict[str, Any],
+    idempotency_key: str | None = None,
+    request_hash: str | None = None,
+    deliver_at: datetime | None = None,
+    ordering_key: str | None = None,
+    user_id: str | None = None,
+) -> IngestResult:
+    with tracer.start_span(
+        "queue_event",
+        kind=SpanKind.PRODUCER,
+        attributes={"event.type": event_type, "event.idempotent": idempotency_key is not None},
+    ) as span:
+        result = await _queue_event(
+            session,
+            event_type=event_type,
+            payload=payload,
+            idempotency_key=idempotency_key,
+            request_hash=request_hash,
+            trace_context=tracer.current_traceparent(),
+            deliver_at=deliver_at,
+            ordering_key=ordering_key,
+            user_id=user_id,
+        )
+        if not result.replayed:
+            await publish_committed(
+                [QueuedDelivery(delivery_id, deliver_at) for delivery_id in result.delivery_ids]
+            )
+        span.set_attribute("event.delivery_count", len(result.delivery_ids))
+        span.set_attribute("event.replayed", result.replayed)
+        return result
+
+
+async def _queue_event(
+    session: AsyncSession,
+    *,
+    event_type: str,
+    payload: dict[str, Any],
+    idempotency_key: str | None,
+    request_hash: str | None,
+    trace_context: str | None,
+    deliver_at: datetime | None,
+    ordering_key: str | None,
+    user_id: str | None,
+) -> IngestResult:
+    if idempotency_key is None:
+        deliveries = await create_pending_deliveries_for_event(
+            session=session,
+            event_type=event_type,
+            payload=payload,
+            trace_context=trace_context,
+            deliver_at=deliver_at,
+            ordering_key=ordering_key,
+            user_id=user_id,
+        )
+        return IngestResult(delivery_ids=[delivery.id for delivery in deliveries], replayed=False)
+
+    now = datetime.now(UTC)
+    scope = idempotency_scope(user_id)
+    existing = await get_idempotency_record(session, idempotency_key, scope=scope, now=now)
+    if existing is not None:
+        return replay_idempotent_request(existing, request_hash=request_hash)
+
+    await delete_expired_idempotency_key(session, idempotency_key, scope=scope, now=now)
+    try:
+        deliveries = await create_pending_deliveries_for_event(
+            session=session,
+            event_type=event_type,
+            payload=payload,
+            idempotency_key=idempotency_key,
+            idempotency_scope=scope,
+            idempotency_request_hash=request_hash,
+            idempotency_expires_at=now + timedelta(seconds=settings.EVENT_IDEMPOTENCY_TTL_SECONDS),
+            trace_context=trace_context,
+            deliver_at=deliver_at,
+            ordering_key=ordering_key,
+            user_id=user_id,
+        )
+    except IntegrityError:
+        # A concurrent request with the same key committed first; return its deliveries.
+        await session.rollback()
+        existing = await get_idempotency_record(session, idempotency_key, scope=scope, now=now)
+        if existing is None:
+            raise
+        return replay_idempotent_request(existing, request_hash=request_hash)
+
+    return IngestResult(delivery_ids=[delivery.id for delivery in deliveries], replayed=False)
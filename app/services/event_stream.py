@@ -0,0 +1,177 @@
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.repositories.delivery_repository import PendingEvent, add_pending_deliveries_for_events
+from app.schemas.event import EventIngestRequest
+from app.services.api_key_service import IngestCredential, charge_ingest_events
+from app.services.delivery_queue import QueuedDelivery, publish_committed
+from app.services.event_service import scheduled_delivery_time
+from app.services.rate_limiter import RateLimitDecision
+from app.tracing import tracer
+
+logger = logging.getLogger("event_stream")
+
+
+@dataclass
+class StreamLineError:
+    line: int
+    error: str
+
+
+@dataclass
+class StreamIngestSummary:
+    accepted: int = 0
+    rejected: int = 0
+    queued_count: int = 0
+    errors: list[StreamLineError] = field(default_factory=list)
+    errors_truncated: bool = False
+    # Every line up to and including this one is committed or rejected; a client resumes after it.
+    committed_through_line: int = 0
+
+
+class StreamIngestInterrupted(Exception):
+    # Chunks before the failure stay committed; summary.committed_through_line tells the client
+    # which line to resend from instead of replaying (and duplicating) the whole stream.
+    def __init__(self, summary: StreamIngestSummary, message: str) -> None:
+        super().__init__(message)
+        self.summary = summary
+
+
+class StreamIngestThrottled(StreamIngestInterrupted):
+    def __init__(self, summary: StreamIngestSummary, decision: RateLimitDecision) -> None:
+        super().__init__(summary, "Rate limit exceeded for this API key.")
+        self.decision = decision
+
+
+class _LineTooLong(Exception):
+    pass
+
+
+async def ingest_ndjson_stream(
+    session: AsyncSession,
+    body: AsyncIterator[bytes],
+    *,
+    credential: IngestCredential | None,
+    chunk_size: int,
+    max_line_bytes: int,
+    max_errors: int,
+) -> StreamIngestSummary:
+    summary = StreamIngestSummary()
+    pending: list[PendingEvent] = []
+    trace_context = tracer.current_traceparent()
+
+    def reject(line_number: int, message: str) -> None:
+        summary.rejected += 1
+        if len(summary.errors) < max_errors:
+            summary.errors.append(StreamLineError(line=line_number, error=message))
+        else:
+            summary.errors_truncated = True
+
+    async def flush() -> None:
+        if not pending:
+            return
+        try:
+            with tracer.start_span("ingest_ndjson_stream.flush", attributes={"event.count": len(pending)}):
+                delivery_ids_by_event = await add_pending_deliveries_for_events(session, pending)
+                await session.commit()
+        except Exception as exc:
+            logger.exception("NDJSON ingest stopped after line %d", summary.committed_through_line)
+            await session.rollback()
+            raise StreamIngestInterrupted(summary, "Ingest stopped partway through the stream.") from exc
+        await publish_committed(
+            [
+                QueuedDelivery(delivery_id, event.deliver_at)
+                for event, delivery_ids in zip(pending, delivery_ids_by_event)
+                for delivery_id in delivery_ids
+            ]
+        )
+        summary.accepted += len(pending)
+        summary.queued_count += sum(len(delivery_ids) for delivery_ids in delivery_ids_by_event)
+        pending.clear()
+
+    line_number = 0
+    async for line in _iter_lines(body, max_line_bytes=max_line_bytes):
+        line_number += 1
+        if isinstance(line, _LineTooLong):
+            reject(line_number, f"Line exceeds {max_line_bytes} bytes.")
+            continue
+        if not line.strip():
+            continue
+
+        try:
+            event = EventIngestRequest.model_validate_json(line)
+        except ValidationError as exc:
+            reject(line_number, _format_validation_error(exc))
+            continue
+
+        if credential is not None:
+            # Charged per event, so one large body cannot get past the key's rate limit.
+            decision = charge_ingest_events(credential, events=1)
+            if not decision.allowed:
+                await flush()
+                summary.committed_through_line = line_number - 1
+                raise StreamIngestThrottled(summary, decision)
+
+        pending.append(
+            PendingEvent(
+                event_type=event.event_type,
+                payload=event.payload,
+                trace_context=trace_context,
+                deliver_at=scheduled_delivery_time(deliver_at=event.deliver_at, delay_seconds=event.delay_seconds),
+                ordering_key=event.ordering_key,
+                user_id=credential.user_id if credential is not None else None,
+            )
+        )
+        if len(pending) >= chunk_size:
+            await flush()
+            summary.committed_through_line = line_number
+
+    await flush()
+    summary.committed_through_line = line_number
+    return summary
+
+
+async def _iter_lines(
+    body: AsyncIterator[bytes], *, max_line_bytes: int
+) -> AsyncIterator[bytes | _LineTooLong]:
+    buffer = bytearray()
+    oversized = False
+    async for chunk in body:
+        start = 0
+        while True:
+            newline = chunk.find(b"\n", start)
+            if newline == -1:
+                break
+            if not oversized and len(buffer) + newline - start <= max_line_bytes:
+                buffer.extend(chunk[start:newline])
+                yield bytes(buffer)
+            else:
+                yield _LineTooLong()
+            buffer.clear()
+            oversized = False
+            start = newline + 1
+
+        if not oversized:
+            buffer.extend(chunk[start:])
+            if len(buffer) > max_line_bytes:
+                # Drop the rest of this line instead of buffering it.
+                buffer.clear()
+                oversized = True
+
+    if oversized:
+        yield _LineTooLong()
+    elif buffer:
+        yield bytes(buffer)
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    messages: list[str] = []
+    for error in exc.errors(include_url=False):
+        location = ".".join(str(part) for part in error["loc"])
+        messages.append(f"{location}: {error['msg']}" if location else error["msg"])
+    return "; ".join(messages)
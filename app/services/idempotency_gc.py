@@ -0,0 +1,36 @@
+import asyncio
+import logging
+from datetime import UTC, datetime
+
+from app.config import settings
+from app.db.repositories.idempotency_repository import delete_expired_idempotency_keys
+from app.db.session import async_session
+
+logger = logging.getLogger("idempotency_gc")
+
+
+async def run_idempotency_gc_loop() -> None:
+    while True:
+        try:
+            deleted = await purge_expired_idempotency_keys(batch_size=settings.EVENT_IDEMPOTENCY_GC_BATCH_SIZE)
+            if deleted:
+                logger.info("Purged %d expired idempotency keys", deleted)
+        except Exception:
+            # Keep collecting even if a cycle fails unexpectedly.
+            logger.exception("Idempotency key GC cycle failed")
+
+        await asyncio.sleep(settings.EVENT_IDEMPOTENCY_GC_INTERVAL_SECONDS)
+
+
+async def purge_expired_idempotency_keys(*, batch_size: int) -> int:
+    total = 0
+    while True:
+        async with async_session() as session:
+            deleted = await delete_expired_idempotency_keys(
+                session,
+                now=datetime.now(UTC),
+                limit=batch_size,
+            )
+        total += deleted
+        if deleted < batch_size:
+            return total
@@ -0,0 +1,297 @@
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from fastapi import HTTPException
+
+from app.config import settings
+from app.db.repositories.delivery_repository import PendingEvent, add_pending_deliveries_for_events
+from app.db.repositories.idempotency_repository import (
+    IdempotencyRecord,
+    delete_expired_idempotency_keys_by_key,
+    get_idempotency_records,
+    insert_idempotency_keys,
+)
+from app.db.session import async_session
+from app.services.delivery_queue import QueuedDelivery, publish_committed
+from app.services.event_service import IngestResult, idempotency_scope, queue_event, replay_idempotent_request
+from app.metrics import registry
+from app.tracing import UNSAMPLED, SpanContext, SpanKind, tracer
+
+logger = logging.getLogger("ingest_batcher")
+
+batch_size_histogram = registry.histogram(
+    "event_ingest_group_commit_batch_size",
+    "Number of ingest requests written per group commit.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024),
+)
+flush_seconds_histogram = registry.histogram(
+    "event_ingest_group_commit_flush_seconds",
+    "Time spent writing and committing one ingest group.",
+)
+fallback_counter = registry.counter(
+    "event_ingest_group_commit_fallbacks_total",
+    "Groups that failed to commit and were retried one request at a time.",
+)
+
+
+@dataclass
+class _PendingIngest:
+    event_type: str
+    payload: dict[str, Any]
+    idempotency_key: str | None
+    future: asyncio.Future[IngestResult] = field(repr=False)
+    request_hash: str | None = None
+    trace_context: SpanContext | None = None
+    deliver_at: datetime | None = None
+    ordering_key: str | None = None
+    user_id: str | None = None
+
+
+class IngestBatcher:
+    def __init__(self, *, max_batch_size: int, max_wait_seconds: float) -> None:
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self._queue: asyncio.Queue[_PendingIngest | None] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None or self._queue is None:
+            return
+        # The sentinel is queued behind any waiting requests, so they are flushed before exit.
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    async def submit(
+        self,
+        *,
+        event_type: str,
+        payload: dict[str, Any],
+        idempotency_key: str | None = None,
+        request_hash: str | None = None,
+        deliver_at: datetime | None = None,
+        ordering_key: str | None = None,
+        user_id: str | None = None,
+    ) -> IngestResult:
+        if not self.running or self._queue is None:
+            raise RuntimeError("Ingest batcher is not running.")
+
+        future: asyncio.Future[IngestResult] = asyncio.get_running_loop().create_future()
+        with tracer.start_span(
+            "queue_event",
+            kind=SpanKind.PRODUCER,
+            attributes={"event.type": event_type, "event.idempotent": idempotency_key is not None},
+        ) as span:
+            await self._queue.put(
+                _PendingIngest(
+                    event_type=event_type,
+                    payload=payload,
+                    idempotency_key=idempotency_key,
+                    future=future,
+                    request_hash=request_hash,
+                    trace_context=span.context if span.recording else None,
+                    deliver_at=deliver_at,
+                    ordering_key=ordering_key,
+                    user_id=user_id,
+                )
+            )
+            result = await future
+            span.set_attribute("event.delivery_count", len(result.delivery_ids))
+            span.set_attribute("event.replayed", result.replayed)
+            return result
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            deadline = loop.time() + self.max_wait_seconds
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                try:
+                    if remaining > 0:
+                        item = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except (TimeoutError, asyncio.QueueEmpty):
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[_PendingIngest]) -> None:
+        batch_size_histogram.observe(len(batch))
+        # A group is traced when any of its requests was; it links to every sampled request.
+        sampled = [item.trace_context for item in batch if item.trace_context is not None]
+        started = time.perf_counter()
+        with tracer.start_span(
+            "ingest_batcher.flush",
+            parent=sampled[0] if sampled else UNSAMPLED,
+            links=sampled[1:],
+            attributes={"batch.size": len(batch)},
+        ) as span:
+            try:
+                results, queued = await _write_batch(batch)
+            except Exception as exc:
+                span.set_error(f"{type(exc).__name__}: {exc}")
+                fallback_counter.inc()
+                logger.exception("Group commit of %d ingest requests failed; retrying individually", len(batch))
+                await _write_individually(batch)
+                return
+            finally:
+                flush_seconds_histogram.observe(time.perf_counter() - started)
+
+        # Outside the try: once the group is committed, nothing may send it down the fallback.
+        await publish_committed(queued)
+        for item, result in zip(batch, results):
+            if item.future.done():
+                continue
+            if isinstance(result, Exception):
+                item.future.set_exception(result)
+            else:
+                item.future.set_result(result)
+
+
+async def _write_batch(
+    batch: list[_PendingIngest],
+) -> tuple[list[IngestResult | Exception], list[QueuedDelivery]]:
+    async with async_session() as session:
+        now = datetime.now(UTC)
+        keys = sorted({key for item in batch if (key := _scoped_key(item)) is not None})
+        known_keys = await get_idempotency_records(session, keys, now=now)
+        await delete_expired_idempotency_keys_by_key(
+            session,
+            [key for key in keys if key not in known_keys],
+            now=now,
+        )
+
+        pending_indexes: list[int] = []
+        first_index_by_key: dict[tuple[str, str], int] = {}
+        for index, item in enumerate(batch):
+            key = _scoped_key(item)
+            if key is None or (key not in known_keys and key not in first_index_by_key):
+                pending_indexes.append(index)
+                if key is not None:
+                    first_index_by_key[key] = index
+
+        delivery_ids_by_event = await add_pending_deliveries_for_events(
+            session,
+            [
+                PendingEvent(
+                    event_type=batch[index].event_type,
+                    payload=batch[index].payload,
+                    trace_context=_traceparent(batch[index].trace_context),
+                    deliver_at=batch[index].deliver_at,
+                    ordering_key=batch[index].ordering_key,
+                    user_id=batch[index].user_id,
+                )
+                for index in pending_indexes
+            ],
+        )
+        created = dict(zip(pending_indexes, delivery_ids_by_event))
+
+        expires_at = now + timedelta(seconds=settings.EVENT_IDEMPOTENCY_TTL_SECONDS)
+        await insert_idempotency_keys(
+            session,
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "scope": scope,
+                    "key": key,
+                    "request_hash": batch[index].request_hash,
+                    "delivery_ids": created[index],
+                    "expires_at": expires_at,
+                }
+                for (scope, key), index in first_index_by_key.items()
+            ],
+        )
+        await session.commit()
+    queued = [
+        QueuedDelivery(delivery_id, batch[index].deliver_at)
+        for index, delivery_ids in created.items()
+        for delivery_id in delivery_ids
+    ]
+
+    results: list[IngestResult | Exception] = []
+    for index, item in enumerate(batch):
+        key = _scoped_key(item)
+        if index in created:
+            results.append(IngestResult(delivery_ids=created[index], replayed=False))
+            continue
+        assert key is not None
+        if key in known_keys:
+            record = known_keys[key]
+        else:
+            # A later request in the same group reused a key; it replays the first one.
+            first = batch[first_index_by_key[key]]
+            record = IdempotencyRecord(created[first_index_by_key[key]], first.request_hash)
+        try:
+            results.append(replay_idempotent_request(record, request_hash=item.request_hash))
+        except HTTPException as exc:
+            results.append(exc)
+    return results, queued
+
+
+def _scoped_key(item: _PendingIngest) -> tuple[str, str] | None:
+    if item.idempotency_key is None:
+        return None
+    return idempotency_scope(item.user_id), item.idempotency_key
+
+
+def _traceparent(context: SpanContext | None) -> str | None:
+    return context.traceparent if context is not None else None
+
+
+async def _write_individually(batch: list[_PendingIngest]) -> None:
+    for item in batch:
+        if item.future.done():
+            continue
+        try:
+            with tracer.start_span("ingest_batcher.retry", parent=item.trace_context or UNSAMPLED):
+                async with async_session() as session:
+                    result = await queue_event(
+                        session=session,
+                        event_type=item.event_type,
+                        payload=item.payload,
+                        idempotency_key=item.idempotency_key,
+                        request_hash=item.request_hash,
+                        deliver_at=item.deliver_at,
+                        ordering_key=item.ordering_key,
+                        user_id=item.user_id,
+                    )
+        except Exception as exc:
+            if not item.future.done():
+                item.future.set_exception(exc)
+        else:
+            if not item.future.done():
+                item.future.set_result(result)
+
+
+ingest_batcher = IngestBatcher(
+    max_batch_size=settings.EVENT_INGEST_GROUP_COMMIT_MAX_BATCH_SIZE,
+    max_wait_seconds=settings.EVENT_INGEST_GROUP_COMMIT_MAX_WAIT_MS / 1000,
+)
@@ -1,7 +1,44 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
 from passlib.context import CryptContext
 
+from app.config import settings
+from app.metrics import registry
+
+T = TypeVar("T")
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL while hashing, so a small thread pool gives real parallelism
+# without blocking the event loop.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+_pending = 0
+
+pending_gauge = registry.gauge(
+    "password_hash_pending",
+    "Password hash/verify calls running or queued in the hashing pool.",
+)
+rejected_counter = registry.counter(
+    "password_hash_rejected_total",
+    "Password hash/verify calls rejected because the hashing queue was full.",
+)
+duration_histogram = registry.histogram(
+    "password_hash_seconds",
+    "Time from submitting a password hash/verify call to its completion, including queueing.",
+    ("operation",),
+)
+
+
+class PasswordHasherBusyError(Exception):
+    pass
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -9,3 +46,28 @@ def hash_password(password: str) -> str:
 
 def verify_password(password: str, hashed_password: str) -> bool:
     return pwd_context.verify(password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_pool("hash", hash_password, password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    return await _run_in_pool("verify", verify_password, password, hashed_password)
+
+
+async def _run_in_pool(operation: str, func: Callable[..., T], *args: str) -> T:
+    global _pending
+    if _pending >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+        rejected_counter.inc()
+        raise PasswordHasherBusyError()
+
+    _pending += 1
+    pending_gauge.set(_pending)
+    started = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        _pending -= 1
+        pending_gauge.set(_pending)
+        duration_histogram.observe(time.perf_counter() - started, operation=operation)
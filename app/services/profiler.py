@@ -0,0 +1,148 @@
+import asyncio
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import Enum
+from types import CodeType, FrameType
+
+# Leaf frames that mean a thread is parked rather than doing work.
+_IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+_lock = threading.Lock()
+
+
+class ProfileMode(str, Enum):
+    CPU = "cpu"
+    WALL = "wall"
+
+
+class ProfilerBusyError(Exception):
+    pass
+
+
+class ProfilerUnavailableError(Exception):
+    pass
+
+
+@dataclass
+class StackProfile:
+    mode: ProfileMode
+    interval_seconds: float
+    include_idle: bool
+    samples: int = 0
+    stacks: Counter[str] = field(default_factory=Counter)
+    # Stacks counted per thread ident while sampling; name_threads() folds them into stacks.
+    thread_stacks: Counter[tuple[int, str]] = field(default_factory=Counter)
+
+    def add_frames(self, frames: dict[int, FrameType], *, skip_ident: int | None = None) -> None:
+        # Called from the SIGPROF handler, so it must not take any lock the interrupted code may
+        # hold; threading.enumerate() does, which is why threads are named afterwards.
+        for ident, frame in frames.items():
+            if ident == skip_ident:
+                continue
+            top = frame.f_code
+            if not self.include_idle and (os.path.basename(top.co_filename), top.co_name) in _IDLE_LEAVES:
+                continue
+            names: list[str] = []
+            current: FrameType | None = frame
+            while current is not None:
+                names.append(_frame_label(current.f_code))
+                current = current.f_back
+            names.reverse()
+            self.thread_stacks[(ident, ";".join(names))] += 1
+        self.samples += 1
+
+    def name_threads(self, thread_names: dict[int, str]) -> None:
+        for (ident, stack), count in self.thread_stacks.items():
+            name = thread_names.get(ident, f"thread-{ident}").replace(";", ":")
+            self.stacks[f"{name};{stack}"] += count
+        self.thread_stacks.clear()
+
+    def folded(self) -> str:
+        # Brendan Gregg's collapsed-stack format, as read by flamegraph.pl and speedscope.
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+async def record_profile(
+    *,
+    mode: ProfileMode,
+    seconds: float,
+    interval_seconds: float,
+    include_idle: bool = False,
+) -> StackProfile:
+    if not _lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already being recorded.")
+    try:
+        profile = StackProfile(mode=mode, interval_seconds=interval_seconds, include_idle=include_idle)
+        if mode is ProfileMode.CPU:
+            await _record_cpu(profile, seconds)
+        else:
+            await asyncio.to_thread(_record_wall, profile, seconds)
+        return profile
+    finally:
+        _lock.release()
+
+
+async def _record_cpu(profile: StackProfile, seconds: float) -> None:
+    # SIGPROF fires per interval of process CPU time and its handler runs on the main thread
+    # between bytecodes, so the event loop is caught mid-work rather than only where it happens
+    # to release the GIL (which is all a sampling thread gets to see).
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        raise ProfilerUnavailableError("CPU profiling needs SIGPROF on the main thread.")
+
+    main_ident = threading.get_ident()
+
+    def on_signal(signum: int, frame: FrameType | None) -> None:
+        frames = sys._current_frames()
+        if frame is not None:
+            frames[main_ident] = frame
+        profile.add_frames(frames)
+
+    # Threads are named outside the handler: once before the timer starts and again after it
+    # stops, which also covers threads that started while sampling.
+    thread_names = _thread_names()
+    previous = signal.signal(signal.SIGPROF, on_signal)
+    signal.setitimer(signal.ITIMER_PROF, profile.interval_seconds, profile.interval_seconds)
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, previous)
+        profile.name_threads(thread_names | _thread_names())
+
+
+def _record_wall(profile: StackProfile, seconds: float) -> None:
+    own_ident = threading.get_ident()
+    thread_names = _thread_names()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        profile.add_frames(sys._current_frames(), skip_ident=own_ident)
+        time.sleep(profile.interval_seconds)
+    profile.name_threads(thread_names | _thread_names())
+
+
+def _thread_names() -> dict[int, str]:
+    return {thread.ident: thread.name for thread in threading.enumerate() if thread.ident is not None}
+
+
+def _frame_label(code: CodeType) -> str:
+    return f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _short_path(filename: str) -> str:
+    site_packages = filename.rfind("site-packages" + os.sep)
+    if site_packages != -1:
+        return filename[site_packages + len("site-packages" + os.sep) :]
+    app_package = filename.rfind(os.sep + "app" + os.sep)
+    if app_package != -1:
+        return filename[app_package + 1 :]
+    return os.path.basename(filename)
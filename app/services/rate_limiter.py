@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from app.config import settings
+from app.db.repositories.api_key_repository import delete_usage_windows_before, record_api_key_usage
+from app.db.session import async_session
+from app.metrics import registry
+
+logger = logging.getLogger("rate_limiter")
+
+# Not labelled by key: /metrics is unauthenticated, and per-key usage is kept in api_key_usage_windows.
+ingest_requests_counter = registry.counter(
+    "ingest_api_key_requests_total",
+    "Ingest requests made with an API key, by rate-limit decision.",
+    ("result",),
+)
+
+
+class TokenBucket:
+    def __init__(self, *, rate: float, burst: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated_at = clock()
+
+    def reconfigure(self, *, rate: float, burst: int) -> None:
+        self._refill()
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = min(self._tokens, float(self.burst))
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (tokens - self._tokens) / self.rate
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    retry_after_seconds: float = 0.0
+
+
+class IngestRateLimiter:
+    def __init__(self, *, window_seconds: int, clock: Callable[[], float] = time.time) -> None:
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._buckets: dict[str, TokenBucket] = {}
+        self._limits: dict[str, tuple[float, int]] = {}
+        self._unsynced: dict[str, int] = {}
+        self._blocked_until: dict[str, float] = {}
+
+    def check(
+        self,
+        api_key_id: str,
+        *,
+        rate_limit_per_second: float,
+        burst: int,
+        tokens: int = 1,
+    ) -> RateLimitDecision:
+        now = self._clock()
+        blocked_until = self._blocked_until.get(api_key_id)
+        if blocked_until is not None:
+            if blocked_until > now:
+                ingest_requests_counter.inc(result="throttled")
+                return RateLimitDecision(allowed=False, retry_after_seconds=blocked_until - now)
+            del self._blocked_until[api_key_id]
+
+        bucket = self._buckets.get(api_key_id)
+        if bucket is None:
+            bucket = TokenBucket(rate=rate_limit_per_second, burst=burst)
+            self._buckets[api_key_id] = bucket
+        elif self._limits.get(api_key_id) != (rate_limit_per_second, burst):
+            bucket.reconfigure(rate=rate_limit_per_second, burst=burst)
+        self._limits[api_key_id] = (rate_limit_per_second, burst)
+
+        wait = bucket.try_acquire(tokens)
+        if wait > 0:
+            ingest_requests_counter.inc(result="throttled")
+            return RateLimitDecision(allowed=False, retry_after_seconds=wait)
+
+        self._unsynced[api_key_id] = self._unsynced.get(api_key_id, 0) + tokens
+        ingest_requests_counter.inc(result="allowed")
+        return RateLimitDecision(allowed=True)
+
+    def current_window_start(self) -> float:
+        now = self._clock()
+        return now - (now % self.window_seconds)
+
+    def take_unsynced(self) -> dict[str, int]:
+        deltas, self._unsynced = self._unsynced, {}
+        return deltas
+
+    def restore_unsynced(self, deltas: dict[str, int]) -> None:
+        for api_key_id, delta in deltas.items():
+            self._unsynced[api_key_id] = self._unsynced.get(api_key_id, 0) + delta
+
+    def apply_global_usage(self, usage: dict[str, int], *, window_start: float) -> None:
+        # Other processes share the same quota: once the window's global count reaches it,
+        # stop admitting requests for this key locally until the window rolls over.
+        window_end = window_start + self.window_seconds
+        for api_key_id, used in usage.items():
+            limits = self._limits.get(api_key_id)
+            if limits is None:
+                continue
+            rate_limit_per_second, burst = limits
+            if used >= rate_limit_per_second * self.window_seconds + burst:
+                self._blocked_until[api_key_id] = window_end
+
+    def forget(self, api_key_id: str) -> None:
+        self._buckets.pop(api_key_id, None)
+        self._limits.pop(api_key_id, None)
+        self._blocked_until.pop(api_key_id, None)
+
+
+async def sync_rate_limiter_usage(limiter: IngestRateLimiter) -> None:
+    deltas = limiter.take_unsynced()
+    if not deltas:
+        return
+
+    window_start = limiter.current_window_start()
+    try:
+        async with async_session() as session:
+            usage = await record_api_key_usage(
+                session,
+                deltas=deltas,
+                window_start=datetime.fromtimestamp(window_start, UTC),
+                used_at=datetime.now(UTC),
+            )
+    except Exception:
+        limiter.restore_unsynced(deltas)
+        raise
+    # Usage for keys deleted since it was counted is dropped rather than retried forever.
+    for api_key_id in deltas.keys() - usage.keys():
+        limiter.forget(api_key_id)
+    limiter.apply_global_usage(usage, window_start=window_start)
+
+
+async def run_rate_limit_sync_loop(limiter: IngestRateLimiter) -> None:
+    last_cleanup = 0.0
+    while True:
+        await asyncio.sleep(settings.API_KEY_USAGE_SYNC_INTERVAL_SECONDS)
+        try:
+            await sync_rate_limiter_usage(limiter)
+
+            if time.monotonic() - last_cleanup >= settings.API_KEY_USAGE_RETENTION_SECONDS:
+                cutoff = datetime.now(UTC) - timedelta(seconds=settings.API_KEY_USAGE_RETENTION_SECONDS)
+                async with async_session() as session:
+                    await delete_usage_windows_before(session, cutoff)
+                last_cleanup = time.monotonic()
+        except Exception:
+            # Keep reconciling even if a cycle fails unexpectedly.
+            logger.exception("Rate limit usage sync failed")
+
+
+ingest_rate_limiter = IngestRateLimiter(window_seconds=settings.API_KEY_USAGE_WINDOW_SECONDS)
@@ -0,0 +1,99 @@
+import random
+import zlib
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.repositories.delivery_history_repository import list_attempt_responses
+from app.metrics import registry
+from app.models.delivery_attempt import DeliveryAttempt
+from app.models.delivery_attempt_response import DeliveryAttemptResponse
+
+ENCODING_ZLIB = "zlib"
+ENCODING_IDENTITY = "identity"
+
+captures_counter = registry.counter(
+    "delivery_response_captures_total",
+    "Attempt response bodies by outcome and capture decision.",
+    ("outcome", "result"),
+)
+stored_bytes_histogram = registry.histogram(
+    "delivery_response_capture_stored_bytes",
+    "Bytes written per captured response body, after compression.",
+    buckets=(64, 256, 1024, 4096, 16384, 65536, 262144),
+)
+
+
+@dataclass(frozen=True)
+class ResponseCapturePolicy:
+    capture_successes: bool
+    max_bytes: int
+    default_sample_rate: float
+
+    def should_capture(
+        self,
+        *,
+        succeeded: bool,
+        sample_rate: float | None,
+        sample: Callable[[], float] = random.random,
+    ) -> bool:
+        if succeeded and not self.capture_successes:
+            return False
+        rate = self.default_sample_rate if sample_rate is None else sample_rate
+        return rate >= 1 or (rate > 0 and sample() < rate)
+
+
+def build_attempt_response(
+    attempt_id: str,
+    body: bytes | None,
+    *,
+    succeeded: bool,
+    sample_rate: float | None,
+    policy: ResponseCapturePolicy,
+) -> DeliveryAttemptResponse | None:
+    outcome = "success" if succeeded else "failure"
+    if not body:
+        captures_counter.inc(outcome=outcome, result="empty")
+        return None
+    if not policy.should_capture(succeeded=succeeded, sample_rate=sample_rate):
+        captures_counter.inc(outcome=outcome, result="skipped")
+        return None
+
+    captured = body[: policy.max_bytes]
+    encoding, data = ENCODING_IDENTITY, captured
+    compressed = zlib.compress(captured)
+    if len(compressed) < len(captured):
+        encoding, data = ENCODING_ZLIB, compressed
+    captures_counter.inc(outcome=outcome, result="stored")
+    stored_bytes_histogram.observe(len(data))
+    return DeliveryAttemptResponse(
+        attempt_id=attempt_id,
+        encoding=encoding,
+        body=data,
+        size=len(captured),
+        truncated=len(body) > len(captured),
+    )
+
+
+def decode_attempt_response(response: DeliveryAttemptResponse) -> str:
+    data = zlib.decompress(response.body) if response.encoding == ENCODING_ZLIB else response.body
+    return data.decode("utf-8", errors="replace")
+
+
+async def load_response_bodies(
+    session: AsyncSession,
+    attempts: Sequence[DeliveryAttempt],
+) -> dict[str, str | None]:
+    # Attempts written before captures moved to the side table still carry their inline body.
+    responses = await list_attempt_responses(session, [attempt.id for attempt in attempts])
+    decoded = {response.attempt_id: decode_attempt_response(response) for response in responses}
+    return {attempt.id: decoded.get(attempt.id, attempt.response_body) for attempt in attempts}
+
+
+response_capture_policy = ResponseCapturePolicy(
+    capture_successes=settings.WORKER_RESPONSE_CAPTURE_SUCCESSES,
+    max_bytes=settings.WORKER_RESPONSE_CAPTURE_MAX_BYTES,
+    default_sample_rate=settings.WORKER_RESPONSE_CAPTURE_SAMPLE_RATE,
+)
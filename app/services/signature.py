@@ -2,5 +2,7 @@ import hashlib
 import hmac
 
 
-def generate_hmac_sha256_signature(raw_payload: str, secret: str) -> str:
-    return hmac.new(secret.encode("utf-8"), raw_payload.encode("utf-8"), hashlib.sha256).hexdigest()
+def generate_hmac_sha256_signature(raw_payload: str | bytes, secret: str) -> str:
+    if isinstance(raw_payload, str):
+        raw_payload = raw_payload.encode("utf-8")
+    return hmac.new(secret.encode("utf-8"), raw_payload, hashlib.sha256).hexdigest()
@@ -0,0 +1,161 @@
+import secrets
+import uuid
+from collections.abc import Sequence
+from typing import Any
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.repositories.webhook_repository import (
+    create_webhooks,
+    list_owned_webhook_ids,
+    list_webhooks_by_ids_for_user,
+    set_webhooks_active,
+    update_webhooks,
+)
+from app.schemas.webhook import (
+    WebhookBulkActivationResult,
+    WebhookBulkCreateResult,
+    WebhookBulkUpdateItem,
+    WebhookBulkUpdateResult,
+    WebhookCreateRequest,
+    WebhookCreateResponse,
+    WebhookResponse,
+)
+
+
+async def bulk_create_webhooks(
+    session: AsyncSession,
+    *,
+    user_id: str,
+    items: Sequence[dict[str, Any]],
+) -> list[WebhookBulkCreateResult]:
+    results: dict[int, WebhookBulkCreateResult] = {}
+    created_ids: dict[int, str] = {}
+    rows: list[dict[str, Any]] = []
+    for index, raw_item in enumerate(items):
+        try:
+            item = WebhookCreateRequest.model_validate(raw_item)
+        except ValidationError as exc:
+            results[index] = WebhookBulkCreateResult(index=index, status="invalid", error=_format_errors(exc))
+            continue
+
+        webhook_id = str(uuid.uuid4())
+        created_ids[index] = webhook_id
+        rows.append(
+            {
+                "id": webhook_id,
+                "user_id": user_id,
+                "url": str(item.url),
+                "event_types": item.event_types,
+                "secret": item.secret or secrets.token_urlsafe(32),
+                "response_sample_rate": item.response_sample_rate,
+                "payload_filter": item.payload_filter,
+            }
+        )
+
+    await create_webhooks(session, rows)
+    await session.commit()
+
+    webhooks = await list_webhooks_by_ids_for_user(session, list(created_ids.values()), user_id)
+    webhooks_by_id = {webhook.id: webhook for webhook in webhooks}
+    for index, webhook_id in created_ids.items():
+        results[index] = WebhookBulkCreateResult(
+            index=index,
+            status="created",
+            webhook=WebhookCreateResponse.model_validate(webhooks_by_id[webhook_id]),
+        )
+    return [results[index] for index in range(len(items))]
+
+
+async def bulk_update_webhooks(
+    session: AsyncSession,
+    *,
+    user_id: str,
+    items: Sequence[dict[str, Any]],
+) -> list[WebhookBulkUpdateResult]:
+    results: dict[int, WebhookBulkUpdateResult] = {}
+    changes: dict[int, dict[str, Any]] = {}
+    seen_ids: set[str] = set()
+    for index, raw_item in enumerate(items):
+        try:
+            item = WebhookBulkUpdateItem.model_validate(raw_item)
+        except ValidationError as exc:
+            raw_id = raw_item.get("id")
+            results[index] = WebhookBulkUpdateResult(
+                index=index,
+                id=raw_id if isinstance(raw_id, str) else None,
+                status="invalid",
+                error=_format_errors(exc),
+            )
+            continue
+
+        webhook_id = str(item.id)
+        if webhook_id in seen_ids:
+            results[index] = WebhookBulkUpdateResult(
+                index=index,
+                id=webhook_id,
+                status="invalid",
+                error="Duplicate id in request.",
+            )
+            continue
+        seen_ids.add(webhook_id)
+        changes[index] = {
+            "id": webhook_id,
+            "url": str(item.url) if item.url is not None else None,
+            "event_types": item.event_types,
+            "response_sample_rate": item.response_sample_rate,
+            "payload_filter": item.payload_filter,
+        }
+
+    owned_ids = await list_owned_webhook_ids(session, [change["id"] for change in changes.values()], user_id)
+    for index, change in list(changes.items()):
+        if change["id"] not in owned_ids:
+            results[index] = WebhookBulkUpdateResult(index=index, id=change["id"], status="not_found")
+            del changes[index]
+
+    await update_webhooks(session, user_id, list(changes.values()))
+    await session.commit()
+
+    updated_ids = [change["id"] for change in changes.values()]
+    webhooks = await list_webhooks_by_ids_for_user(session, updated_ids, user_id)
+    webhooks_by_id = {webhook.id: webhook for webhook in webhooks}
+    for index, change in changes.items():
+        results[index] = WebhookBulkUpdateResult(
+            index=index,
+            id=change["id"],
+            status="updated",
+            webhook=WebhookResponse.model_validate(webhooks_by_id[change["id"]]),
+        )
+    return [results[index] for index in range(len(items))]
+
+
+async def bulk_set_webhooks_active(
+    session: AsyncSession,
+    *,
+    user_id: str,
+    webhook_ids: Sequence[str],
+    is_active: bool,
+) -> list[WebhookBulkActivationResult]:
+    unique_ids = list(dict.fromkeys(webhook_ids))
+    owned_ids = await list_owned_webhook_ids(session, unique_ids, user_id)
+    await set_webhooks_active(
+        session,
+        [webhook_id for webhook_id in unique_ids if webhook_id in owned_ids],
+        user_id,
+        is_active=is_active,
+    )
+    await session.commit()
+    return [
+        WebhookBulkActivationResult(
+            id=webhook_id,
+            status="updated" if webhook_id in owned_ids else "not_found",
+        )
+        for webhook_id in unique_ids
+    ]
+
+
+def _format_errors(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}" for error in exc.errors()
+    )
@@ -0,0 +1,83 @@
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.repositories.webhook_repository import get_webhook_delivery_config, get_webhook_versions
+from app.services.ttl_cache import TTLCache
+
+
+@dataclass(frozen=True)
+class WebhookDeliveryConfig:
+    id: str
+    url: str
+    secret: str | None
+    is_active: bool
+    response_sample_rate: float | None
+    version: int
+
+
+class WebhookConfigCache:
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        max_age_seconds: float,
+        revalidate_interval_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.revalidate_interval_seconds = revalidate_interval_seconds
+        self._clock = clock
+        self._entries: TTLCache[str, WebhookDeliveryConfig] = TTLCache(
+            max_entries=max_entries,
+            ttl_seconds=max_age_seconds,
+            clock=clock,
+        )
+        self._revalidate_at = clock() + revalidate_interval_seconds
+
+    async def get(self, session: AsyncSession, webhook_id: str) -> WebhookDeliveryConfig | None:
+        if self._clock() >= self._revalidate_at:
+            await self.revalidate(session)
+
+        config = self._entries.get(webhook_id)
+        if config is not None:
+            return config
+
+        row = await get_webhook_delivery_config(session, webhook_id)
+        if row is None:
+            return None
+        config = WebhookDeliveryConfig(
+            id=row.id,
+            url=row.url,
+            secret=row.secret,
+            is_active=row.is_active,
+            response_sample_rate=row.response_sample_rate,
+            version=int(row.version),
+        )
+        self._entries.set(webhook_id, config)
+        return config
+
+    async def revalidate(self, session: AsyncSession) -> None:
+        # One indexed lookup for every cached webhook; entries whose version moved on (or whose
+        # webhook is gone) are dropped and reloaded on next use.
+        self._revalidate_at = self._clock() + self.revalidate_interval_seconds
+        cached_ids = self._entries.keys()
+        if not cached_ids:
+            return
+        versions = await get_webhook_versions(session, cached_ids)
+        for webhook_id in cached_ids:
+            config = self._entries.get(webhook_id)
+            if config is not None and versions.get(webhook_id) != config.version:
+                self._entries.pop(webhook_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+webhook_config_cache = WebhookConfigCache(
+    max_entries=settings.WORKER_WEBHOOK_CACHE_MAX_ENTRIES,
+    max_age_seconds=settings.WORKER_WEBHOOK_CACHE_MAX_AGE_SECONDS,
+    revalidate_interval_seconds=settings.WORKER_WEBHOOK_CACHE_REVALIDATE_SECONDS,
+)
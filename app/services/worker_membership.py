@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+
+from app.config import settings
+from app.db.repositories.worker_node_repository import (
+    delete_stale_worker_nodes,
+    delete_worker_node,
+    list_live_worker_ids,
+    record_worker_heartbeat,
+)
+from app.db.session import async_session
+from app.metrics import registry
+from app.sharding import SHARD_COUNT, HashRing
+
+logger = logging.getLogger("worker_membership")
+
+members_gauge = registry.gauge(
+    "delivery_worker_cluster_members",
+    "Workers with a live heartbeat, as last seen by this worker.",
+)
+owned_shards_gauge = registry.gauge(
+    "delivery_worker_owned_shards",
+    "Delivery shards this worker currently claims from.",
+)
+
+
+class WorkerMembership:
+    # Each worker heartbeats into worker_nodes and derives shard ownership from the set of live
+    # ids on its own, so there is no coordinator. Views can disagree for up to one heartbeat
+    # after a join or leave; SKIP LOCKED still keeps two owners from taking the same delivery.
+    def __init__(
+        self,
+        *,
+        heartbeat_interval_seconds: float,
+        heartbeat_ttl_seconds: float,
+        worker_id: str | None = None,
+    ) -> None:
+        hostname = socket.gethostname()
+        self.worker_id = worker_id or f"{hostname}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.hostname = hostname
+        self.heartbeat_interval_seconds = heartbeat_interval_seconds
+        self.heartbeat_ttl_seconds = heartbeat_ttl_seconds
+        self.started_at = datetime.now(UTC)
+        self._members: frozenset[str] = frozenset()
+        self._owned_shards: list[int] = list(range(SHARD_COUNT))
+        self._task: asyncio.Task[None] | None = None
+
+    def owned_shards(self) -> list[int]:
+        return self._owned_shards
+
+    async def join(self) -> None:
+        try:
+            await self.refresh()
+        except Exception:
+            # Until a heartbeat lands this worker acts as the only member and claims every shard.
+            logger.exception("Initial worker heartbeat failed")
+        self._task = asyncio.create_task(self._heartbeat_loop())
+
+    async def leave(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        try:
+            async with async_session() as session:
+                async with session.begin():
+                    await delete_worker_node(session, worker_id=self.worker_id)
+        except Exception:
+            logger.exception("Failed to deregister worker %s", self.worker_id)
+        else:
+            logger.info("Worker %s left the cluster", self.worker_id)
+
+    async def refresh(self) -> None:
+        now = datetime.now(UTC)
+        ttl = timedelta(seconds=self.heartbeat_ttl_seconds)
+        async with async_session() as session:
+            async with session.begin():
+                await record_worker_heartbeat(
+                    session,
+                    worker_id=self.worker_id,
+                    hostname=self.hostname,
+                    started_at=self.started_at,
+                    now=now,
+                )
+                # Rows this old belong to workers that died without leaving; several TTLs of slack
+                # keep a slow heartbeat from being deleted out from under a live worker.
+                await delete_stale_worker_nodes(session, before=now - ttl * 4)
+                live_ids = await list_live_worker_ids(session, since=now - ttl)
+        self._set_members({*live_ids, self.worker_id})
+
+    def _set_members(self, members: set[str]) -> None:
+        members_gauge.set(len(members))
+        if members == self._members:
+            return
+        self._members = frozenset(members)
+        self._owned_shards = HashRing(members).shards_owned_by(self.worker_id)
+        owned_shards_gauge.set(len(self._owned_shards))
+        logger.info(
+            "Worker %s now owns %d of %d shards across %d workers",
+            self.worker_id,
+            len(self._owned_shards),
+            SHARD_COUNT,
+            len(members),
+        )
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval_seconds)
+            try:
+                await self.refresh()
+            except Exception:
+                # Keep the last known ownership; peers drop this worker if heartbeats stay down.
+                logger.exception("Worker heartbeat failed")
+
+
+def worker_membership_from_settings() -> WorkerMembership | None:
+    if not settings.WORKER_SHARDING_ENABLED:
+        return None
+    return WorkerMembership(
+        heartbeat_interval_seconds=settings.WORKER_HEARTBEAT_INTERVAL_SECONDS,
+        heartbeat_ttl_seconds=settings.WORKER_HEARTBEAT_TTL_SECONDS,
+    )
@@ -0,0 +1,38 @@
+import bisect
+import hashlib
+import zlib
+from collections.abc import Iterable
+
+# Deliveries are bucketed by webhook into a fixed number of shards at ingest. Workers then
+# split the shards between them with a consistent-hash ring, so a join or leave only moves
+# the shards next to that worker's points. Changing SHARD_COUNT means re-bucketing pending rows
+# (the migration that added the column computes the same CRC32(webhook_id) % 64 in SQL);
+# dead-letter replays recompute the shard of each row they requeue.
+SHARD_COUNT = 64
+_VIRTUAL_NODES = 64
+
+
+def shard_for_webhook(webhook_id: str) -> int:
+    return zlib.crc32(webhook_id.encode("utf-8")) % SHARD_COUNT
+
+
+def _ring_point(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    def __init__(self, members: Iterable[str], *, virtual_nodes: int = _VIRTUAL_NODES) -> None:
+        points = sorted(
+            (_ring_point(f"{member}#{index}"), member) for member in set(members) for index in range(virtual_nodes)
+        )
+        self._points = [point for point, _ in points]
+        self._members = [member for _, member in points]
+
+    def owner(self, shard: int) -> str | None:
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _ring_point(f"shard:{shard}")) % len(self._points)
+        return self._members[index]
+
+    def shards_owned_by(self, member: str) -> list[int]:
+        return [shard for shard in range(SHARD_COUNT) if self.owner(shard) == member]
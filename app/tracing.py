@@ -0,0 +1,447 @@
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Protocol
+
+import httpx
+
+from app.config import settings
+from app.metrics import registry
+
+logger = logging.getLogger("tracing")
+
+spans_exported_counter = registry.counter(
+    "tracing_spans_exported_total",
+    "Finished spans handed to the exporter, by outcome.",
+    ("result",),
+)
+spans_dropped_counter = registry.counter(
+    "tracing_spans_dropped_total",
+    "Finished spans dropped because the export queue was full.",
+)
+
+
+class SpanKind(str, Enum):
+    INTERNAL = "internal"
+    SERVER = "server"
+    CLIENT = "client"
+    PRODUCER = "producer"
+    CONSUMER = "consumer"
+
+
+_OTLP_SPAN_KINDS = {
+    SpanKind.INTERNAL: 1,
+    SpanKind.SERVER: 2,
+    SpanKind.CLIENT: 3,
+    SpanKind.PRODUCER: 4,
+    SpanKind.CONSUMER: 5,
+}
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+# Stands in for "a sampling decision was made and it was no", so children of an unsampled
+# request (or of a delivery ingested without a trace) are not re-sampled as new roots.
+UNSAMPLED = SpanContext(trace_id="0" * 32, span_id="0" * 16, sampled=False)
+
+
+def parse_traceparent(value: str | None) -> SpanContext | None:
+    # W3C Trace Context: version-traceid-parentid-flags, all lower-case hex.
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or parts[0] == "ff" or (parts[0] == "00" and len(parts) != 4):
+        return None
+    _, trace_id, span_id, flags = parts[:4]
+    if len(trace_id) != 32 or len(span_id) != 16 or len(flags) != 2:
+        return None
+    try:
+        int(trace_id, 16)
+        int(span_id, 16)
+        flag_bits = int(flags, 16)
+    except ValueError:
+        return None
+    if trace_id == UNSAMPLED.trace_id or span_id == UNSAMPLED.span_id:
+        return None
+    return SpanContext(trace_id=trace_id.lower(), span_id=span_id.lower(), sampled=bool(flag_bits & 1))
+
+
+@dataclass
+class Span:
+    name: str
+    context: SpanContext
+    parent_span_id: str | None = None
+    kind: SpanKind = SpanKind.INTERNAL
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    links: list[SpanContext] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def recording(self) -> bool:
+        return self.context.sampled
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.recording:
+            self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        if self.recording:
+            self.error = message
+
+
+_UNSAMPLED_SPAN = Span(name="unsampled", context=UNSAMPLED)
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class SpanProcessor(Protocol):
+    def on_end(self, span: Span) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.sample_ratio = 0.0
+        self.resource: dict[str, Any] = {}
+        self._processor: SpanProcessor | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._processor is not None
+
+    def configure(
+        self,
+        *,
+        processor: SpanProcessor | None,
+        sample_ratio: float,
+        resource: dict[str, Any] | None = None,
+    ) -> None:
+        previous = self._processor
+        self._processor = processor
+        self.sample_ratio = sample_ratio
+        self.resource = dict(resource or {})
+        if previous is not None and previous is not processor:
+            previous.shutdown()
+
+    def shutdown(self) -> None:
+        self.configure(processor=None, sample_ratio=0.0)
+
+    def current_span(self) -> Span | None:
+        return _current_span.get()
+
+    def current_traceparent(self) -> str | None:
+        span = _current_span.get()
+        if span is None or not span.recording:
+            return None
+        return span.context.traceparent
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        *,
+        parent: SpanContext | None = None,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: dict[str, Any] | None = None,
+        links: Sequence[SpanContext] = (),
+        start_ns: int | None = None,
+    ) -> Iterator[Span]:
+        processor = self._processor
+        if processor is None:
+            yield _UNSAMPLED_SPAN
+            return
+
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+        if parent is None:
+            sampled = random.random() < self.sample_ratio
+        else:
+            sampled = parent.sampled
+
+        if not sampled:
+            token = _current_span.set(_UNSAMPLED_SPAN)
+            try:
+                yield _UNSAMPLED_SPAN
+            finally:
+                _current_span.reset(token)
+            return
+
+        span = Span(
+            name=name,
+            context=SpanContext(
+                trace_id=parent.trace_id if parent is not None else _new_trace_id(),
+                span_id=_new_span_id(),
+                sampled=True,
+            ),
+            parent_span_id=parent.span_id if parent is not None else None,
+            kind=kind,
+            start_ns=start_ns if start_ns is not None else time.time_ns(),
+            attributes=dict(attributes or {}),
+            links=[link for link in links if link.sampled],
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            if span.error is None:
+                span.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            processor.on_end(span)
+
+    def record_span(
+        self,
+        name: str,
+        *,
+        start_ns: int,
+        end_ns: int,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: dict[str, Any] | None = None,
+    ) -> None:
+        # For work that is only known to be worth a span once it has finished (a statement, the
+        # claim query that found the delivery): adds a completed child of the current span.
+        processor = self._processor
+        current = _current_span.get()
+        if processor is None or current is None or not current.recording:
+            return
+        processor.on_end(
+            Span(
+                name=name,
+                context=SpanContext(trace_id=current.context.trace_id, span_id=_new_span_id(), sampled=True),
+                parent_span_id=current.context.span_id,
+                kind=kind,
+                start_ns=start_ns,
+                end_ns=end_ns,
+                attributes=dict(attributes or {}),
+            )
+        )
+
+
+class BatchSpanProcessor:
+    # Finished spans go onto a bounded queue and a daemon thread hands them to the exporter in
+    # batches, so file writes and collector round-trips never run on the event loop.
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        *,
+        max_queue_size: int,
+        max_batch_size: int,
+        schedule_delay_seconds: float,
+    ) -> None:
+        self.exporter = exporter
+        self.max_batch_size = max_batch_size
+        self.schedule_delay_seconds = schedule_delay_seconds
+        self._queue: queue.Queue[Span] = queue.Queue(max_queue_size)
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            spans_dropped_counter.inc()
+            return
+        if self._queue.qsize() >= self.max_batch_size:
+            self._wake.set()
+
+    def shutdown(self, timeout_seconds: float = 5.0) -> None:
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(timeout_seconds)
+        self.exporter.shutdown()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.schedule_delay_seconds)
+            self._wake.clear()
+            self._export_pending()
+        self._export_pending()
+
+    def _export_pending(self) -> None:
+        while True:
+            batch: list[Span] = []
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            try:
+                self.exporter.export(batch)
+            except Exception:
+                spans_exported_counter.inc(len(batch), result="failed")
+                logger.exception("Exporting %d spans failed", len(batch))
+            else:
+                spans_exported_counter.inc(len(batch), result="exported")
+
+
+class FileSpanExporter:
+    # One JSON object per span per line; easy to grep by trace_id or load into a notebook.
+    def __init__(self, path: str, *, resource: dict[str, Any]) -> None:
+        self.resource = resource
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self._file.write("".join(json.dumps(_span_record(span, self.resource)) + "\n" for span in spans))
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        self._file.close()
+
+
+class OtlpHttpSpanExporter:
+    # OTLP/HTTP with the JSON encoding, accepted by the OpenTelemetry Collector, Jaeger and Tempo.
+    def __init__(self, endpoint: str, *, resource: dict[str, Any], timeout_seconds: float) -> None:
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.resource = resource
+        self._client = httpx.Client(timeout=timeout_seconds)
+
+    def export(self, spans: Sequence[Span]) -> None:
+        body = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes(self.resource)},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "webhook-delivery-system"},
+                            "spans": [_otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        response = self._client.post(
+            self.url,
+            content=json.dumps(body),
+            headers={"Content-Type": "application/json"},
+        )
+        response.raise_for_status()
+
+    def shutdown(self) -> None:
+        self._client.close()
+
+
+tracer = Tracer()
+
+
+def configure_tracing(*, role: str) -> None:
+    exporter_name = settings.TRACING_EXPORTER.strip().lower()
+    if exporter_name in ("", "none"):
+        tracer.shutdown()
+        return
+
+    resource = {"service.name": settings.TRACING_SERVICE_NAME, "process.role": role}
+    exporter: SpanExporter
+    if exporter_name == "file":
+        exporter = FileSpanExporter(settings.TRACING_FILE_PATH.format(role=role), resource=resource)
+    elif exporter_name == "otlp":
+        exporter = OtlpHttpSpanExporter(
+            settings.TRACING_OTLP_ENDPOINT,
+            resource=resource,
+            timeout_seconds=settings.TRACING_OTLP_TIMEOUT_SECONDS,
+        )
+    else:
+        raise ValueError(f"Unknown TRACING_EXPORTER {settings.TRACING_EXPORTER!r}; use none, file or otlp.")
+
+    tracer.configure(
+        processor=BatchSpanProcessor(
+            exporter,
+            max_queue_size=settings.TRACING_EXPORT_QUEUE_SIZE,
+            max_batch_size=settings.TRACING_EXPORT_BATCH_SIZE,
+            schedule_delay_seconds=settings.TRACING_EXPORT_INTERVAL_SECONDS,
+        ),
+        sample_ratio=settings.TRACING_SAMPLE_RATIO,
+        resource=resource,
+    )
+
+
+def _new_trace_id() -> str:
+    return f"{random.getrandbits(128) or 1:032x}"
+
+
+def _new_span_id() -> str:
+    return f"{random.getrandbits(64) or 1:016x}"
+
+
+def _span_record(span: Span, resource: dict[str, Any]) -> dict[str, Any]:
+    end_ns = span.end_ns if span.end_ns is not None else span.start_ns
+    return {
+        "trace_id": span.context.trace_id,
+        "span_id": span.context.span_id,
+        "parent_span_id": span.parent_span_id,
+        "name": span.name,
+        "kind": span.kind.value,
+        "service": resource.get("service.name"),
+        "role": resource.get("process.role"),
+        "start_unix_nano": span.start_ns,
+        "duration_ms": round((end_ns - span.start_ns) / 1_000_000, 3),
+        "attributes": span.attributes,
+        "links": [{"trace_id": link.trace_id, "span_id": link.span_id} for link in span.links],
+        "error": span.error,
+    }
+
+
+def _otlp_span(span: Span) -> dict[str, Any]:
+    encoded: dict[str, Any] = {
+        "traceId": span.context.trace_id,
+        "spanId": span.context.span_id,
+        "name": span.name,
+        "kind": _OTLP_SPAN_KINDS[span.kind],
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns if span.end_ns is not None else span.start_ns),
+        "attributes": _otlp_attributes(span.attributes),
+    }
+    if span.parent_span_id is not None:
+        encoded["parentSpanId"] = span.parent_span_id
+    if span.links:
+        encoded["links"] = [{"traceId": link.trace_id, "spanId": link.span_id} for link in span.links]
+    if span.error is not None:
+        encoded["status"] = {"code": 2, "message": span.error}
+    return encoded
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    encoded: list[dict[str, Any]] = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        encoded.append({"key": key, "value": typed})
+    return encoded
@@ -0,0 +1,357 @@
+"""End-to-end load test: ingest -> workers -> local receiver, against a local MySQL.
+
+Starts the stub receiver (``benchmarks.receiver``), the API under uvicorn and
+``--workers`` copies of ``worker.py`` as subprocesses, registers a throwaway
+user, API key and webhook, then sends ``POST /events`` at ``--rate`` per second
+for ``--duration`` seconds and waits for every delivery to settle. Reports
+ingest latency (measured from each request's scheduled send time), ingest-to-
+delivery latency, delivery attempts per second and MySQL statement counters
+as JSON.
+
+The database in ``.env`` must be migrated (``alembic upgrade head``). Query
+counts come from ``SHOW GLOBAL STATUS`` and are server-wide, so use an
+otherwise idle MySQL:
+
+    python -m benchmarks.end_to_end --rate 200 --duration 30 --workers 4 \\
+        --latency-ms 50 --error-rate 0.05 --output e2e.json
+
+``--queue-backend`` runs the same load against either delivery queue backend;
+``local_log`` has a single consumer, so it runs with one worker and keeps its
+log under the run's ``--log-dir``.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+import httpx
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.config import settings
+from app.models.delivery import Delivery, DeliveryStatus
+from app.models.delivery_attempt import DeliveryAttempt
+from benchmarks.receiver import (
+    add_behaviour_arguments,
+    behaviour_from_arguments,
+    behaviour_to_arguments,
+    percentile,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DB_COUNTERS = (
+    "Questions",
+    "Com_select",
+    "Com_insert",
+    "Com_update",
+    "Com_delete",
+    "Com_commit",
+    "Com_rollback",
+    "Innodb_row_lock_waits",
+)
+
+
+def start_process(arguments: list[str], *, log_path: Path) -> subprocess.Popen[bytes]:
+    log = open(log_path, "wb")
+    return subprocess.Popen(
+        arguments,
+        cwd=REPO_ROOT,
+        env=os.environ.copy(),
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+
+
+def stop_processes(processes: list[subprocess.Popen[bytes]]) -> None:
+    for process in processes:
+        if process.poll() is None:
+            process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def wait_until_ready(url: str, *, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                response = await client.get(url)
+                if response.status_code < 500:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{url} did not become ready within {timeout:.0f}s")
+            await asyncio.sleep(0.2)
+
+
+async def read_db_counters(engine: AsyncEngine) -> dict[str, int]:
+    async with engine.connect() as connection:
+        result = await connection.execute(text("SHOW GLOBAL STATUS"))
+        values = {name: value for name, value in result.all()}
+    return {name: int(values.get(name, 0)) for name in DB_COUNTERS}
+
+
+async def provision(
+    client: httpx.AsyncClient,
+    *,
+    run_id: str,
+    receiver_url: str,
+    rate: float,
+) -> dict[str, str]:
+    email = f"bench-{run_id}@example.com"
+    password = f"bench-{run_id}"
+    response = await client.post("/auth/register", json={"email": email, "password": password})
+    response.raise_for_status()
+    response = await client.post("/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    auth = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    event_type = f"bench.{run_id}"
+    response = await client.post(
+        "/webhooks",
+        json={"url": f"{receiver_url}/hook", "event_types": [event_type]},
+        headers=auth,
+    )
+    response.raise_for_status()
+    webhook_id = response.json()["id"]
+
+    # A dedicated key keeps the run on the authenticated ingest path without tripping its limiter.
+    response = await client.post(
+        "/api-keys",
+        json={
+            "name": f"bench {run_id}",
+            "rate_limit_per_second": rate * 10,
+            "burst": max(int(rate * 10), 1),
+        },
+        headers=auth,
+    )
+    response.raise_for_status()
+    return {"event_type": event_type, "webhook_id": webhook_id, "api_key": response.json()["api_key"]}
+
+
+async def drive_ingest(
+    client: httpx.AsyncClient,
+    *,
+    event_type: str,
+    api_key: str,
+    rate: float,
+    duration: float,
+    max_in_flight: int,
+) -> dict[str, Any]:
+    interval = 1 / rate
+    total = int(rate * duration)
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    queued = 0
+    slots = asyncio.Semaphore(max_in_flight)
+
+    async def send(seq: int, scheduled_at: float) -> None:
+        nonlocal queued
+        async with slots:
+            payload = {"seq": seq, "sent_at": time.time(), "data": {"order_id": seq, "amount": seq * 1.5}}
+            try:
+                response = await client.post(
+                    "/events",
+                    json={"event_type": event_type, "payload": payload},
+                    headers={"X-API-Key": api_key},
+                )
+                status_key = str(response.status_code)
+                if response.status_code == 202:
+                    queued += response.json()["queued_count"]
+            except httpx.HTTPError as exc:
+                status_key = type(exc).__name__
+            # Measured from the scheduled send time so a backed-up API is not hidden by the
+            # driver waiting on it (coordinated omission).
+            latencies.append((time.perf_counter() - scheduled_at) * 1000)
+            statuses[status_key] = statuses.get(status_key, 0) + 1
+
+    started = time.perf_counter()
+    tasks: list[asyncio.Task[None]] = []
+    for seq in range(total):
+        scheduled_at = started + seq * interval
+        await asyncio.sleep(max(0.0, scheduled_at - time.perf_counter()))
+        tasks.append(asyncio.create_task(send(seq, scheduled_at)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "target_rate": rate,
+        "requests": total,
+        "achieved_rate": round(total / elapsed, 1),
+        "statuses": statuses,
+        "deliveries_queued": queued,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 3),
+            "p99": round(percentile(latencies, 0.99), 3),
+            "max": round(max(latencies), 3),
+            "mean": round(statistics.fmean(latencies), 3),
+        }
+        if latencies
+        else None,
+    }
+
+
+async def wait_for_drain(engine: AsyncEngine, *, webhook_id: str, timeout: float) -> dict[str, Any]:
+    started = time.perf_counter()
+    while True:
+        async with engine.connect() as connection:
+            result = await connection.execute(
+                select(Delivery.status, func.count())
+                .where(Delivery.webhook_id == webhook_id)
+                .group_by(Delivery.status)
+            )
+            counts = {status.value: int(count) for status, count in result.all()}
+        pending = counts.get(DeliveryStatus.PENDING.value, 0)
+        elapsed = time.perf_counter() - started
+        if pending == 0 or elapsed > timeout:
+            return {"drained": pending == 0, "seconds": round(elapsed, 3), "deliveries_by_status": counts}
+        await asyncio.sleep(0.5)
+
+
+async def read_attempt_stats(engine: AsyncEngine, *, webhook_id: str) -> dict[str, Any]:
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            select(
+                func.count(DeliveryAttempt.id),
+                func.min(DeliveryAttempt.attempted_at),
+                func.max(DeliveryAttempt.attempted_at),
+            )
+            .join(Delivery, Delivery.id == DeliveryAttempt.delivery_id)
+            .where(Delivery.webhook_id == webhook_id)
+        )
+        attempts, first_at, last_at = result.one()
+    window = (last_at - first_at).total_seconds() if first_at is not None and last_at is not None else 0
+    return {
+        "attempts": int(attempts),
+        "attempts_per_second": round(attempts / window, 1) if window > 0 else None,
+    }
+
+
+async def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=100.0, help="Target POST /events per second.")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of ingest load.")
+    parser.add_argument("--workers", type=int, default=2, help="Number of worker.py processes.")
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument("--drain-timeout", type=float, default=120.0)
+    parser.add_argument("--api-port", type=int, default=8100)
+    parser.add_argument("--receiver-port", type=int, default=9100)
+    parser.add_argument("--log-dir", default=None, help="Where subprocess logs go.")
+    parser.add_argument("--queue-backend", choices=("mysql", "local_log"), default="mysql")
+    parser.add_argument("--output", help="Write the JSON report to this path instead of stdout.")
+    add_behaviour_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.queue_backend == "local_log" and args.workers != 1:
+        parser.error("--queue-backend local_log supports exactly one worker")
+
+    run_id = uuid.uuid4().hex[:12]
+    log_dir = Path(args.log_dir or f"/tmp/webhook-bench-{run_id}")
+    log_dir.mkdir(parents=True, exist_ok=True)
+    receiver_url = f"http://127.0.0.1:{args.receiver_port}"
+    api_url = f"http://127.0.0.1:{args.api_port}"
+    behaviour = behaviour_from_arguments(args)
+    os.environ["DELIVERY_QUEUE_BACKEND"] = args.queue_backend
+    if args.queue_backend == "local_log":
+        os.environ["DELIVERY_QUEUE_LOG_DIR"] = str(log_dir / "delivery-queue")
+
+    engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True)
+    processes: list[subprocess.Popen[bytes]] = []
+    try:
+        processes.append(
+            start_process(
+                [sys.executable, "-m", "benchmarks.receiver", "--port", str(args.receiver_port)]
+                + behaviour_to_arguments(behaviour),
+                log_path=log_dir / "receiver.log",
+            )
+        )
+        processes.append(
+            start_process(
+                [
+                    sys.executable, "-m", "uvicorn", "app.main:app",
+                    "--port", str(args.api_port),
+                    "--log-level", "warning",
+                ],  # fmt: skip
+                log_path=log_dir / "api.log",
+            )
+        )
+        await wait_until_ready(f"{receiver_url}/_stats", timeout=30)
+        await wait_until_ready(f"{api_url}/openapi.json", timeout=30)
+
+        limits = httpx.Limits(
+            max_connections=args.max_in_flight,
+            max_keepalive_connections=args.max_in_flight,
+        )
+        async with httpx.AsyncClient(base_url=api_url, limits=limits, timeout=60) as client:
+            target = await provision(client, run_id=run_id, receiver_url=receiver_url, rate=args.rate)
+            counters_before = await read_db_counters(engine)
+            for index in range(args.workers):
+                processes.append(
+                    start_process([sys.executable, "worker.py"], log_path=log_dir / f"worker-{index}.log")
+                )
+            ingest = await drive_ingest(
+                client,
+                event_type=target["event_type"],
+                api_key=target["api_key"],
+                rate=args.rate,
+                duration=args.duration,
+                max_in_flight=args.max_in_flight,
+            )
+
+        drain = await wait_for_drain(engine, webhook_id=target["webhook_id"], timeout=args.drain_timeout)
+        counters_after = await read_db_counters(engine)
+        attempts = await read_attempt_stats(engine, webhook_id=target["webhook_id"])
+        async with httpx.AsyncClient() as client:
+            receiver_stats = (await client.get(f"{receiver_url}/_stats")).json()
+    finally:
+        stop_processes(processes)
+        await engine.dispose()
+
+    query_counts = {name: counters_after[name] - counters_before[name] for name in DB_COUNTERS}
+    deliveries = max(ingest["deliveries_queued"], 1)
+    report = {
+        "benchmark": "end_to_end",
+        "run_id": run_id,
+        "config": {
+            "rate": args.rate,
+            "duration": args.duration,
+            "workers": args.workers,
+            "queue_backend": args.queue_backend,
+            "max_in_flight": args.max_in_flight,
+            "receiver": vars(behaviour),
+        },
+        "ingest": ingest,
+        "drain": drain,
+        "delivery": {
+            "attempts": attempts["attempts"],
+            "attempts_per_second": attempts["attempts_per_second"],
+            "receiver": receiver_stats,
+        },
+        "db": {
+            "queries": query_counts,
+            "queries_per_delivery": round(query_counts["Questions"] / deliveries, 2),
+        },
+        "log_dir": str(log_dir),
+    }
+
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(encoded + "\n")
+    else:
+        print(encoded)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
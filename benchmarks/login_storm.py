@@ -0,0 +1,148 @@
+"""Measure event-ingest latency while a burst of logins is being verified.
+
+Runs an in-process FastAPI app with a lightweight ``/events`` endpoint and a
+``/login`` endpoint that verifies a real bcrypt hash either inline on the
+event loop (the previous behaviour) or through the bounded hashing pool in
+``app.services.password`` (the current behaviour). Ingest requests are sent
+at a fixed rate with and without a concurrent login storm and the latency
+percentiles are printed as JSON:
+
+    python -m benchmarks.login_storm --duration 5 --login-concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Any
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from app.services.password import (
+    PasswordHasherBusyError,
+    hash_password,
+    verify_password,
+    verify_password_async,
+)
+
+PASSWORD = "correct horse battery staple"
+
+
+def build_app(mode: str, hashed_password: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/events")
+    async def ingest() -> dict[str, int]:
+        return {"queued_count": 0}
+
+    @app.post("/login")
+    async def login() -> dict[str, bool]:
+        if mode == "inline":
+            matched = verify_password(PASSWORD, hashed_password)
+        else:
+            try:
+                matched = await verify_password_async(PASSWORD, hashed_password)
+            except PasswordHasherBusyError:
+                raise HTTPException(status_code=503) from None
+        return {"matched": matched}
+
+    return app
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_scenario(
+    app: FastAPI,
+    *,
+    duration: float,
+    ingest_interval: float,
+    login_concurrency: int,
+) -> dict[str, Any]:
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    logins = 0
+    login_rejections = 0
+    stop_at = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def ingest_loop() -> None:
+            next_send = time.perf_counter()
+            while next_send < stop_at:
+                # Measure from the scheduled send time so a blocked event loop is not hidden
+                # by the sender being blocked too (coordinated omission).
+                response = await client.post("/events", json={"event_type": "bench", "payload": {}})
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - next_send) * 1000)
+                next_send += ingest_interval
+                await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+
+        async def login_loop() -> None:
+            nonlocal logins, login_rejections
+            while time.perf_counter() < stop_at:
+                response = await client.post("/login")
+                if response.status_code == 503:
+                    login_rejections += 1
+                    await asyncio.sleep(0.01)
+                else:
+                    logins += 1
+
+        await asyncio.gather(ingest_loop(), *(login_loop() for _ in range(login_concurrency)))
+
+    return {
+        "ingest_requests": len(latencies),
+        "ingest_latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 3),
+            "p99": round(percentile(latencies, 0.99), 3),
+            "max": round(max(latencies), 3),
+            "mean": round(statistics.fmean(latencies), 3),
+        },
+        "logins_completed": logins,
+        "logins_rejected": login_rejections,
+    }
+
+
+async def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per scenario.")
+    parser.add_argument("--ingest-interval-ms", type=float, default=5.0)
+    parser.add_argument("--login-concurrency", type=int, default=32)
+    parser.add_argument("--output", help="Write the JSON report to this path instead of stdout.")
+    args = parser.parse_args(argv)
+
+    hashed_password = hash_password(PASSWORD)
+    results: dict[str, Any] = {}
+    for mode in ("inline", "pool"):
+        app = build_app(mode, hashed_password)
+        results[mode] = {
+            "baseline": await run_scenario(
+                app,
+                duration=args.duration,
+                ingest_interval=args.ingest_interval_ms / 1000,
+                login_concurrency=0,
+            ),
+            "login_storm": await run_scenario(
+                app,
+                duration=args.duration,
+                ingest_interval=args.ingest_interval_ms / 1000,
+                login_concurrency=args.login_concurrency,
+            ),
+        }
+
+    report = json.dumps({"benchmark": "login_storm", "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
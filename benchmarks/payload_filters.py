@@ -0,0 +1,116 @@
+"""Measure payload filter evaluation at ingest for thousands of subscribed webhooks.
+
+Builds synthetic subscribers, a share of them with filters drawn from a pool of
+distinct expressions, and times the same matching step that
+``create_pending_deliveries_for_event`` runs for every event. No database is
+needed. Results are printed as JSON:
+
+    python -m benchmarks.payload_filters --webhooks 5000 --distinct-filters 500
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from typing import Any
+
+from app.db.repositories.delivery_repository import SubscribedWebhook
+from app.payload_filters import compile_payload_filter, filter_subscribers
+
+FILTER_TEMPLATES = (
+    '$.order.total >= {n} and $.order.currency in ["EUR", "USD", "GBP"]',
+    '$.customer.tier == "gold" or $.customer.tags contains "vip-{n}"',
+    "not ($.order.items[0].quantity < {n}) and $.order.shipping.express exists",
+    '$.order.region == "region-{n}"',
+)
+
+
+def build_filters(count: int) -> list[str]:
+    return [FILTER_TEMPLATES[index % len(FILTER_TEMPLATES)].format(n=index) for index in range(count)]
+
+
+def build_webhooks(count: int, filters: list[str], filtered_share: float, rng: random.Random) -> list[Any]:
+    return [
+        SubscribedWebhook(
+            id=str(uuid.uuid4()),
+            user_id=str(uuid.uuid4()),
+            payload_filter=rng.choice(filters) if filters and rng.random() < filtered_share else None,
+        )
+        for _ in range(count)
+    ]
+
+
+def build_payloads(count: int, rng: random.Random) -> list[dict[str, Any]]:
+    return [
+        {
+            "order": {
+                "id": str(uuid.uuid4()),
+                "total": rng.randint(0, 1000),
+                "currency": rng.choice(["EUR", "USD", "JPY"]),
+                "region": f"region-{rng.randint(0, 500)}",
+                "items": [{"sku": f"SKU-{item}", "quantity": rng.randint(1, 20)} for item in range(5)],
+                "shipping": {"express": True} if rng.random() < 0.5 else {},
+            },
+            "customer": {"tier": rng.choice(["free", "gold"]), "tags": [f"vip-{rng.randint(0, 500)}"]},
+        }
+        for _ in range(count)
+    ]
+
+
+def measure(webhooks: list[Any], payloads: list[dict[str, Any]]) -> dict[str, Any]:
+    matched = 0
+    started = time.perf_counter()
+    for payload in payloads:
+        matched += len(filter_subscribers(webhooks, payload, expression=lambda webhook: webhook.payload_filter))
+    elapsed = time.perf_counter() - started
+    return {
+        "events": len(payloads),
+        "elapsed_seconds": round(elapsed, 3),
+        "events_per_second": round(len(payloads) / elapsed, 1),
+        "microseconds_per_webhook": round(elapsed / (len(payloads) * len(webhooks)) * 1_000_000, 3),
+        "matched_share": round(matched / (len(payloads) * len(webhooks)), 3),
+    }
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--webhooks", type=int, default=5_000)
+    parser.add_argument("--distinct-filters", type=int, default=500)
+    parser.add_argument("--filtered-share", type=float, default=0.8)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this path instead of stdout.")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    filters = build_filters(args.distinct_filters)
+    started = time.perf_counter()
+    for expression in filters:
+        compile_payload_filter(expression)
+    compile_seconds = time.perf_counter() - started
+
+    payloads = build_payloads(args.events, rng)
+    report = {
+        "benchmark": "payload_filters",
+        "webhooks": args.webhooks,
+        "distinct_filters": args.distinct_filters,
+        "filtered_share": args.filtered_share,
+        "compile_microseconds_per_filter": round(compile_seconds / max(len(filters), 1) * 1_000_000, 1),
+        "results": {
+            "unfiltered": measure(build_webhooks(args.webhooks, [], 0.0, rng), payloads),
+            "filtered": measure(build_webhooks(args.webhooks, filters, args.filtered_share, rng), payloads),
+        },
+    }
+
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(encoded + "\n")
+    else:
+        print(encoded)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
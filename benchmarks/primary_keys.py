@@ -0,0 +1,140 @@
+"""Compare random VARCHAR(36) keys with time-ordered BINARY(16) keys.
+
+Inserts the same number of delivery-shaped rows into two scratch tables
+in the configured MySQL database and reports insert throughput plus
+clustered and secondary index sizes as JSON:
+
+    python -m benchmarks.primary_keys --rows 500000 --output pk.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.config import settings
+from app.db.ids import uuid7
+
+VARIANTS: dict[str, dict[str, Any]] = {
+    "uuid4_varchar36": {
+        "column_type": "VARCHAR(36)",
+        "new_id": lambda: str(uuid.uuid4()),
+    },
+    "uuid7_binary16": {
+        "column_type": "BINARY(16)",
+        "new_id": lambda: uuid7().bytes,
+    },
+}
+
+
+async def run_variant(
+    engine: AsyncEngine,
+    *,
+    name: str,
+    column_type: str,
+    new_id: Any,
+    rows: int,
+    batch_size: int,
+    keep: bool,
+) -> dict[str, Any]:
+    table = f"bench_pk_{name}"
+    async with engine.begin() as connection:
+        await connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        await connection.execute(
+            text(
+                f"CREATE TABLE {table} ("
+                f"id {column_type} NOT NULL PRIMARY KEY, "
+                "webhook_id VARCHAR(36) NOT NULL, "
+                "event_type VARCHAR(255) NOT NULL, "
+                "created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+                "INDEX ix_webhook_id (webhook_id), "
+                "INDEX ix_event_type (event_type)"
+                ") ENGINE=InnoDB"
+            )
+        )
+
+    webhook_ids = [str(uuid.uuid4()) for _ in range(50)]
+    insert = text(f"INSERT INTO {table} (id, webhook_id, event_type) VALUES (:id, :webhook_id, :event_type)")
+    started = time.perf_counter()
+    inserted = 0
+    while inserted < rows:
+        count = min(batch_size, rows - inserted)
+        params = [
+            {
+                "id": new_id(),
+                "webhook_id": webhook_ids[(inserted + offset) % len(webhook_ids)],
+                "event_type": "order.created",
+            }
+            for offset in range(count)
+        ]
+        async with engine.begin() as connection:
+            await connection.execute(insert, params)
+        inserted += count
+    elapsed = time.perf_counter() - started
+
+    async with engine.begin() as connection:
+        await connection.execute(text(f"ANALYZE TABLE {table}"))
+        sizes = (
+            await connection.execute(
+                text(
+                    "SELECT DATA_LENGTH, INDEX_LENGTH FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+                ),
+                {"table": table},
+            )
+        ).one()
+        if not keep:
+            await connection.execute(text(f"DROP TABLE {table}"))
+
+    return {
+        "variant": name,
+        "rows": rows,
+        "batch_size": batch_size,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else None,
+        "data_length_bytes": int(sizes[0]),
+        "index_length_bytes": int(sizes[1]),
+    }
+
+
+async def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument("--output", help="Write the JSON report to this path instead of stdout.")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch tables for inspection.")
+    args = parser.parse_args(argv)
+
+    engine = create_async_engine(settings.DATABASE_URL)
+    try:
+        results = [
+            await run_variant(
+                engine,
+                name=name,
+                column_type=variant["column_type"],
+                new_id=variant["new_id"],
+                rows=args.rows,
+                batch_size=args.batch_size,
+                keep=args.keep,
+            )
+            for name, variant in VARIANTS.items()
+        ]
+    finally:
+        await engine.dispose()
+
+    report = json.dumps({"benchmark": "primary_keys", "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
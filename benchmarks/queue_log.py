@@ -0,0 +1,112 @@
+"""Measure the local append-only delivery queue log without a database.
+
+Appends ``--records`` delivery ids to a fresh segmented log in batches of
+``--batch-size`` (the shape ingest publishes in), then reads them back through
+the memory-mapped reader the worker uses, committing the consumer offset as it
+goes. Segments are kept small enough to roll several times. Results are
+printed as JSON:
+
+    python -m benchmarks.queue_log --records 500000 --batch-size 100 --fsync
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from typing import Any
+
+from app.local_log import OffsetStore, SegmentedLogReader, SegmentedLogWriter, list_segments
+
+
+def measure_append(
+    directory: str,
+    ids: list[bytes],
+    *,
+    batch_size: int,
+    segment_bytes: int,
+    fsync: bool,
+) -> dict[str, Any]:
+    writer = SegmentedLogWriter(directory, segment_bytes=segment_bytes, fsync=fsync)
+    due_ms = int(time.time() * 1000)
+    started = time.perf_counter()
+    for start in range(0, len(ids), batch_size):
+        writer.append([(delivery_id, due_ms) for delivery_id in ids[start : start + batch_size]])
+    elapsed = time.perf_counter() - started
+    writer.close()
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "records_per_second": round(len(ids) / elapsed, 1),
+        "segments": len(list_segments(directory)),
+    }
+
+
+def measure_read(directory: str, *, read_batch_size: int, offset_path: str) -> dict[str, Any]:
+    reader = SegmentedLogReader(directory)
+    offsets = OffsetStore(offset_path)
+    count = 0
+    started = time.perf_counter()
+    while records := reader.read(read_batch_size):
+        count += len(records)
+        offsets.store(reader.position)
+    elapsed = time.perf_counter() - started
+    reader.close()
+    return {
+        "records": count,
+        "elapsed_seconds": round(elapsed, 3),
+        "records_per_second": round(count / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=100, help="Records per append.")
+    parser.add_argument("--read-batch-size", type=int, default=1_000)
+    parser.add_argument("--segment-bytes", type=int, default=4 * 1024 * 1024)
+    parser.add_argument("--fsync", action="store_true", help="fsync after every append.")
+    parser.add_argument("--directory", default=None, help="Log directory; a temporary one by default.")
+    parser.add_argument("--output", help="Write the JSON report to this path instead of stdout.")
+    args = parser.parse_args(argv)
+
+    ids = [str(uuid.uuid4()).encode("ascii") for _ in range(args.records)]
+    with tempfile.TemporaryDirectory(dir=args.directory) as root:
+        log_directory = os.path.join(root, "log")
+        append = measure_append(
+            log_directory,
+            ids,
+            batch_size=args.batch_size,
+            segment_bytes=args.segment_bytes,
+            fsync=args.fsync,
+        )
+        read = measure_read(
+            log_directory,
+            read_batch_size=args.read_batch_size,
+            offset_path=os.path.join(root, "consumer.offset"),
+        )
+
+    report = {
+        "benchmark": "queue_log",
+        "config": {
+            "records": args.records,
+            "batch_size": args.batch_size,
+            "read_batch_size": args.read_batch_size,
+            "segment_bytes": args.segment_bytes,
+            "fsync": args.fsync,
+        },
+        "append": append,
+        "read": read,
+    }
+
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(encoded + "\n")
+    else:
+        print(encoded)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
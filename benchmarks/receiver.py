@@ -0,0 +1,236 @@
+"""Local webhook receiver with configurable latency and failure modes.
+
+Accepts deliveries on ``POST /hook`` and answers according to the
+configured behaviour:
+
+* latency drawn from a ``fixed``, ``uniform``, ``exponential`` or ``lognormal``
+  distribution around ``--latency-ms``
+* ``--error-rate`` of requests answered with ``--error-status``
+* ``--timeout-rate`` of requests held for ``--timeout-seconds`` (longer than the
+  worker's HTTP timeout) before answering
+* ``--slow-body-rate`` of successful responses streamed in chunks with a delay
+  between them
+
+Payloads carrying ``sent_at`` (a Unix timestamp set by the load driver) and
+``seq`` are used to measure ingest-to-delivery latency. ``GET /_stats``
+returns counters and percentiles as JSON and ``POST /_reset`` clears them:
+
+    python -m benchmarks.receiver --port 9100 --latency-ms 20 --latency-distribution lognormal
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize_ms(samples: list[float]) -> dict[str, float] | None:
+    if not samples:
+        return None
+    return {
+        "p50": round(percentile(samples, 0.50), 3),
+        "p90": round(percentile(samples, 0.90), 3),
+        "p99": round(percentile(samples, 0.99), 3),
+        "max": round(max(samples), 3),
+    }
+
+
+@dataclass
+class ReceiverBehaviour:
+    latency_ms: float = 0.0
+    latency_distribution: str = "fixed"
+    latency_sigma: float = 0.5
+    error_rate: float = 0.0
+    error_status: int = 500
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 30.0
+    slow_body_rate: float = 0.0
+    slow_body_chunks: int = 10
+    slow_body_delay_ms: float = 100.0
+
+    def draw_latency_seconds(self, rng: random.Random) -> float:
+        mean = self.latency_ms / 1000
+        if mean <= 0:
+            return 0.0
+        if self.latency_distribution == "uniform":
+            return rng.uniform(0, 2 * mean)
+        if self.latency_distribution == "exponential":
+            return rng.expovariate(1 / mean)
+        if self.latency_distribution == "lognormal":
+            # --latency-ms is the median; sigma controls the tail.
+            return mean * rng.lognormvariate(0, self.latency_sigma)
+        return mean
+
+
+@dataclass
+class ReceiverStats:
+    started_at: float = field(default_factory=time.time)
+    outcomes: Counter[str] = field(default_factory=Counter)
+    first_request_at: float | None = None
+    last_request_at: float | None = None
+    first_success_ms: dict[int, float] = field(default_factory=dict)
+    duplicate_successes: int = 0
+
+    def record(self, outcome: str, payload: dict[str, Any] | None, received_at: float) -> None:
+        self.outcomes[outcome] += 1
+        if self.first_request_at is None:
+            self.first_request_at = received_at
+        self.last_request_at = received_at
+        if outcome not in ("ok", "slow_body") or payload is None:
+            return
+        seq, sent_at = payload.get("seq"), payload.get("sent_at")
+        if not isinstance(seq, int) or not isinstance(sent_at, (int, float)):
+            return
+        if seq in self.first_success_ms:
+            self.duplicate_successes += 1
+        else:
+            self.first_success_ms[seq] = (received_at - sent_at) * 1000
+
+    def snapshot(self) -> dict[str, Any]:
+        requests = sum(self.outcomes.values())
+        window = None
+        if self.first_request_at is not None and self.last_request_at is not None:
+            window = self.last_request_at - self.first_request_at
+        return {
+            "requests": requests,
+            "outcomes": dict(self.outcomes),
+            "delivered": len(self.first_success_ms),
+            "duplicate_successes": self.duplicate_successes,
+            "attempts_per_second": round(requests / window, 1) if window else None,
+            "ingest_to_delivery_ms": summarize_ms(list(self.first_success_ms.values())),
+        }
+
+
+def build_app(behaviour: ReceiverBehaviour, *, seed: int | None = None) -> Starlette:
+    rng = random.Random(seed)
+    stats = ReceiverStats()
+
+    async def hook(request: Request) -> Response:
+        body = await request.body()
+        received_at = time.time()
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict):
+            payload = None
+
+        roll = rng.random()
+        if roll < behaviour.timeout_rate:
+            stats.record("timeout", payload, received_at)
+            await asyncio.sleep(behaviour.timeout_seconds)
+            return Response(status_code=504)
+
+        await asyncio.sleep(behaviour.draw_latency_seconds(rng))
+        roll -= behaviour.timeout_rate
+        if roll < behaviour.error_rate:
+            stats.record("error", payload, received_at)
+            return Response(b"receiver error", status_code=behaviour.error_status)
+
+        if rng.random() < behaviour.slow_body_rate:
+            stats.record("slow_body", payload, received_at)
+            return StreamingResponse(_slow_body(behaviour), media_type="text/plain")
+
+        stats.record("ok", payload, received_at)
+        return Response(b"ok", media_type="text/plain")
+
+    async def read_stats(request: Request) -> JSONResponse:
+        return JSONResponse(stats.snapshot())
+
+    async def reset(request: Request) -> Response:
+        nonlocal stats
+        stats = ReceiverStats()
+        return Response(status_code=204)
+
+    return Starlette(
+        routes=[
+            Route("/hook", hook, methods=["POST"]),
+            Route("/_stats", read_stats, methods=["GET"]),
+            Route("/_reset", reset, methods=["POST"]),
+        ]
+    )
+
+
+async def _slow_body(behaviour: ReceiverBehaviour) -> AsyncIterator[bytes]:
+    for _ in range(behaviour.slow_body_chunks):
+        yield b"." * 64
+        await asyncio.sleep(behaviour.slow_body_delay_ms / 1000)
+
+
+def add_behaviour_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Shape of the lognormal tail.")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-seconds", type=float, default=30.0)
+    parser.add_argument("--slow-body-rate", type=float, default=0.0)
+    parser.add_argument("--slow-body-chunks", type=int, default=10)
+    parser.add_argument("--slow-body-delay-ms", type=float, default=100.0)
+
+
+def behaviour_from_arguments(args: argparse.Namespace) -> ReceiverBehaviour:
+    return ReceiverBehaviour(
+        latency_ms=args.latency_ms,
+        latency_distribution=args.latency_distribution,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        timeout_rate=args.timeout_rate,
+        timeout_seconds=args.timeout_seconds,
+        slow_body_rate=args.slow_body_rate,
+        slow_body_chunks=args.slow_body_chunks,
+        slow_body_delay_ms=args.slow_body_delay_ms,
+    )
+
+
+def behaviour_to_arguments(behaviour: ReceiverBehaviour) -> list[str]:
+    return [
+        "--latency-ms", str(behaviour.latency_ms),
+        "--latency-distribution", behaviour.latency_distribution,
+        "--latency-sigma", str(behaviour.latency_sigma),
+        "--error-rate", str(behaviour.error_rate),
+        "--error-status", str(behaviour.error_status),
+        "--timeout-rate", str(behaviour.timeout_rate),
+        "--timeout-seconds", str(behaviour.timeout_seconds),
+        "--slow-body-rate", str(behaviour.slow_body_rate),
+        "--slow-body-chunks", str(behaviour.slow_body_chunks),
+        "--slow-body-delay-ms", str(behaviour.slow_body_delay_ms),
+    ]  # fmt: skip
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--seed", type=int, default=None)
+    add_behaviour_arguments(parser)
+    args = parser.parse_args(argv)
+
+    app = build_app(behaviour_from_arguments(args), seed=args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,230 @@
+"""Compare response encoding before and after the shared serialization layer.
+
+Serves a delivery-history-shaped page from two in-process FastAPI apps:
+
+* ``models``: builds response models per row and encodes with FastAPI's default JSONResponse
+  (the previous behaviour of ``list_delivery_history``).
+* ``fast``: builds plain dicts and returns ``FastJSONResponse`` (the current behaviour).
+
+No database is needed; rows are synthetic. Results are printed as JSON:
+
+    python -m benchmarks.serialization --requests 2000 --page-size 100
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+
+from app import serialization
+from app.schemas.delivery import (
+    DeliveryAttemptListItemResponse,
+    DeliveryHistoryResponse,
+    DeliveryListItemResponse,
+)
+
+
+def build_rows(page_size: int, attempts_per_delivery: int) -> tuple[list[Any], list[Any]]:
+    now = datetime.now(UTC)
+    deliveries = [
+        SimpleNamespace(
+            id=str(uuid.uuid4()),
+            event_type="order.created",
+            status=SimpleNamespace(value="pending"),
+            created_at=now,
+            updated_at=now,
+        )
+        for _ in range(page_size)
+    ]
+    attempts = [
+        SimpleNamespace(
+            delivery_id=delivery.id,
+            attempt_number=number,
+            http_status=500,
+            succeeded=False,
+            attempted_at=now,
+        )
+        for delivery in deliveries
+        for number in range(1, attempts_per_delivery + 1)
+    ]
+    return deliveries, attempts
+
+
+def build_models_app(deliveries: list[Any], attempts: list[Any]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/history", response_model=DeliveryHistoryResponse)
+    async def history() -> DeliveryHistoryResponse:
+        attempts_by_delivery: dict[str, list[DeliveryAttemptListItemResponse]] = defaultdict(list)
+        for attempt in attempts:
+            attempts_by_delivery[attempt.delivery_id].append(
+                DeliveryAttemptListItemResponse(
+                    attempt_number=attempt.attempt_number,
+                    http_status=attempt.http_status,
+                    succeeded=attempt.succeeded,
+                    attempted_at=attempt.attempted_at,
+                )
+            )
+        results = [
+            DeliveryListItemResponse(
+                id=delivery.id,
+                event_type=delivery.event_type,
+                status=delivery.status.value,
+                created_at=delivery.created_at,
+                updated_at=delivery.updated_at,
+                attempts=attempts_by_delivery.get(delivery.id, []),
+            )
+            for delivery in deliveries
+        ]
+        return DeliveryHistoryResponse(
+            total_count=len(results),
+            page=1,
+            page_size=len(results),
+            total_pages=1,
+            next_cursor=None,
+            results=results,
+        )
+
+    return app
+
+
+def build_fast_app(deliveries: list[Any], attempts: list[Any]) -> FastAPI:
+    app = FastAPI(default_response_class=serialization.FastJSONResponse)
+
+    @app.get("/history", response_model=DeliveryHistoryResponse)
+    async def history() -> serialization.FastJSONResponse:
+        attempts_by_delivery: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for attempt in attempts:
+            attempts_by_delivery[attempt.delivery_id].append(
+                {
+                    "attempt_number": attempt.attempt_number,
+                    "http_status": attempt.http_status,
+                    "succeeded": attempt.succeeded,
+                    "attempted_at": attempt.attempted_at,
+                }
+            )
+        results = [
+            {
+                "id": delivery.id,
+                "event_type": delivery.event_type,
+                "status": delivery.status.value,
+                "created_at": delivery.created_at,
+                "updated_at": delivery.updated_at,
+                "attempts": attempts_by_delivery.get(delivery.id, []),
+            }
+            for delivery in deliveries
+        ]
+        return serialization.FastJSONResponse(
+            {
+                "total_count": len(results),
+                "page": 1,
+                "page_size": len(results),
+                "total_pages": 1,
+                "next_cursor": None,
+                "results": results,
+            }
+        )
+
+    return app
+
+
+async def measure(app: FastAPI, *, requests: int, concurrency: int) -> dict[str, Any]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/history")
+        remaining = requests
+        lock = asyncio.Lock()
+        response_bytes = 0
+
+        async def run() -> None:
+            nonlocal remaining, response_bytes
+            while True:
+                async with lock:
+                    if remaining <= 0:
+                        return
+                    remaining -= 1
+                response = await client.get("/history")
+                response.raise_for_status()
+                response_bytes = len(response.content)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(run() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 1),
+        "response_bytes": response_bytes,
+    }
+
+
+def measure_payload_encoding(iterations: int) -> dict[str, Any]:
+    payload = {
+        "order_id": str(uuid.uuid4()),
+        "items": [{"sku": f"SKU-{index}", "quantity": index, "price": index * 1.5} for index in range(20)],
+        "customer": {"email": "customer@example.com", "tags": ["vip", "repeat"]},
+    }
+    timings: dict[str, float] = {}
+    for name, encode in (
+        ("stdlib_json_dumps", lambda: json.dumps(payload).encode("utf-8")),
+        ("serialization_dumps", lambda: serialization.dumps(payload)),
+        ("webhook_body", lambda: serialization.dumps_webhook_body(payload)),
+    ):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            encode()
+        timings[name] = round(iterations / (time.perf_counter() - started), 1)
+    return {"iterations": iterations, "encodes_per_second": timings}
+
+
+async def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1_000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--attempts-per-delivery", type=int, default=3)
+    parser.add_argument("--encode-iterations", type=int, default=50_000)
+    parser.add_argument("--output", help="Write the JSON report to this path instead of stdout.")
+    args = parser.parse_args(argv)
+
+    deliveries, attempts = build_rows(args.page_size, args.attempts_per_delivery)
+    report = {
+        "benchmark": "serialization",
+        "encoder": "orjson" if serialization.orjson is not None else "stdlib",
+        "page_size": args.page_size,
+        "attempts_per_delivery": args.attempts_per_delivery,
+        "results": {
+            "models": await measure(
+                build_models_app(deliveries, attempts),
+                requests=args.requests,
+                concurrency=args.concurrency,
+            ),
+            "fast": await measure(
+                build_fast_app(deliveries, attempts),
+                requests=args.requests,
+                concurrency=args.concurrency,
+            ),
+        },
+        "worker_payload_encoding": measure_payload_encoding(args.encode_iterations),
+    }
+
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(encoded + "\n")
+    else:
+        print(encoded)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+# Settings are read at import time; these are the only ones without a default.
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "5")
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption("--mysql", action="store_true", help="Also run tests marked mysql.")
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if config.getoption("--mysql"):
+        return
+    skip_mysql = pytest.mark.skip(reason="needs a MySQL database; run with --mysql")
+    for item in items:
+        if item.get_closest_marker("mysql") is not None:
+            item.add_marker(skip_mysql)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
@@ -0,0 +1,360 @@
+import heapq
+import os
+import uuid
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import Executable
+from sqlalchemy.dialects import mysql
+
+from app.db.ids import new_time_ordered_id
+from app.db.session import async_session, engine
+from app.local_log import iter_file_records
+from app.models import Delivery, DeliveryStatus, User, Webhook
+from app.services.delivery_queue import (
+    DeliveryClaim,
+    DeliveryQueue,
+    LocalLogDeliveryQueue,
+    MySqlDeliveryQueue,
+    QueuedDelivery,
+    _claim_statement,
+    _epoch_ms,
+)
+
+pytestmark = pytest.mark.anyio
+
+BUCKET_SECONDS = 10
+
+
+def _local_queue(directory: str, **options: int) -> LocalLogDeliveryQueue:
+    return LocalLogDeliveryQueue(
+        directory,
+        segment_bytes=1 << 20,
+        fsync=False,
+        retry_bucket_seconds=BUCKET_SECONDS,
+        read_batch_size=100,
+        reconcile_on_start=False,
+        offset_commit_interval_seconds=0,
+        **options,
+    )
+
+
+def _pop_due(queue: LocalLogDeliveryQueue, now_ms: int) -> list[DeliveryClaim]:
+    # What claim() does for each due entry once the row checks out, minus the database.
+    queue._pump(now_ms)
+    claims = []
+    while queue._heap and queue._heap[0].due_ms <= now_ms:
+        entry = heapq.heappop(queue._heap)
+        claims.append(DeliveryClaim(Delivery(id=entry.delivery_id, status=DeliveryStatus.PENDING), entry))
+    return claims
+
+
+def _finish(claim: DeliveryClaim, status: DeliveryStatus, next_attempt_at: datetime | None = None) -> None:
+    claim.delivery.status = status
+    claim.delivery.next_attempt_at = next_attempt_at
+
+
+@pytest.fixture
+async def local_queue(tmp_path: os.PathLike[str]) -> AsyncIterator[LocalLogDeliveryQueue]:
+    queue = _local_queue(str(tmp_path))
+    await queue.start()
+    yield queue
+    queue.close()
+
+
+async def test_offset_stays_at_the_oldest_unfinished_record(
+    local_queue: LocalLogDeliveryQueue, tmp_path: os.PathLike[str]
+) -> None:
+    ids = [new_time_ordered_id() for _ in range(3)]
+    await local_queue.publish([QueuedDelivery(delivery_id) for delivery_id in ids])
+    now_ms = _epoch_ms(datetime.now(UTC))
+    first, second, third = _pop_due(local_queue, now_ms)
+
+    for claim in (second, third):
+        _finish(claim, DeliveryStatus.SUCCESS)
+        local_queue.settle(claim)
+    local_queue._commit_offset(force=True)
+    assert local_queue._committed == first.token.source
+
+    # A restart replays from the unfinished record; the finished ones after it only repeat.
+    local_queue.close()
+    restarted = _local_queue(str(tmp_path))
+    await restarted.start()
+    assert [claim.delivery.id for claim in _pop_due(restarted, now_ms)] == ids
+    restarted.close()
+
+
+async def test_offset_moves_past_everything_once_settled(local_queue: LocalLogDeliveryQueue) -> None:
+    await local_queue.publish([QueuedDelivery(new_time_ordered_id()) for _ in range(2)])
+    for claim in _pop_due(local_queue, _epoch_ms(datetime.now(UTC))):
+        _finish(claim, DeliveryStatus.PERMANENTLY_FAILED)
+        local_queue.settle(claim)
+    local_queue._commit_offset(force=True)
+    assert local_queue._reader is not None
+    assert local_queue._committed == local_queue._reader.position
+    assert not local_queue._unresolved
+
+
+async def test_future_record_waits_in_a_bucket_until_its_window(local_queue: LocalLogDeliveryQueue) -> None:
+    now = datetime.now(UTC)
+    due_at = now + timedelta(hours=1)
+    delivery_id = new_time_ordered_id()
+    await local_queue.publish([QueuedDelivery(delivery_id, due_at)])
+
+    assert _pop_due(local_queue, _epoch_ms(now)) == []
+    # Safely in the retry index, so the main log no longer holds the offset back.
+    assert not local_queue._unresolved
+    ((start_ms, bucket),) = local_queue._buckets.items()
+    assert not bucket.loaded
+    assert [payload for _, payload in iter_file_records(local_queue._bucket_path(start_ms))] == [
+        delivery_id.encode("ascii")
+    ]
+
+    (claim,) = _pop_due(local_queue, _epoch_ms(due_at))
+    assert claim.delivery.id == delivery_id
+    assert bucket.loaded and bucket.outstanding == 1
+
+    _finish(claim, DeliveryStatus.SUCCESS)
+    local_queue.settle(claim)
+    assert start_ms not in local_queue._buckets
+    assert not os.path.exists(local_queue._bucket_path(start_ms))
+
+
+async def test_settled_retry_moves_into_the_retry_index(local_queue: LocalLogDeliveryQueue) -> None:
+    delivery_id = new_time_ordered_id()
+    await local_queue.publish([QueuedDelivery(delivery_id)])
+    now = datetime.now(UTC)
+    (claim,) = _pop_due(local_queue, _epoch_ms(now))
+
+    retry_at = now + timedelta(minutes=5)
+    _finish(claim, DeliveryStatus.PENDING, retry_at)
+    local_queue.settle(claim)
+
+    assert not local_queue._unresolved
+    assert local_queue._scheduled[delivery_id] == _epoch_ms(retry_at)
+    assert _pop_due(local_queue, _epoch_ms(now)) == []
+    (retried,) = _pop_due(local_queue, _epoch_ms(retry_at))
+    assert retried.delivery.id == delivery_id
+
+
+async def test_released_claim_goes_back_on_the_heap(local_queue: LocalLogDeliveryQueue) -> None:
+    delivery_id = new_time_ordered_id()
+    await local_queue.publish([QueuedDelivery(delivery_id)])
+    now_ms = _epoch_ms(datetime.now(UTC))
+    (claim,) = _pop_due(local_queue, now_ms)
+
+    local_queue.release(claim)
+    assert claim.token.source in local_queue._unresolved
+    (again,) = _pop_due(local_queue, now_ms)
+    assert again.delivery.id == delivery_id
+
+
+async def test_schedule_writes_each_bucket_once_and_bounds_the_map(tmp_path: os.PathLike[str]) -> None:
+    queue = _local_queue(str(tmp_path), scheduled_cache_size=2)
+    await queue.start()
+    base_ms = _epoch_ms(datetime.now(UTC)) + 3_600_000
+    base_ms -= base_ms % (BUCKET_SECONDS * 1000)
+    items = [(new_time_ordered_id(), base_ms + offset) for offset in (0, 1, 2, BUCKET_SECONDS * 1000)]
+
+    queue._schedule(items)
+    queue._schedule(items[-1:])
+
+    assert sorted(queue._buckets) == [base_ms, base_ms + BUCKET_SECONDS * 1000]
+    assert all(bucket.outstanding == 0 for bucket in queue._buckets.values())
+    assert len(list(iter_file_records(queue._bucket_path(base_ms)))) == 3
+    # The repeat of the most recent item was still remembered, so it was not written twice.
+    assert len(list(iter_file_records(queue._bucket_path(base_ms + BUCKET_SECONDS * 1000)))) == 1
+    assert list(queue._scheduled) == [items[2][0], items[3][0]]
+    queue.close()
+
+
+class _Result:
+    def __init__(self, value: object) -> None:
+        self.value = value
+
+    def scalar_one_or_none(self) -> object:
+        return self.value
+
+
+class _ScriptedSession:
+    # Stands in for AsyncSession in claim(): answers each query with the next scripted value
+    # (None once they run out) and keeps the statements for inspection.
+    def __init__(self, *results: object) -> None:
+        self.results = list(results)
+        self.statements: list[Executable] = []
+
+    async def execute(self, statement: Executable) -> _Result:
+        self.statements.append(statement)
+        return _Result(self.results.pop(0) if self.results else None)
+
+
+def _sql(statement: Executable) -> str:
+    return str(statement.compile(dialect=mysql.dialect(), compile_kwargs={"render_postcompile": True}))
+
+
+def _due_delivery(delivery_id: str, **columns: object) -> Delivery:
+    columns.setdefault("next_attempt_at", datetime.now(UTC) - timedelta(seconds=1))
+    return Delivery(id=delivery_id, webhook_id=str(uuid.uuid4()), status=DeliveryStatus.PENDING, **columns)
+
+
+@pytest.fixture(params=["mysql", "local_log"])
+async def scripted_queue(request: pytest.FixtureRequest, tmp_path: os.PathLike[str]) -> AsyncIterator[DeliveryQueue]:
+    backend: DeliveryQueue = MySqlDeliveryQueue() if request.param == "mysql" else _local_queue(str(tmp_path))
+    await backend.start()
+    yield backend
+    backend.close()
+
+
+async def test_claim_locks_the_row_it_returns(scripted_queue: DeliveryQueue) -> None:
+    delivery_id = new_time_ordered_id()
+    await scripted_queue.publish([QueuedDelivery(delivery_id)])
+    session = _ScriptedSession(_due_delivery(delivery_id))
+
+    claim = await scripted_queue.claim(session)  # type: ignore[arg-type]
+
+    assert claim is not None and claim.delivery.id == delivery_id
+    first_query = _sql(session.statements[0])
+    assert "deliveries.status = %s" in first_query
+    assert first_query.endswith("FOR UPDATE SKIP LOCKED")
+
+
+async def test_claim_without_a_row_returns_none(scripted_queue: DeliveryQueue) -> None:
+    await scripted_queue.publish([QueuedDelivery(new_time_ordered_id())])
+    assert await scripted_queue.claim(_ScriptedSession()) is None  # type: ignore[arg-type]
+
+
+async def test_row_held_elsewhere_is_not_claimed_or_lost(scripted_queue: DeliveryQueue) -> None:
+    delivery_id = new_time_ordered_id()
+    await scripted_queue.publish([QueuedDelivery(delivery_id)])
+    # SKIP LOCKED yields nothing; a plain read still sees the row pending.
+    session = _ScriptedSession(None, delivery_id)
+
+    assert await scripted_queue.claim(session) is None  # type: ignore[arg-type]
+    if isinstance(scripted_queue, LocalLogDeliveryQueue):
+        assert delivery_id in scripted_queue._scheduled
+
+
+async def test_local_claim_reschedules_rows_not_yet_due(local_queue: LocalLogDeliveryQueue) -> None:
+    delivery_id = new_time_ordered_id()
+    await local_queue.publish([QueuedDelivery(delivery_id)])
+    retry_at = datetime.now(UTC).replace(microsecond=0) + timedelta(minutes=5)
+
+    session = _ScriptedSession(_due_delivery(delivery_id, next_attempt_at=retry_at))
+    assert await local_queue.claim(session) is None  # type: ignore[arg-type]
+    assert local_queue._scheduled[delivery_id] == _epoch_ms(retry_at)
+
+
+async def test_local_claim_reschedules_blocked_ordering_keys(local_queue: LocalLogDeliveryQueue) -> None:
+    delivery_id = new_time_ordered_id()
+    await local_queue.publish([QueuedDelivery(delivery_id)])
+
+    session = _ScriptedSession(_due_delivery(delivery_id, ordering_key="k"), delivery_id)
+    assert await local_queue.claim(session) is None  # type: ignore[arg-type]
+    assert "EXISTS" in _sql(session.statements[1])
+    assert delivery_id in local_queue._scheduled
+
+
+def test_claim_statement_scans_the_due_range_oldest_first() -> None:
+    sql = _sql(_claim_statement(now=datetime.now(UTC), shards=None))
+    assert "deliveries.next_attempt_at <= %s" in sql
+    assert "ORDER BY deliveries.next_attempt_at ASC" in sql
+    assert "LIMIT %s FOR UPDATE SKIP LOCKED" in sql
+    assert "shard" not in sql.split("FROM deliveries", 1)[1]
+
+
+def test_claim_statement_holds_back_later_deliveries_for_a_key() -> None:
+    sql = _sql(_claim_statement(now=datetime.now(UTC), shards=None))
+    assert "deliveries.ordering_key IS NULL OR NOT (EXISTS" in sql
+    assert "deliveries_1.ordering_key = deliveries.ordering_key" in sql
+    assert "deliveries_1.status = %s" in sql
+    assert "deliveries_1.id < deliveries.id" in sql
+
+
+@pytest.mark.parametrize(
+    ("shards", "expected"),
+    [([3], "deliveries.shard = %s"), ([1, 2, 5], "deliveries.shard IN (%s, %s, %s)")],
+)
+def test_claim_statement_confines_the_scan_to_owned_shards(shards: list[int], expected: str) -> None:
+    assert expected in _sql(_claim_statement(now=datetime.now(UTC), shards=shards))
+
+
+# The same cases against a live database: claim() checks the row under FOR UPDATE on either
+# backend, so both need one.
+@pytest.fixture(
+    params=[
+        pytest.param("mysql", marks=pytest.mark.mysql),
+        pytest.param("local_log", marks=pytest.mark.mysql),
+    ]
+)
+async def queue(request: pytest.FixtureRequest, tmp_path: os.PathLike[str]) -> AsyncIterator[DeliveryQueue]:
+    backend: DeliveryQueue = MySqlDeliveryQueue() if request.param == "mysql" else _local_queue(str(tmp_path))
+    await backend.start()
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+async def pending_delivery() -> AsyncIterator[str]:
+    user_id = str(uuid.uuid4())
+    webhook_id = str(uuid.uuid4())
+    delivery_id = new_time_ordered_id()
+    async with async_session() as session, session.begin():
+        session.add(User(id=user_id, email=f"{user_id}@example.com", hashed_password="-"))
+        await session.flush()
+        session.add(Webhook(id=webhook_id, user_id=user_id, url="https://example.com/hook", event_types=["t"]))
+        await session.flush()
+        session.add(
+            Delivery(
+                id=delivery_id,
+                webhook_id=webhook_id,
+                event_type="t",
+                payload={},
+                next_attempt_at=datetime.now(UTC).replace(microsecond=0) - timedelta(seconds=1),
+            )
+        )
+    yield delivery_id
+    async with async_session() as session, session.begin():
+        user = await session.get(User, user_id)
+        if user is not None:
+            await session.delete(user)
+    # Each test runs its own event loop, so pooled connections cannot be carried over.
+    await engine.dispose()
+
+
+async def _claim(queue: DeliveryQueue) -> DeliveryClaim | None:
+    async with async_session() as session, session.begin():
+        return await queue.claim(session)
+
+
+async def test_claim_then_settle(queue: DeliveryQueue, pending_delivery: str) -> None:
+    await queue.publish([QueuedDelivery(pending_delivery)])
+    async with async_session() as session, session.begin():
+        claim = await queue.claim(session)
+        assert claim is not None and claim.delivery.id == pending_delivery
+        claim.delivery.status = DeliveryStatus.SUCCESS
+        claim.delivery.next_attempt_at = None
+    queue.settle(claim)
+
+    assert await _claim(queue) is None
+
+
+async def test_released_claim_is_claimed_again(queue: DeliveryQueue, pending_delivery: str) -> None:
+    await queue.publish([QueuedDelivery(pending_delivery)])
+    async with async_session() as session:
+        async with session.begin():
+            claim = await queue.claim(session)
+            assert claim is not None
+        queue.release(claim)
+
+    again = await _claim(queue)
+    assert again is not None and again.delivery.id == pending_delivery
+
+
+async def test_locked_row_is_not_dropped(queue: DeliveryQueue, pending_delivery: str) -> None:
+    await queue.publish([QueuedDelivery(pending_delivery)])
+    async with async_session() as holder, holder.begin():
+        await holder.get(Delivery, pending_delivery, with_for_update=True)
+        assert await _claim(queue) is None
+    if isinstance(queue, LocalLogDeliveryQueue):
+        assert pending_delivery in queue._scheduled
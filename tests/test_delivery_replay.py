@@ -0,0 +1,47 @@
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import Executable
+from sqlalchemy.dialects import mysql
+
+from app.db.repositories.delivery_replay_repository import requeue_dead_deliveries
+from app.sharding import shard_for_webhook
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class _Result:
+    rowcount = 1
+
+
+class _RecordingSession:
+    def __init__(self) -> None:
+        self.statements: list[Executable] = []
+
+    async def execute(self, statement: Executable) -> _Result:
+        self.statements.append(statement)
+        return _Result()
+
+
+async def test_requeue_moves_rows_onto_their_webhook_shard() -> None:
+    webhook_id = str(uuid.uuid4())
+    session = _RecordingSession()
+
+    requeued = await requeue_dead_deliveries(
+        session,  # type: ignore[arg-type]
+        webhook_id,
+        [str(uuid.uuid4())],
+        now=datetime.now(UTC),
+    )
+
+    assert requeued == 1
+    compiled = session.statements[0].compile(dialect=mysql.dialect(), compile_kwargs={"render_postcompile": True})
+    assert "shard=%s" in str(compiled)
+    assert compiled.params["shard"] == shard_for_webhook(webhook_id)
+    assert compiled.params["webhook_id_1"] == webhook_id
@@ -0,0 +1,39 @@
+import base64
+import json
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies.auth import get_current_user
+from app.db.session import get_session
+from app.main import app
+from app.models.user import User
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    # The cursor is decoded before the route touches the session, so neither needs a database.
+    app.dependency_overrides[get_session] = lambda: None
+    app.dependency_overrides[get_current_user] = lambda: User(id="user-1", email="user@example.com")
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _cursor(value: object) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor",
+        _cursor(["2026-10-19T00:00:00", "x' OR 1=1 --"]),
+        _cursor(["2026-10-19T00:00:00", 12]),
+        _cursor({"created_at": "2026-10-19T00:00:00"}),
+    ],
+)
+def test_search_rejects_tampered_cursors(client: TestClient, cursor: str) -> None:
+    response = client.get("/deliveries", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid pagination cursor."}
@@ -0,0 +1,33 @@
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+
+from app.services.delivery_worker import _perform_http_attempt
+from app.services.response_capture import response_capture_policy
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_attempt_reads_only_past_the_capture_limit() -> None:
+    chunks_sent = 0
+
+    async def endless_body() -> AsyncIterator[bytes]:
+        nonlocal chunks_sent
+        while True:
+            chunks_sent += 1
+            yield b"x" * 1000
+
+    transport = httpx.MockTransport(lambda request: httpx.Response(502, content=endless_body()))
+    async with httpx.AsyncClient(transport=transport) as client:
+        result = await _perform_http_attempt(
+            client=client,
+            webhook_url="https://receiver.example/hook",
+            payload={"id": 1},
+            webhook_secret="secret",
+            success_statuses={200},
+        )
+
+    assert result.http_status == 502 and not result.succeeded
+    assert result.response_body == b"x" * (response_capture_policy.max_bytes + 1)
+    assert chunks_sent * 1000 < response_capture_policy.max_bytes + 2000
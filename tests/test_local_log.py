@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+from app.local_log import (
+    LogPosition,
+    OffsetStore,
+    SegmentedLogReader,
+    SegmentedLogWriter,
+    encode_record,
+    list_segments,
+    segment_path,
+)
+
+
+def _payloads(reader: SegmentedLogReader) -> list[bytes]:
+    return [record.payload for record in reader.read(100)]
+
+
+def test_reader_skips_torn_tail_of_sealed_segment(tmp_path: os.PathLike[str]) -> None:
+    directory = str(tmp_path)
+    writer = SegmentedLogWriter(directory, segment_bytes=1 << 20)
+    writer.append([(b"first", 1), (b"second", 2)])
+    writer.close()
+    # A crash mid-append leaves part of a record at the tail of the segment.
+    with open(segment_path(directory, 0), "ab") as handle:
+        handle.write(encode_record(b"torn", 3)[:7])
+
+    reader = SegmentedLogReader(directory)
+    assert _payloads(reader) == [b"first", b"second"]
+
+    restarted = SegmentedLogWriter(directory, segment_bytes=1 << 20)
+    restarted.append([(b"third", 4)])
+    restarted.close()
+
+    assert list_segments(directory) == [0, 1]
+    assert _payloads(reader) == [b"third"]
+    assert reader.position.segment == 1
+    reader.close()
+
+
+def test_reader_waits_at_incomplete_tail_of_open_segment(tmp_path: os.PathLike[str]) -> None:
+    directory = str(tmp_path)
+    writer = SegmentedLogWriter(directory, segment_bytes=1 << 20)
+    writer.append([(b"first", 1)])
+    record = encode_record(b"second", 2)
+    with open(segment_path(directory, 0), "ab") as handle:
+        handle.write(record[:5])
+
+    reader = SegmentedLogReader(directory)
+    assert _payloads(reader) == [b"first"]
+    stopped_at = reader.position
+
+    # The writer finishing the record lets the reader carry on from where it stopped.
+    with open(segment_path(directory, 0), "ab") as handle:
+        handle.write(record[5:])
+    assert _payloads(reader) == [b"second"]
+    assert reader.position > stopped_at
+    reader.close()
+    writer.close()
+
+
+def test_append_finishes_short_writes(tmp_path: os.PathLike[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    directory = str(tmp_path)
+    real_write = os.write
+
+    def short_write(fd: int, data: bytes) -> int:
+        return real_write(fd, bytes(data[:7]))
+
+    writer = SegmentedLogWriter(directory, segment_bytes=1 << 20)
+    monkeypatch.setattr(os, "write", short_write)
+    writer.append([(b"a" * 36, 1), (b"b" * 36, 2)])
+    monkeypatch.undo()
+    writer.close()
+
+    reader = SegmentedLogReader(directory)
+    assert _payloads(reader) == [b"a" * 36, b"b" * 36]
+    reader.close()
+
+
+def test_failed_append_is_cut_off_and_seals_the_segment(
+    tmp_path: os.PathLike[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    directory = str(tmp_path)
+    real_write = os.write
+
+    def failing_write(fd: int, data: bytes) -> int:
+        real_write(fd, bytes(data[:10]))
+        raise OSError(28, "No space left on device")
+
+    writer = SegmentedLogWriter(directory, segment_bytes=1 << 20)
+    writer.append([(b"kept", 1)])
+    size_before = os.path.getsize(segment_path(directory, 0))
+    monkeypatch.setattr(os, "write", failing_write)
+    with pytest.raises(OSError):
+        writer.append([(b"lost", 2)])
+    monkeypatch.undo()
+    writer.append([(b"after", 3)])
+    writer.close()
+
+    assert os.path.getsize(segment_path(directory, 0)) == size_before
+    assert list_segments(directory) == [0, 1]
+    reader = SegmentedLogReader(directory)
+    assert _payloads(reader) == [b"kept", b"after"]
+    reader.close()
+
+
+def test_offset_store_round_trip(tmp_path: os.PathLike[str]) -> None:
+    store = OffsetStore(os.path.join(tmp_path, "consumer.offset"))
+    assert store.load() is None
+    store.store(LogPosition(3, 128))
+    assert store.load() == LogPosition(3, 128)
@@ -0,0 +1,45 @@
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.pagination import decode_keyset_cursor, encode_keyset_cursor, to_utc_naive
+
+
+def test_cursor_round_trip() -> None:
+    created_at = datetime(2026, 10, 19, 8, 30, 15, 123456)
+    row_id = str(uuid.uuid4())
+    cursor = encode_keyset_cursor(created_at, row_id)
+    assert "=" not in cursor
+    assert decode_keyset_cursor(cursor) == (created_at, row_id)
+
+
+def test_decoded_id_is_normalised() -> None:
+    row_id = uuid.uuid4()
+    cursor = encode_keyset_cursor(datetime(2026, 1, 1), str(row_id).upper())
+    assert decode_keyset_cursor(cursor)[1] == str(row_id)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "%%%",
+        "bm90IGpzb24",
+        encode_keyset_cursor(datetime(2026, 1, 1), "not-a-uuid"),
+        encode_keyset_cursor(datetime(2026, 1, 1), "1' OR '1'='1"),
+        encode_keyset_cursor(datetime(2026, 1, 1), "")[:-4],
+    ],
+)
+def test_tampered_cursors_are_a_400(cursor: str) -> None:
+    with pytest.raises(HTTPException) as raised:
+        decode_keyset_cursor(cursor)
+    assert raised.value.status_code == 400
+
+
+def test_to_utc_naive() -> None:
+    aware = datetime(2026, 10, 19, 10, 0, tzinfo=UTC)
+    assert to_utc_naive(aware) == datetime(2026, 10, 19, 10, 0)
+    assert to_utc_naive(datetime(2026, 10, 19, 10, 0)) == datetime(2026, 10, 19, 10, 0)
+    assert to_utc_naive(None) is None
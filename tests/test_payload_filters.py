@@ -0,0 +1,148 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.payload_filters import (
+    MAX_EXPRESSION_LENGTH,
+    PayloadFilterError,
+    compile_payload_filter,
+    filter_subscribers,
+)
+
+ORDER = {
+    "order": {"total": 120, "currency": "EUR", "paid": True, "note": None},
+    "tags": ["vip", "b2b"],
+    "items": [{"sku": "A-1"}, {"sku": "B-2"}],
+    "weird key": 1,
+}
+
+
+def _matches(expression: str, payload: object = ORDER) -> bool:
+    return compile_payload_filter(expression)(payload)
+
+
+@pytest.mark.parametrize(
+    ("expression", "expected"),
+    [
+        ("$.order.total >= 100", True),
+        ("$.order.total > 120", False),
+        ('$.order.currency in ["EUR", "USD"]', True),
+        ('$.order.currency in ["GBP"]', False),
+        ('$.tags contains "vip"', True),
+        ('$.order.currency contains "UR"', True),
+        ('$.items[-1].sku == "B-2"', True),
+        ('$["weird key"] == 1', True),
+        ("$.items[5] exists", False),
+        ("$.order.note exists", True),
+        ('$.order.total >= 100 and not ($.order.currency == "USD")', True),
+        ('$.order.total < 10 or $.tags contains "b2b"', True),
+    ],
+)
+def test_operators(expression: str, expected: bool) -> None:
+    assert _matches(expression) is expected
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        # JSON types compare strictly: true is not 1 and "120" is not 120.
+        "$.order.paid == 1",
+        '$.order.total == "120"',
+        "$.order.note == false",
+        '$.order.total >= "100"',
+        "$.order.total in [true, null]",
+        "$.tags contains 1",
+    ],
+)
+def test_values_of_different_json_types_never_match(expression: str) -> None:
+    assert not _matches(expression)
+
+
+def test_booleans_and_numbers_match_their_own_type() -> None:
+    assert _matches("$.order.paid == true")
+    assert _matches("$.order.note == null")
+    assert _matches("$.order.total == 120.0")
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "$.missing == null",
+        "$.missing != 1",
+        "$.missing < 5",
+        '$.missing in ["a", "b"]',
+        '$.missing contains "a"',
+        "$.order.total.cents == 1",
+        "$.tags.first exists",
+    ],
+)
+def test_comparisons_against_a_missing_field_are_false(expression: str) -> None:
+    assert not _matches(expression)
+
+
+def test_negating_a_missing_field_comparison_is_true() -> None:
+    assert _matches("not ($.missing == 1)")
+    assert _matches("not $.missing exists")
+
+
+def test_not_equal_on_a_present_field() -> None:
+    assert _matches('$.order.currency != "USD"')
+    assert not _matches('$.order.currency != "EUR"')
+    assert _matches('$.order.total != "120"')
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "",
+        "$.a ==",
+        "$.a == 1 and",
+        "($.a == 1",
+        "$.a == 1)",
+        "a == 1",
+        "$.a ~ 1",
+        "$.a like 1",
+        "$.a in [1, ]",
+        "$.a > true",
+        "$.a < null",
+        "$.a == nope",
+    ],
+)
+def test_invalid_expressions_are_rejected(expression: str) -> None:
+    with pytest.raises(PayloadFilterError):
+        compile_payload_filter(expression)
+
+
+def test_nesting_is_limited() -> None:
+    assert _matches("(" * 31 + "$.order.total == 120" + ")" * 31)
+    with pytest.raises(PayloadFilterError, match="nests deeper"):
+        compile_payload_filter("(" * 32 + "$.a == 1" + ")" * 32)
+    with pytest.raises(PayloadFilterError, match="nests deeper"):
+        compile_payload_filter("not " * 40 + "$.a exists")
+
+
+def test_length_is_limited() -> None:
+    padding = " " * (MAX_EXPRESSION_LENGTH - len("$.a exists"))
+    assert compile_payload_filter("$.a exists" + padding)({"a": 1})
+    with pytest.raises(PayloadFilterError, match="longer than"):
+        compile_payload_filter("$.a exists" + padding + " ")
+
+
+def test_filter_subscribers_keeps_unfiltered_and_matching_webhooks() -> None:
+    webhooks = [
+        SimpleNamespace(id="all", payload_filter=None),
+        SimpleNamespace(id="eur", payload_filter='$.order.currency == "EUR"'),
+        SimpleNamespace(id="usd", payload_filter='$.order.currency == "USD"'),
+    ]
+    matched = filter_subscribers(webhooks, ORDER, expression=lambda webhook: webhook.payload_filter)
+    assert [webhook.id for webhook in matched] == ["all", "eur"]
+
+
+def test_filter_subscribers_fails_open_on_an_unparsable_stored_filter() -> None:
+    webhooks = [
+        SimpleNamespace(id="broken", payload_filter="$.order.total >>> 1"),
+        SimpleNamespace(id="also broken", payload_filter="$.order.total >>> 1"),
+        SimpleNamespace(id="usd", payload_filter='$.order.currency == "USD"'),
+    ]
+    matched = filter_subscribers(webhooks, ORDER, expression=lambda webhook: webhook.payload_filter)
+    assert [webhook.id for webhook in matched] == ["broken", "also broken"]
@@ -0,0 +1,61 @@
+import math
+
+import pytest
+
+from app.services.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def test_burst_is_available_at_once(clock: FakeClock) -> None:
+    bucket = TokenBucket(rate=1, burst=3, clock=clock)
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == pytest.approx(1.0)
+
+
+def test_refills_at_the_rate_up_to_the_burst(clock: FakeClock) -> None:
+    bucket = TokenBucket(rate=2, burst=4, clock=clock)
+    assert bucket.try_acquire(4) == 0.0
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    clock.now += 60
+    assert bucket.try_acquire(4) == 0.0
+    assert bucket.try_acquire() > 0
+
+
+def test_refused_request_takes_nothing(clock: FakeClock) -> None:
+    bucket = TokenBucket(rate=1, burst=5, clock=clock)
+    assert bucket.try_acquire(3) == 0.0
+    assert bucket.try_acquire(3) == pytest.approx(1.0)
+    assert bucket.try_acquire(2) == 0.0
+
+
+def test_zero_rate_never_refills(clock: FakeClock) -> None:
+    bucket = TokenBucket(rate=0, burst=1, clock=clock)
+    assert bucket.try_acquire() == 0.0
+    clock.now += 3600
+    assert bucket.try_acquire() == math.inf
+
+
+def test_burst_is_at_least_one(clock: FakeClock) -> None:
+    bucket = TokenBucket(rate=1, burst=0, clock=clock)
+    assert bucket.try_acquire() == 0.0
+
+
+def test_reconfigure_keeps_tokens_within_the_new_burst(clock: FakeClock) -> None:
+    bucket = TokenBucket(rate=1, burst=10, clock=clock)
+    bucket.reconfigure(rate=1, burst=2)
+    assert bucket.try_acquire(2) == 0.0
+    assert bucket.try_acquire() == pytest.approx(1.0)
@@ -1,7 +1,12 @@
 import asyncio
 import logging
+import signal
 
-from app.services.delivery_worker import run_worker_loop
+from app.config import settings
+from app.db.session import dispose_engine, use_engine_role
+from app.metrics import start_metrics_server
+from app.services.delivery_worker import run_worker
+from app.tracing import configure_tracing, tracer
 
 
 def configure_logging() -> None:
@@ -11,9 +16,37 @@ def configure_logging() -> None:
     )
 
 
+async def main() -> None:
+    configure_tracing(role="worker")
+    stop = asyncio.Event()
+    force = asyncio.Event()
+
+    def request_shutdown() -> None:
+        # First SIGTERM/SIGINT drains; a second one skips the rest of the grace period.
+        if stop.is_set():
+            force.set()
+        stop.set()
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, request_shutdown)
+
+    metrics_server = None
+    if settings.WORKER_METRICS_PORT:
+        metrics_server = await start_metrics_server("0.0.0.0", settings.WORKER_METRICS_PORT)
+    try:
+        await run_worker(stop, force, grace_seconds=settings.WORKER_SHUTDOWN_GRACE_SECONDS)
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+        await dispose_engine()
+        await asyncio.to_thread(tracer.shutdown)
+
+
 if __name__ == "__main__":
     configure_logging()
+    use_engine_role("worker")
     try:
-        asyncio.run(run_worker_loop())
+        asyncio.run(main())
     except KeyboardInterrupt:
         logging.getLogger("delivery_worker").info("Worker stopped by interrupt")